@@ -1,17 +1,21 @@
 """Support for SkyCooker."""
 import logging
+from collections import Counter
 from datetime import timedelta
+from time import monotonic
 
 import homeassistant.helpers.event as ev
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (ATTR_SW_VERSION, CONF_DEVICE,
                                   CONF_FRIENDLY_NAME, CONF_MAC, CONF_PASSWORD,
                                   CONF_SCAN_INTERVAL, Platform)
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.dispatcher import dispatcher_send
+from homeassistant.const import __version__ as HA_VERSION
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send, dispatcher_send
 from homeassistant.helpers.entity import DeviceInfo
 
 from .const import *
+from .services import async_setup_services
 from .skycooker_connection import SkyCookerConnection
 
 _LOGGER = logging.getLogger(__name__)
@@ -23,19 +27,28 @@ PLATFORMS = [
     Platform.BUTTON
 ]
 
+def ha_version_tuple(version):
+    """Return (major, minor, patch) of a version string like 2025.12.0b3."""
+    parts = []
+    for part in version.split(".")[:3]:
+        digits = ""
+        for char in part:
+            if not char.isdigit(): break
+            digits += char
+        parts.append(int(digits or 0))
+    return tuple(parts + [0] * (3 - len(parts)))
+
+
 async def async_setup(hass, config):
     """Set up the SkyCooker component."""
     # Проверка минимальной версии HomeAssistant
-    from homeassistant.const import __version__ as HA_VERSION
-    from packaging import version
-    
-    min_ha_version = "2025.12.5"
-    if version.parse(HA_VERSION) < version.parse(min_ha_version):
+    if ha_version_tuple(HA_VERSION) < MIN_HA_VERSION:
         _LOGGER.error("❌ Требуется HomeAssistant версии %s или выше. У вас установлена версия %s",
-                     min_ha_version, HA_VERSION)
+                     ".".join(map(str, MIN_HA_VERSION)), HA_VERSION)
         return False
     
     hass.data.setdefault(DOMAIN, {})
+    async_setup_services(hass)
     _LOGGER.info("✅ SkyCooker интеграция загружена. Версия HA: %s", HA_VERSION)
     return True
 
@@ -53,15 +66,26 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
         return False
 
     try:
-        skycooker = SkyCookerConnection(
-            mac=entry.data[CONF_MAC],
-            key=entry.data[CONF_PASSWORD],
-            persistent=entry.data[CONF_PERSISTENT_CONNECTION],
-            adapter=entry.data.get(CONF_DEVICE, None),
-            hass=hass,
-            model=model_name
-        )
+        # Подключение, уже проверенное мастером настройки, используется без переподключения
+        skycooker = hass.data[DOMAIN].get(DATA_PAIRED, {}).pop(entry.data[CONF_MAC], None)
+        if skycooker is not None and skycooker.model == model_name:
+            skycooker.persistent = entry.data[CONF_PERSISTENT_CONNECTION]
+            skycooker.live_apply = entry.data.get(CONF_LIVE_APPLY, DEFAULT_LIVE_APPLY)
+            _LOGGER.debug("♻️  Используется подключение мастера настройки к %s", entry.data[CONF_MAC])
+        else:
+            if skycooker is not None:
+                await skycooker.stop()
+            skycooker = SkyCookerConnection(
+                mac=entry.data[CONF_MAC],
+                key=entry.data[CONF_PASSWORD],
+                persistent=entry.data[CONF_PERSISTENT_CONNECTION],
+                adapter=entry.data.get(CONF_DEVICE, None),
+                hass=hass,
+                model=model_name,
+                live_apply=entry.data.get(CONF_LIVE_APPLY, DEFAULT_LIVE_APPLY)
+            )
         hass.data[DOMAIN][entry.entry_id][DATA_CONNECTION] = skycooker
+        hass.data[DOMAIN][entry.entry_id][DATA_ENTITY_UPDATES] = Counter()
     except Exception as e:
         if "не найдено" in str(e).lower() or "not found" in str(e).lower():
             _LOGGER.error(f"🚨 Устройство {entry.data[CONF_MAC]} не найдено. Проверьте, что устройство включено и находится в зоне действия Bluetooth.")
@@ -71,16 +95,35 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
             return False
 
     async def poll(now, **kwargs) -> None:
-        await skycooker.update()
+        started = monotonic()
+        result = await skycooker.update()
         await hass.async_add_executor_job(dispatcher_send, hass, DISPATCHER_UPDATE)
+        # Таймер тика перезапускается только своим опросом, а не опросами всех записей
+        schedule_tick()
         if hass.data[DOMAIN][DATA_WORKING]:
+            skycooker.add_poll(started, monotonic() - started, result, entry.data[CONF_SCAN_INTERVAL])
             schedule_poll(timedelta(seconds=entry.data[CONF_SCAN_INTERVAL]))
         else:
+            skycooker.add_poll(started, monotonic() - started, result, None)
             _LOGGER.info("🔴 Не работает больше, остановка")
 
     def schedule_poll(td):
         hass.data[DOMAIN][DATA_CANCEL] = ev.async_call_later(hass, td, poll)
 
+    @callback
+    def schedule_tick():
+        # Таймеры продвигаются локально раз в минуту, отсчет от момента получения статуса
+        cancel = hass.data[DOMAIN][entry.entry_id].pop(DATA_TICK_CANCEL, None)
+        if cancel: cancel()
+        delay = skycooker.next_tick_delay()
+        if delay is not None and hass.data[DOMAIN][DATA_WORKING]:
+            hass.data[DOMAIN][entry.entry_id][DATA_TICK_CANCEL] = ev.async_call_later(hass, delay, tick)
+
+    async def tick(now) -> None:
+        hass.data[DOMAIN][entry.entry_id].pop(DATA_TICK_CANCEL, None)
+        async_dispatcher_send(hass, f"{DISPATCHER_TICK}_{entry.entry_id}")
+        schedule_tick()
+
     hass.data[DOMAIN][DATA_WORKING] = True
     hass.data[DOMAIN][DATA_DEVICE_INFO] = lambda: device_info(entry, hass)
 
@@ -125,7 +168,9 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
             hass.config_entries.async_forward_entry_unload(entry, component)
         )
     hass.data[DOMAIN][DATA_CANCEL]()
-    await hass.async_add_executor_job(hass.data[DOMAIN][entry.entry_id][DATA_CONNECTION].stop)
+    cancel = hass.data[DOMAIN][entry.entry_id].pop(DATA_TICK_CANCEL, None)
+    if cancel: cancel()
+    await hass.data[DOMAIN][entry.entry_id][DATA_CONNECTION].stop()
     hass.data[DOMAIN][entry.entry_id][DATA_CONNECTION] = None
     _LOGGER.debug("✅ Вход выгружен")
     return True
@@ -135,4 +180,5 @@ async def entry_update_listener(hass, entry):
     """Handle options update."""
     skycooker = hass.data[DOMAIN][entry.entry_id][DATA_CONNECTION]
     skycooker.persistent = entry.data.get(CONF_PERSISTENT_CONNECTION)
+    skycooker.live_apply = entry.data.get(CONF_LIVE_APPLY, DEFAULT_LIVE_APPLY)
     _LOGGER.debug("⚙️  Опции обновлены")
\ No newline at end of file
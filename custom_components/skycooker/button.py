@@ -1,5 +1,6 @@
 """SkyCooker button entities."""
 import logging
+from collections import namedtuple
 
 from homeassistant.components.button import ButtonEntity
 from homeassistant.const import CONF_FRIENDLY_NAME
@@ -11,6 +12,14 @@ from .skycooker import SkyCookerError
 _LOGGER = logging.getLogger(__name__)
 
 
+ButtonDescription = namedtuple("ButtonDescription", ["name", "icon", "press"])
+
+BUTTON_DESCRIPTIONS = {
+    BUTTON_TYPE_START: ButtonDescription("start", "mdi:play", lambda skycooker: skycooker.start()),
+    BUTTON_TYPE_STOP: ButtonDescription("stop", "mdi:stop", lambda skycooker: skycooker.stop_cooking()),
+    BUTTON_TYPE_START_DELAYED: ButtonDescription(
+        "start delayed", "mdi:timer-play", lambda skycooker: skycooker.start_delayed()),
+}
 
 
 async def async_setup_entry(hass, entry, async_add_entities):
@@ -25,11 +34,22 @@ async def async_setup_entry(hass, entry, async_add_entities):
 class SkyCookerButton(ButtonEntity):
     """Representation of a SkyCooker button entity."""
 
+    _attr_should_poll = False
+    _attr_assumed_state = False
+
     def __init__(self, hass, entry, button_type):
         """Initialize the button entity."""
         self.hass = hass
         self.entry = entry
         self.button_type = button_type
+        # Метаданные не меняются, вычисляем их один раз
+        description = self._description = BUTTON_DESCRIPTIONS[button_type]
+        model_name = entry.data.get(CONF_FRIENDLY_NAME, "")
+        base_name = (SKYCOOKER_NAME + " " + model_name).strip()
+        self._attr_unique_id = entity_object_id(button_type, model_name, entry.entry_id)
+        self.entity_id = self._attr_unique_id
+        self._attr_name = f"{base_name} {description.name}"
+        self._attr_icon = description.icon
 
     async def async_added_to_hass(self):
         """When entity is added to hass."""
@@ -38,6 +58,9 @@ class SkyCookerButton(ButtonEntity):
 
     def update(self):
         """Update the button entity."""
+        updates = self.hass.data[DOMAIN].get(self.entry.entry_id, {}).get(DATA_ENTITY_UPDATES)
+        if updates is not None:
+            updates[self.unique_id] += 1
         self.schedule_update_ha_state()
 
     @property
@@ -45,73 +68,11 @@ class SkyCookerButton(ButtonEntity):
         """Get the skycooker connection."""
         return self.hass.data[DOMAIN][self.entry.entry_id][DATA_CONNECTION]
 
-    @property
-    def unique_id(self):
-        """Return a unique ID."""
-        model_name = self.entry.data.get(CONF_FRIENDLY_NAME, "")
-        sanitized_model_name = sanitize_model_name(model_name)
-        sanitized_entry_id = sanitize_entry_id(self.entry.entry_id)
-        if self.button_type == BUTTON_TYPE_START:
-            return f"skycooker_start_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.button_type == BUTTON_TYPE_STOP:
-            return f"skycooker_stop_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.button_type == BUTTON_TYPE_START_DELAYED:
-            return f"skycooker_start_delayed_{sanitized_model_name}_{sanitized_entry_id}"
-        return f"skycooker_{self.button_type}_{sanitized_model_name}_{sanitized_entry_id}"
-
-    @property
-    def entity_id(self):
-        """Return the entity ID."""
-        model_name = self.entry.data.get(CONF_FRIENDLY_NAME, "")
-        sanitized_model_name = sanitize_model_name(model_name)
-        sanitized_entry_id = sanitize_entry_id(self.entry.entry_id)
-        if self.button_type == BUTTON_TYPE_START:
-            return f"skycooker_start_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.button_type == BUTTON_TYPE_STOP:
-            return f"skycooker_stop_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.button_type == BUTTON_TYPE_START_DELAYED:
-            return f"skycooker_start_delayed_{sanitized_model_name}_{sanitized_entry_id}"
-        return f"skycooker_{self.button_type}_{sanitized_model_name}_{sanitized_entry_id}"
-
     @property
     def device_info(self):
         """Return device info."""
         return self.hass.data[DOMAIN][DATA_DEVICE_INFO]()
 
-    @property
-    def should_poll(self):
-        """No polling needed."""
-        return False
-
-    @property
-    def assumed_state(self):
-        """Return true if unable to access real state of the entity."""
-        return False
-
-    @property
-    def name(self):
-        """Return the name of the button entity."""
-        base_name = (SKYCOOKER_NAME + " " + self.entry.data.get(CONF_FRIENDLY_NAME, "")).strip()
-        if self.button_type == BUTTON_TYPE_START:
-            return f"{base_name} start"
-        elif self.button_type == BUTTON_TYPE_STOP:
-            return f"{base_name} stop"
-        elif self.button_type == BUTTON_TYPE_START_DELAYED:
-            return f"{base_name} start delayed"
-         
-        return base_name
-
-    @property
-    def icon(self):
-        """Return the icon."""
-        if self.button_type == BUTTON_TYPE_START:
-            return "mdi:play"
-        elif self.button_type == BUTTON_TYPE_STOP:
-            return "mdi:stop"
-        elif self.button_type == BUTTON_TYPE_START_DELAYED:
-            return "mdi:timer-play"
-        return None
-
     @property
     def available(self):
         """Return if button entity is available."""
@@ -120,12 +81,7 @@ class SkyCookerButton(ButtonEntity):
     async def async_press(self) -> None:
         """Press the button."""
         try:
-            if self.button_type == BUTTON_TYPE_START:
-                await self.skycooker.start()
-            elif self.button_type == BUTTON_TYPE_STOP:
-                await self.skycooker.stop_cooking()
-            elif self.button_type == BUTTON_TYPE_START_DELAYED:
-                await self.skycooker.start_delayed()
+            await self._description.press(self.skycooker)
         except SkyCookerError as e:
             _LOGGER.error(f"❌ Ошибка при нажатии кнопки: {str(e)}")
             # Не вызываем raise, чтобы интерфейс не падал
@@ -0,0 +1,205 @@
+"""Raw frame capture and replay for the SkyCooker protocol."""
+import asyncio
+import heapq
+import json
+import struct
+from collections import deque, namedtuple
+from time import perf_counter
+
+from .clock import SYSTEM_CLOCK, Clock
+from .codec import decode_frame, redact_frame
+from .const import *
+
+Frame = namedtuple("Frame", ["seq", "time", "direction", "data"])
+
+ReplayResult = namedtuple("ReplayResult", ["frames", "replies", "statuses", "mismatched_seq",
+    "unexpected_echoes", "timeouts", "malformed", "elapsed"])
+
+# Бинарный формат: заголовок, затем записи <seq:u32><time:f64><dir:u8><len:u8><data>
+BINARY_MAGIC = b"SKYCAP\x01"
+_RECORD = struct.Struct("<IdBB")
+_DIRECTIONS = ("tx", "rx")
+
+
+class FrameCapture:
+    """Bounded ring buffer of TX/RX frames with monotonic timestamps."""
+
+    def __init__(self, size=CAPTURE_SIZE, clock=SYSTEM_CLOCK):
+        self._frames = deque(maxlen=size)
+        self._seq = 0
+        self._clock = clock
+
+    def record(self, direction, data):
+        # Ключ сопряжения из запроса AUTH в запись не попадает
+        if direction == "tx":
+            data = redact_frame(data)
+        self._frames.append(Frame(self._seq, self._clock.monotonic(), direction, bytes(data)))
+        self._seq += 1
+
+    def clear(self):
+        self._frames.clear()
+
+    def __len__(self):
+        return len(self._frames)
+
+    def __iter__(self):
+        return iter(self._frames)
+
+    def dump_jsonl(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for frame in self._frames:
+                f.write(json.dumps({"seq": frame.seq, "t": frame.time,
+                                    "dir": frame.direction, "data": frame.data.hex()}) + "\n")
+
+    def dump_binary(self, path):
+        with open(path, "wb") as f:
+            f.write(BINARY_MAGIC)
+            for frame in self._frames:
+                f.write(_RECORD.pack(frame.seq, frame.time, _DIRECTIONS.index(frame.direction), len(frame.data)))
+                f.write(frame.data)
+
+    @classmethod
+    def load(cls, path):
+        """Load a capture written by dump_jsonl() or dump_binary()."""
+        with open(path, "rb") as f:
+            raw = f.read()
+        frames = []
+        if raw.startswith(BINARY_MAGIC):
+            pos = len(BINARY_MAGIC)
+            while pos < len(raw):
+                seq, t, direction, length = _RECORD.unpack_from(raw, pos)
+                pos += _RECORD.size
+                frames.append(Frame(seq, t, _DIRECTIONS[direction], raw[pos:pos + length]))
+                pos += length
+        else:
+            for line in raw.decode("utf-8").splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                frames.append(Frame(item["seq"], item["t"], item["dir"], bytes.fromhex(item["data"])))
+        capture = cls(size=max(len(frames), 1))
+        capture._frames.extend(frames)
+        capture._seq = frames[-1].seq + 1 if frames else 0
+        return capture
+
+
+class ReplayClock(Clock):
+    """Virtual time of a replay.
+
+    Sleeping moves the time on at once and hands the scheduled RX frames that
+    are due by then to deliver, so a capture replays at full speed with its
+    original reply delays.
+    """
+
+    def __init__(self, deliver):
+        self.now = 0.0
+        self._due = []
+        self._deliver = deliver
+
+    def monotonic(self):
+        return self.now
+
+    def schedule(self, delay, data):
+        heapq.heappush(self._due, (self.now + delay, len(self._due), data))
+
+    def advance(self, until):
+        self.now = max(self.now, until)
+        while self._due and self._due[0][0] <= self.now:
+            self._deliver(heapq.heappop(self._due)[2])
+
+    async def sleep(self, delay):
+        self.advance(self.now + delay)
+        await asyncio.sleep(0)
+
+
+class _ReplayClient:
+    """GATT client of a replay: each write schedules the RX frames captured after that TX frame."""
+
+    is_connected = True
+
+    def __init__(self, clock, exchanges):
+        self._clock = clock
+        self._exchanges = exchanges
+
+    async def write_gatt_char(self, uuid, data):
+        for delay, reply in self._exchanges.popleft():
+            self._clock.schedule(delay, reply)
+
+
+async def async_replay(frames, model="RMC-M40S"):
+    """Feed captured frames through SkyCookerConnection on virtual time.
+
+    Every TX frame is sent again with its sequence id through command(), and
+    the RX frames that followed it arrive through _rx_callback with their
+    captured delays. Response rules, late replies and status handling run
+    the way they did against the device. Returns the statuses the
+    connection took and counts of late replies, replies with an unexpected
+    command, timeouts and frames that do not decode.
+    """
+    from .skycooker_connection import SkyCookerConnection
+
+    started = perf_counter()
+    frames = list(frames)
+    malformed = replies = 0
+    # RX кадры до первого TX приходят сразу, остальные - с задержкой после своего TX
+    leading, requests, exchanges = [], [], deque()
+    for frame in frames:
+        try:
+            request = decode_frame(frame.data)
+        except ValueError:
+            malformed += 1
+            request = None
+        if frame.direction == "tx":
+            if request is not None:
+                requests.append(request)
+                exchanges.append([])
+                sent = frame.time
+            continue
+        replies += 1
+        if exchanges:
+            exchanges[-1].append((max(0.0, frame.time - sent), frame.data))
+        else:
+            leading.append(frame.data)
+
+    clock = ReplayClock(lambda data: connection._rx_callback(None, data))
+    connection = SkyCookerConnection("replay", [0x00] * 8, persistent=True, model=model, clock=clock)
+    connection._client = _ReplayClient(clock, exchanges)
+    statuses = []
+    set_status = connection._set_status
+
+    def record_status(status, fresh=True, since=None):
+        if status is not None:
+            statuses.append(status)
+        set_status(status, fresh, since)
+
+    connection._set_status = record_status
+    for data in leading:
+        connection._rx_callback(None, data)
+    unexpected_echoes = 0
+    for seq, command, payload in requests:
+        # command() увеличивает номер запроса перед отправкой
+        connection._iter = (seq - 1) % 256
+        connection._pushed_status = None
+        try:
+            result = await connection.command(command, list(payload))
+        except IOError as ex:
+            if str(ex) == "Некорректная команда ответа":
+                unexpected_echoes += 1
+            continue
+        if command == COMMAND_GET_STATUS and len(result) >= 16:
+            connection._set_status(connection.parse_status(result))
+        elif connection._pushed_status is not None:
+            connection._set_status(connection._pushed_status)
+    # Ответы, пришедшие после последнего запроса
+    clock.advance(float("inf"))
+    return ReplayResult(len(frames), replies, statuses, connection._late_replies, unexpected_echoes,
+                        sum(connection._timeouts.values()), malformed, perf_counter() - started)
+
+
+def replay(frames, model="RMC-M40S"):
+    """Run async_replay() on an event loop of its own."""
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(async_replay(frames, model))
+    finally:
+        loop.close()
@@ -0,0 +1,156 @@
+"""Command line tool for SkyCooker cookers, works without HomeAssistant.
+
+    python custom_components/skycooker/cli.py --address AA:BB:CC:DD:EE:FF status
+    python custom_components/skycooker/cli.py --fake benchmark --count 1000
+"""
+import os
+import sys
+
+if __name__ == "__main__" and not __package__:
+    # Запуск файлом: пакет регистрируется без __init__.py интеграции, поэтому HomeAssistant не нужен.
+    # Каталог скрипта убирается из sys.path, иначе select.py интеграции закроет модуль select
+    import types
+    _root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    sys.path[0] = _root
+    __package__ = "custom_components.skycooker"
+    sys.modules[__package__] = types.ModuleType(__package__)
+    sys.modules[__package__].__path__ = [os.path.join(_root, "custom_components", "skycooker")]
+
+import argparse
+import asyncio
+from time import perf_counter
+
+from .client import SkyCookerClient
+from .const import *
+from .skycooker import SkyCookerError
+from .transport import BleakTransport, FakeCooker
+
+DEFAULT_KEY = "0000000000000000"
+DEFAULT_MODEL = "RMC-M40S"
+
+
+def format_status(client, status):
+    mode = status.mode_label(client.model_code, 0) or status.mode
+    return (f"{status.status_label(0)}: mode={mode} subprog={status.subprog} temp={status.target_temp} "
+            f"boil={status.target_boil_hours}:{status.target_boil_minutes:02d} "
+            f"delay={status.target_delayed_start_hours}:{status.target_delayed_start_minutes:02d} "
+            f"auto_warm={status.auto_warm}")
+
+
+def parse_mode(capabilities, value):
+    """Return the mode index for an index or a mode name in any language."""
+    if value.isdigit():
+        return int(value)
+    name = value.strip().lower()
+    for idx, names in enumerate(capabilities.names):
+        if idx not in capabilities.none_modes and name in (n.lower() for n in names):
+            return idx
+    raise SkyCookerError(f"Неизвестный режим \"{value}\"")
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+async def cmd_status(client, args):
+    print(format_status(client, await client.get_status()))
+
+
+async def cmd_start(client, args):
+    delay_hours, delay_minutes = divmod(args.delay, 60)
+    status = await client.start(parse_mode(client.capabilities, args.mode), args.subprog, args.temp,
+                                args.hours, args.minutes, delay_hours, delay_minutes, not args.no_auto_warm)
+    print(format_status(client, status))
+
+
+async def cmd_stop(client, args):
+    print(format_status(client, await client.stop()))
+
+
+async def cmd_monitor(client, args):
+    count = 0
+    last = None
+    async for status in client.watch(args.interval):
+        if status != last:
+            print(format_status(client, status), flush=True)
+            last = status
+        count += 1
+        if args.count and count >= args.count:
+            break
+
+
+async def cmd_benchmark(client, args):
+    latencies = []
+    started = perf_counter()
+    for _ in range(args.count):
+        t = perf_counter()
+        await client.get_status()
+        latencies.append(perf_counter() - t)
+    elapsed = perf_counter() - started
+    print(f"{args.count} polls in {elapsed:.3f}s: {args.count / elapsed:.1f}/s, "
+          f"p50={percentile(latencies, 0.5) * 1000:.2f}ms p95={percentile(latencies, 0.95) * 1000:.2f}ms "
+          f"max={max(latencies) * 1000:.2f}ms")
+
+
+COMMANDS = {
+    "status": cmd_status,
+    "start": cmd_start,
+    "stop": cmd_stop,
+    "monitor": cmd_monitor,
+    "benchmark": cmd_benchmark,
+}
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="skycooker", description="Control a Redmond SkyCooker over Bluetooth")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--address", help="MAC address of the cooker")
+    target.add_argument("--fake", action="store_true", help="use an in-memory fake cooker")
+    parser.add_argument("--model", default=DEFAULT_MODEL, choices=sorted(MODELS))
+    parser.add_argument("--key", default=DEFAULT_KEY, help="authentication key, hex")
+    parser.add_argument("--adapter", help="Bluetooth adapter, e.g. hci0")
+    parser.add_argument("--latency", type=float, default=0.0, help="reply latency of the fake cooker, seconds")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("status", help="print the current status")
+    start = commands.add_parser("start", help="start a program")
+    start.add_argument("mode", help="mode index or name")
+    start.add_argument("--subprog", type=int, default=0)
+    start.add_argument("--temp", type=int)
+    start.add_argument("--hours", type=int)
+    start.add_argument("--minutes", type=int)
+    start.add_argument("--delay", type=int, default=0, help="delayed start, minutes")
+    start.add_argument("--no-auto-warm", action="store_true")
+    commands.add_parser("stop", help="stop the program")
+    monitor = commands.add_parser("monitor", help="print status changes")
+    monitor.add_argument("--interval", type=float, default=DEFAULT_SCAN_INTERVAL)
+    monitor.add_argument("--count", type=int, default=0, help="number of polls, 0 - forever")
+    benchmark = commands.add_parser("benchmark", help="measure status poll round trips")
+    benchmark.add_argument("--count", type=int, default=100)
+    return parser
+
+
+async def run(args):
+    key = list(bytes.fromhex(args.key))
+    if args.fake:
+        transport = FakeCooker(key=key, latency=args.latency)
+    else:
+        transport = BleakTransport(args.address, adapter=args.adapter)
+    async with SkyCookerClient(transport, key, args.model) as client:
+        await COMMANDS[args.command](client, args)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        asyncio.run(run(args))
+    except KeyboardInterrupt:
+        pass
+    except (SkyCookerError, IOError, ValueError, ImportError) as e:
+        print(f"skycooker: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
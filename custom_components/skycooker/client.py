@@ -0,0 +1,118 @@
+"""Standalone asyncio SkyCooker client, independent of HomeAssistant."""
+import asyncio
+import logging
+
+from .codec import decode_frame, encode_frame
+from .const import *
+from .skycooker import SkyCooker, SkyCookerError
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SkyCookerClient(SkyCooker):
+    """Protocol client over a pluggable transport.
+
+    Commands are serialized, every request waits on a future keyed by its
+    sequence id, so replies are routed without polling. Frames nobody waits
+    for are checked for pushed statuses.
+    """
+
+    def __init__(self, transport, key, model, timeout=BLE_RECV_TIMEOUT):
+        super().__init__(model)
+        self.transport = transport
+        self.key = key
+        self.timeout = timeout
+        self.sw_version = None
+        self.status = None
+        self._seq = 0
+        self._waiters = {}
+        self._lock = asyncio.Lock()
+        self._response_rules = {**DEFAULT_RESPONSE_RULES, **RESPONSE_RULES.get(self.model_code, {})}
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.disconnect()
+
+    async def connect(self):
+        """Connect, authenticate and read the firmware version."""
+        await self.transport.connect(self._on_frame)
+        if not await self.auth(self.key):
+            await self.disconnect()
+            raise SkyCookerError("Ошибка аутентификации. Включите режим сопряжения на мультиварке")
+        self.sw_version = await self.get_version()
+
+    async def disconnect(self):
+        for future in self._waiters.values():
+            future.cancel()
+        self._waiters.clear()
+        await self.transport.disconnect()
+
+    def _on_frame(self, data):
+        try:
+            seq, reply, payload = decode_frame(data)
+        except ValueError as e:
+            _LOGGER.warning("⚠️  %s", e)
+            return
+        future = self._waiters.pop(seq, None)
+        if future is not None and not future.done():
+            future.set_result((reply, payload))
+        elif reply == COMMAND_GET_STATUS and len(payload) >= 16:
+            self.status = self.parse_status(payload)
+
+    async def command(self, command, params=None):
+        async with self._lock:
+            if not self.transport.is_connected:
+                raise IOError("🔌 Не подключено")
+            self._seq = (self._seq + 1) % 256
+            seq = self._seq
+            future = self._waiters[seq] = asyncio.get_running_loop().create_future()
+            try:
+                await self.transport.write(encode_frame(seq, command, params or b""))
+                reply, payload = await asyncio.wait_for(future, self.timeout)
+            except asyncio.TimeoutError:
+                raise IOError("Таймаут приема")
+            finally:
+                self._waiters.pop(seq, None)
+        if reply != command:
+            rule = self._response_rules.get((command, reply))
+            if rule == RESPONSE_ACK:
+                if reply == COMMAND_GET_STATUS and len(payload) >= 16:
+                    self.status = self.parse_status(payload)
+                return bytes([0x01])
+            if rule == RESPONSE_PAYLOAD:
+                return payload
+            raise IOError("Некорректная команда ответа")
+        return payload
+
+    async def get_status(self):
+        self.status = await super().get_status()
+        return self.status
+
+    async def start(self, mode, subprog=0, temp=None, boil_hours=None, boil_minutes=None,
+                    delayed_start_hours=0, delayed_start_minutes=0, auto_warm=True):
+        """Start a program, defaults come from the mode table of the model."""
+        capabilities = self.capabilities
+        if mode not in capabilities.valid_modes:
+            raise SkyCookerError(f"Режим {mode} не поддерживается моделью {self.model}")
+        mode_data = capabilities.modes[mode]
+        temp = mode_data[0] if temp is None else temp
+        boil_hours = mode_data[1] if boil_hours is None else boil_hours
+        boil_minutes = mode_data[2] if boil_minutes is None else boil_minutes
+        await self.select_mode(mode, subprog)
+        await self.set_main_mode(mode, subprog, temp, boil_hours, boil_minutes,
+                                 delayed_start_hours, delayed_start_minutes, int(auto_warm))
+        await self.turn_on()
+        return await self.get_status()
+
+    async def stop(self):
+        await self.turn_off()
+        return await self.get_status()
+
+    async def watch(self, interval):
+        """Poll the status every `interval` seconds and yield it."""
+        while True:
+            yield await self.get_status()
+            await asyncio.sleep(interval)
@@ -0,0 +1,26 @@
+"""Time source of the SkyCooker connection."""
+import asyncio
+import time
+from datetime import datetime, timezone
+
+
+class Clock:
+    """Monotonic time and sleeping used by SkyCookerConnection.
+
+    The default reads the system clock. Tests pass a clock driven by a
+    virtual-time event loop, so timeouts and pauses between commands pass
+    instantly.
+    """
+
+    def monotonic(self):
+        return time.monotonic()
+
+    def now(self):
+        """Wall-clock time in UTC, for timestamps shown to the user."""
+        return datetime.now(timezone.utc)
+
+    async def sleep(self, delay):
+        await asyncio.sleep(delay)
+
+
+SYSTEM_CLOCK = Clock()
@@ -0,0 +1,28 @@
+"""Frame codec for the SkyCooker BLE protocol."""
+from .const import COMMAND_AUTH
+
+FRAME_START = 0x55
+FRAME_END = 0xAA
+
+
+def encode_frame(seq, command, params=b""):
+    """Build a frame: 55 <seq> <command> <params...> AA."""
+    return bytes([FRAME_START, seq, command, *params, FRAME_END])
+
+
+def decode_frame(frame):
+    """Split a frame into (seq, command, payload)."""
+    if len(frame) < 4 or frame[0] != FRAME_START or frame[-1] != FRAME_END:
+        raise ValueError(f"Некорректный формат кадра: {bytes(frame).hex().upper()}")
+    return frame[1], frame[2], bytes(frame[3:-1])
+
+
+def redact_frame(frame):
+    """Return the frame with the payload of an AUTH request zeroed, other frames as is.
+
+    The AUTH payload is the pairing key, it must not end up in diagnostics
+    or capture files.
+    """
+    if len(frame) > 4 and frame[2] == COMMAND_AUTH:
+        return bytes([*frame[:3], *bytes(len(frame) - 4), frame[-1]])
+    return frame
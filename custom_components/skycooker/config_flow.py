@@ -1,5 +1,6 @@
 """Config flow for SkyCooker integration."""
 
+import asyncio
 import logging
 import traceback
 
@@ -19,6 +20,49 @@ from .skycooker import SkyCooker
 _LOGGER = logging.getLogger(__name__)
 
 
+def known_model(name):
+    """Check a device name against MODELS before any connection attempt."""
+    return bool(name) and SkyCooker.get_model_code(name) is not None
+
+
+def format_mac(mac):
+    mac = mac.upper()
+    mac = mac.replace(':','').replace('-','').replace(' ','')
+    return ':'.join([mac[p*2:(p*2)+2] for p in range(6)])
+
+
+async def probe_devices(hass, devices, key):
+    """Probe discovered cookers concurrently with bounded concurrency per adapter.
+
+    Returns (mac, name, result, connection) for every device, the connection
+    is left open only for cookers that passed the probe. A probe that fails
+    with an error counts as PROBE_NOT_REACHABLE.
+    """
+    semaphores = {}
+
+    async def probe_one(info, semaphore):
+        skycooker = SkyCookerConnection(mac=format_mac(info.address), key=key, persistent=True,
+                                        hass=hass, model=info.name)
+        async with semaphore:
+            try:
+                result = await skycooker.probe()
+            except Exception as e:
+                # Ошибка одной мультиварки не должна оставлять сессии остальных без хозяина
+                _LOGGER.warning("⚠️  Проверка %s завершилась ошибкой: %s", info.address, e)
+                result = PROBE_NOT_REACHABLE
+        if result != PROBE_OK:
+            await skycooker.stop()
+            skycooker = None
+        return format_mac(info.address), info.name, result, skycooker
+
+    tasks = []
+    for info in devices:
+        # Источник обнаружения - адаптер или прокси, через который устройство видно
+        semaphore = semaphores.setdefault(getattr(info, "source", None), asyncio.Semaphore(PROBE_ADAPTER_CONCURRENCY))
+        tasks.append(probe_one(info, semaphore))
+    return await asyncio.gather(*tasks)
+
+
 class SkyCookerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
@@ -32,11 +76,16 @@ class SkyCookerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         """Initialize a new SkyCookerConfigFlow."""
         self.entry = entry
         self.config = {} if not entry else dict(entry.data.items())
+        # Проверенные этим мастером подключения и те из них, что переданы новым записям
+        self._probed = set()
+        self._handed = set()
+        # Готовые к добавлению мультиварки: подпись в форме -> (MAC, модель)
+        self._ready = {}
+        # Остальные выбранные мультиварки, записи для них создаются вместе с текущей
+        self._batch = []
 
     async def init_mac(self, mac):
-        mac = mac.upper()
-        mac = mac.replace(':','').replace('-','').replace(' ','')
-        mac = ':'.join([mac[p*2:(p*2)+2] for p in range(6)])
+        mac = format_mac(mac)
         id = f"{DOMAIN}-{mac}"
         if id in self._async_current_ids():
             return False
@@ -48,46 +97,101 @@ class SkyCookerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_user(self, user_input=None):
         """Handle the user step."""
         return await self.async_step_scan()
+
+    async def async_step_bluetooth(self, discovery_info):
+        """Handle a multicooker discovered by the bluetooth integration."""
+        name = discovery_info.name
+        _LOGGER.debug("Bluetooth discovery: %s - %s", discovery_info.address, name)
+        if not known_model(name):
+            return self.async_abort(reason='unknown_model')
+        if not await self.init_mac(discovery_info.address):
+            return self.async_abort(reason='already_configured')
+        self.config[CONF_FRIENDLY_NAME] = name
+        self.context["title_placeholders"] = {"name": f"{name} ({self.config[CONF_MAC]})"}
+        return await self.async_step_bluetooth_confirm()
+
+    async def async_step_bluetooth_confirm(self, user_input=None):
+        """Confirm setup of a discovered multicooker."""
+        if user_input is not None:
+            return await self.async_step_connect()
+        return self.async_show_form(
+            step_id="bluetooth_confirm",
+            description_placeholders={"name": self.config[CONF_FRIENDLY_NAME], "mac": self.config[CONF_MAC]},
+            data_schema=vol.Schema({})
+        )
     
     async def async_step_scan(self, user_input=None):
-        """Handle the scan step."""
+        """Handle the scan step.
+
+        All discovered cookers are probed at once, the ones in pairing mode
+        are offered for selection and set up in one pass.
+        """
         errors = {}
-        if user_input is not None:
-            spl = user_input[CONF_MAC].split(' ', maxsplit=1)
-            mac = spl[0]
-            name = spl[1][1:-1] if len(spl) >= 2 else None
-            if not SkyCooker.get_model_code(name):
-                return self.async_abort(reason='unknown_model')
+        if user_input is not None and user_input.get(CONF_MAC):
+            selected = [self._ready[label] for label in user_input[CONF_MAC] if label in self._ready]
+            self._release_paired(self._probed - {mac for mac, name in selected})
+            if not selected:
+                return self.async_abort(reason='skycooker_not_found')
+            (mac, name), self._batch = selected[0], selected[1:]
             if not await self.init_mac(mac):
                 return self.async_abort(reason='already_configured')
-            if name: self.config[CONF_FRIENDLY_NAME] = name
-            return await self.async_step_connect()
+            self.config[CONF_FRIENDLY_NAME] = name
+            return await self.async_step_init()
+        # Повторная отправка формы без выбора - новая проверка
+        self._release_paired(self._probed)
 
         try:
             try:
-                scanner = bluetooth.async_get_scanner(self.hass)
-                for device in scanner.discovered_devices:
-                    _LOGGER.debug(f"Device found: {device.address} - {device.name}")
+                # Список уже найденных устройств ведет сама интеграция bluetooth, сканер не опрашивается
+                discovered = bluetooth.async_discovered_service_info(self.hass, connectable=True)
             except:
                 _LOGGER.error("Bluetooth integration not working")
                 return self.async_abort(reason='no_bluetooth')
-            devices_filtered = [device for device in scanner.discovered_devices if device.name and (device.name.startswith("RMC-") or device.name.startswith("RFS-"))]
+            configured = self._async_current_ids()
+            devices_filtered = [info for info in discovered
+                                if known_model(info.name) and f"{DOMAIN}-{info.address.upper()}" not in configured]
             if len(devices_filtered) == 0:
                 return self.async_abort(reason='skycooker_not_found')
-            mac_list = [f"{r.address} ({r.name})" for r in devices_filtered]
-            schema = vol.Schema(
-            {
-                vol.Required(CONF_MAC): vol.In(mac_list)
-            })
+            self._ready = {}
+            not_ready = []
+            for mac, name, result, skycooker in await probe_devices(self.hass, devices_filtered,
+                                                                    list(bytes.fromhex("0000000000000000"))):
+                if skycooker is None:
+                    not_ready.append(f"{mac} ({name}): {result}")
+                    continue
+                self._store_paired(mac, skycooker)
+                self._ready[f"{mac} ({name})"] = (mac, name)
+            if self._ready:
+                schema = vol.Schema(
+                {
+                    vol.Required(CONF_MAC, default=list(self._ready)): cv.multi_select({label: label for label in self._ready})
+                })
+            else:
+                errors["base"] = PROBE_NOT_PAIRING
+                schema = vol.Schema({})
         except Exception:
             _LOGGER.error(traceback.format_exc())
             return self.async_abort(reason='unknown')
         return self.async_show_form(
             step_id="scan",
             errors=errors,
-            data_schema=schema
+            data_schema=schema,
+            description_placeholders={"not_ready": "\n".join(not_ready) or "-"}
         )
 
+    async def async_step_batch(self, data):
+        """Create an entry for a cooker selected together with another one.
+
+        Started with SOURCE_BATCH by the flow that set up the first selected
+        cooker, data carries its settings and the MAC and model of this one.
+        """
+        if not await self.init_mac(data[CONF_MAC]):
+            self._release_paired({format_mac(data[CONF_MAC])})
+            return self.async_abort(reason='already_configured')
+        self.config.update({k: v for k, v in data.items() if k != CONF_MAC})
+        fname = f"{self.config.get(CONF_FRIENDLY_NAME, SKYCOOKER_NAME)} ({self.config[CONF_MAC]})"
+        return self.async_create_entry(title=fname, data=self.config)
+
     async def async_step_connect(self, user_input=None):
         """Handle the connect step."""
         errors = {}
@@ -100,21 +204,13 @@ class SkyCookerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 hass=self.hass,
                 model=self.config.get(CONF_FRIENDLY_NAME, None)
             )
-            tries = 3
-            while tries > 0 and not skycooker.last_connect_ok:
-                await skycooker.update()
-                tries = tries - 1
-              
-            connect_ok = skycooker.last_connect_ok
-            auth_ok = skycooker.last_auth_ok
-            await skycooker.stop()
-         
-            if not connect_ok:
-                errors["base"] = "cant_connect"
-            elif not auth_ok:
-                errors["base"] = "cant_auth"
-            else:
+            result = await skycooker.probe()
+            if result == PROBE_OK:
+                # Проверенное подключение передается новой записи, повторно подключаться не нужно
+                self._store_paired(self.config[CONF_MAC], skycooker)
                 return await self.async_step_init()
+            await skycooker.stop()
+            errors["base"] = result
 
         return self.async_show_form(
             step_id="connect",
@@ -122,15 +218,45 @@ class SkyCookerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             data_schema=vol.Schema({})
         )  
 
+    def _store_paired(self, mac, skycooker):
+        """Keep a probed session for the entry that will be created."""
+        self._release_paired({mac})
+        self.hass.data.setdefault(DOMAIN, {}).setdefault(DATA_PAIRED, {})[mac] = skycooker
+        self._probed.add(mac)
+
+    def _release_paired(self, macs):
+        """Stop sessions probed by this flow that no entry has taken."""
+        paired = self.hass.data.get(DOMAIN, {}).get(DATA_PAIRED, {})
+        for mac in macs:
+            skycooker = paired.pop(mac, None)
+            if skycooker is not None:
+                self.hass.async_create_task(skycooker.stop())
+        self._probed -= set(macs)
+
+    @callback
+    def async_remove(self):
+        """Stop the probed sessions when the flow is aborted."""
+        if self.entry is None and self.hass is not None:
+            self._release_paired(self._probed - self._handed)
+
     async def async_step_init(self, user_input=None):
         """Handle the options step."""
         errors = {}
         if user_input is not None:
             self.config[CONF_SCAN_INTERVAL] = user_input[CONF_SCAN_INTERVAL]
             self.config[CONF_PERSISTENT_CONNECTION] = user_input[CONF_PERSISTENT_CONNECTION]
+            self.config[CONF_LIVE_APPLY] = user_input.get(CONF_LIVE_APPLY, DEFAULT_LIVE_APPLY)
             fname = f"{self.config.get(CONF_FRIENDLY_NAME, SKYCOOKER_NAME)} ({self.config[CONF_MAC]})"
             if self.entry:
                 self.hass.config_entries.async_update_entry(self.entry, data=self.config)
+            else:
+                self._handed.add(self.config[CONF_MAC])
+                # Остальные выбранные мультиварки получают те же настройки
+                for mac, name in self._batch:
+                    self._handed.add(mac)
+                    self.hass.async_create_task(self.hass.config_entries.flow.async_init(
+                        DOMAIN, context={"source": SOURCE_BATCH},
+                        data={**self.config, CONF_MAC: mac, CONF_FRIENDLY_NAME: name}))
             _LOGGER.info(f"Config saved")
             return self.async_create_entry(
                 title=fname, data=self.config if not self.entry else {}
@@ -140,6 +266,7 @@ class SkyCookerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         {
             vol.Required(CONF_PERSISTENT_CONNECTION, default=self.config.get(CONF_PERSISTENT_CONNECTION, DEFAULT_PERSISTENT_CONNECTION)): cv.boolean,
             vol.Required(CONF_SCAN_INTERVAL, default=self.config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)): vol.All(vol.Coerce(int), vol.Range(min=1, max=60)),
+            vol.Required(CONF_LIVE_APPLY, default=self.config.get(CONF_LIVE_APPLY, DEFAULT_LIVE_APPLY)): cv.boolean,
         })
 
         return self.async_show_form(
@@ -1,6 +1,9 @@
 # Constants for SkyCooker integration
 DOMAIN = "skycooker"
 
+# Минимальная версия HomeAssistant (major, minor, patch)
+MIN_HA_VERSION = (2025, 12, 5)
+
 # Function to sanitize model name for unique_id
 def sanitize_model_name(model_name):
     """Sanitize model name to contain only Latin letters, numbers, and underscores."""
@@ -42,6 +45,11 @@ def sanitize_entry_id(entry_id):
     
     return sanitized
 
+
+def entity_object_id(entity_type, model_name, entry_id):
+    """Build the unique ID (also used as the entity ID) of a SkyCooker entity."""
+    return f"{entity_type}_{sanitize_model_name(model_name)}_{sanitize_entry_id(entry_id)}"
+
 MODEL_0 = 0
 MODEL_1 = 1
 MODEL_2 = 2
@@ -110,329 +118,17 @@ MODELS = {
     "RMC-CBF390S": MODEL_2,
 }
 
-# Mode data for each model
-MODE_DATA = {
-    MODEL_0: [
-        [0, 0, 0, 0],
-        [100, 0, 30, 15], [100, 0, 35, 7], [97, 3, 0, 7], [110, 1, 0, 7],
-        [180, 0, 15, 133], [100, 1, 0, 135], [100, 0, 8, 5], [95, 0, 35, 7],
-        [99, 1, 0, 7], [40, 8, 0, 6], [145, 0, 45, 7], [100, 0, 40, 135],
-        [100, 0, 40, 7]
-    ],
-    MODEL_1: [
-        [0, 0, 0, 0],
-        [100, 0, 30, 15], [100, 0, 30, 7], [100, 1, 0, 135], [100, 1, 30, 7],
-        [100, 0, 35, 135], [100, 0, 40, 135], [100, 0, 50, 135], [97, 3, 0, 7],
-        [170, 0, 18, 133], [145, 1, 0, 7], [150, 0, 30, 7], [110, 0, 35, 7],
-        [38, 8, 0, 6], [150, 3, 0, 7], [100, 0, 8, 4], [98, 0, 15, 7],
-        [40, 0, 10, 7], [63, 2, 30, 6], [160, 0, 18, 132], [98, 0, 20, 7],
-        [100, 0, 20, 64]
-    ],
-    MODEL_2: [
-        [0, 0, 0, 0],
-        [100, 3, 0, 135], [170, 0, 18, 133], [100, 0, 8, 4], [145, 1, 0, 7],
-        [100, 1, 0, 135], [38, 8, 0, 6], [100, 0, 30, 15], [40, 0, 10, 7],
-        [110, 0, 35, 7], [100, 0, 40, 135], [140, 1, 0, 7], [98, 0, 20, 7],
-        [150, 3, 0, 7], [100, 0, 20, 135], [100, 0, 15, 7], [98, 0, 30, 7],
-        [97, 3, 0, 7], [100, 0, 30, 4], [160, 0, 16, 132], [100, 0, 40, 135],
-        [100, 0, 30, 64], [70, 0, 0, 64]
-    ],
-    MODEL_3: [
-        [100, 0, 30, 15], [101, 0, 30, 7], [100, 1, 0, 7], [165, 0, 18, 5],
-        [100, 1, 0, 7], [100, 0, 35, 7], [100, 0, 8, 4], [98, 3, 0, 7],
-        [100, 0, 40, 7], [140, 1, 0, 7], [100, 0, 25, 7], [110, 1, 0, 7],
-        [40, 8, 0, 6], [145, 0, 20, 7], [140, 3, 0, 7],
-        [0, 0, 0, 0], [62, 2, 30, 6]
-    ],
-    MODEL_4: [
-        [0, 0, 0, 0],
-        [100, 0, 10, 7], [150, 0, 15, 5], [100, 0, 25, 7], [140, 1, 0, 7],
-        [100, 1, 0, 7], [100, 0, 30, 15], [110, 1, 0, 7], [100, 1, 0, 7],
-        [100, 0, 30, 7], [38, 8, 0, 6], [100, 0, 0, 64]
-    ],
-    MODEL_5: [
-        [0, 0, 0, 0],
-        [100, 0, 30, 15], [97, 0, 10, 7], [100, 1, 0, 7], [170, 0, 15, 5],
-        [99, 1, 0, 7], [100, 0, 20, 7], [100, 0, 8, 4], [97, 5, 0, 7],
-        [100, 0, 40, 7], [145, 1, 0, 7], [100, 0, 35, 7], [110, 1, 0, 7],
-        [38, 8, 0, 6], [150, 0, 25, 7], [150, 3, 0, 7], [98, 0, 20, 7],
-        [100, 0, 20, 64]
-    ],
-    MODEL_6: [
-        [0, 0, 0, 0],
-        [100, 0, 30, 15], [97, 0, 10, 7], [100, 1, 0, 7], [170, 0, 15, 5],
-        [99, 1, 0, 7], [100, 0, 20, 7], [100, 0, 8, 4], [97, 5, 0, 7],
-        [100, 0, 40, 7], [145, 1, 0, 7], [100, 0, 35, 7], [110, 1, 0, 7],
-        [38, 8, 0, 6], [150, 0, 25, 7], [150, 3, 0, 7], [98, 0, 20, 7],
-        [100, 0, 0, 64], [100, 70, 30, 64]
-    ],
-    MODEL_7: [
-        [0, 0, 0, 0],
-        [150, 0, 15, 5], [100, 0, 25, 7], [100, 0, 30, 15], [110, 1, 0, 7],
-        [100, 0, 25, 7], [140, 1, 0, 7], [100, 1, 0, 7], [100, 1, 0, 7],
-        [100, 0, 30, 7], [40, 8, 0, 6], [100, 0, 20, 64], [70, 0, 30, 64]
-    ],
-}
-
-# Constants for mode names
-MODE_STANDBY = [
-    "Standby Mode",
-    "Режим ожидания",
-]
-
-MODE_MULTI_CHEF = [
-    "Multi-chef",
-    "Мультиповар",
-]
-
-MODE_RICE_CEREALS = [
-    "Rice/Cereals",
-    "Рис/Крупы",
-]
-
-MODE_LANGUOR = [
-    "Languor",
-    "Томление",
-]
-
-MODE_PILAF = [
-    "Pilaf",
-    "Плов",
-]
-
-MODE_FRYING = [
-    "Frying",
-    "Жарка",
-]
-
-MODE_STEWING = [
-    "Stewing",
-    "Тушение",
-]
-
-MODE_PASTA = [
-    "Pasta",
-    "Паста/Макароны",
-]
-
-MODE_MILK_PORRIDGE = [
-    "Milk porridge",
-    "Молочная каша",
-]
-
-MODE_SOUP = [
-    "Soup",
-    "Суп",
-]
-
-MODE_YOGURT = [
-    "Yogurt",
-    "Йогурт",
-]
-
-MODE_BAKING = [
-    "Baking",
-    "Выпечка",
-]
 
-MODE_STEAM = [
-    "Steam",
-    "На пару",
-]
+# Таблицы режимов и продуктов (MODE_DATA, MODE_NAMES, PRODUCT_DATA, ...) лежат в tables.py
+# и загружаются при первом обращении; "from .const import *" их не включает
+def __getattr__(name):
+    if name.startswith(("MODE_", "PRODUCT_")):
+        from . import tables
+        if hasattr(tables, name):
+            value = globals()[name] = getattr(tables, name)
+            return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-MODE_COOKING_LEGUMES = [
-    "Cooking/Legumes",
-    "Варка/Бобовые",
-]
-
-MODE_WILDFOWL = [
-    "Wildfowl",
-    "Дичь",
-]
-
-MODE_PIZZA = [
-    "Pizza",
-    "Пицца",
-]
-
-MODE_BREAD = [
-    "Bread",
-    "Хлеб",
-]
-
-MODE_BABY_FOOD = [
-    "Baby food",
-    "Детское питание",
-]
-
-MODE_SOUS_VIDE = [
-    "Sous-vide",
-    "Вакуум",
-]
-
-MODE_DEEP_FRYING = [
-    "Deep frying",
-    "Фритюр",
-]
-
-MODE_DESSERTS = [
-    "Desserts",
-    "Десерты",
-]
-
-MODE_EXPRESS = [
-    "Express",
-    "Экспресс",
-]
-
-MODE_GALANTINE = [
-    "Galantine",
-    "Холодец",
-]
-
-MODE_YOGURT_DOUGH = [
-    "Yogurt/Dough",
-    "Йогурт/Тесто",
-]
-
-MODE_CHEESECAKE = [
-    "Cheesecake",
-    "Запеканка/Чизкейк",
-]
-
-MODE_SOUS = [
-    "Sous",
-    "Соус",
-]
-
-MODE_WARMING_UP = [
-    "Warming up",
-    "Разогрев",
-]
-
-MODE_WARMING = [
-    "Warming",
-    "Подогрев",
-]
-
-MODE_COOKING = [
-    "Cooking",
-    "Варка",
-]
-
-MODE_NONE = [
-    "None",
-    "Нет"
-]
-
-# Mode names for each model
-MODE_NAMES = {
-    MODEL_0: [
-        MODE_STANDBY,
-        MODE_MULTI_CHEF, MODE_RICE_CEREALS, MODE_LANGUOR, MODE_PILAF,
-        MODE_FRYING, MODE_STEWING, MODE_PASTA, MODE_MILK_PORRIDGE,
-        MODE_SOUP, MODE_YOGURT, MODE_BAKING, MODE_STEAM,
-        MODE_COOKING_LEGUMES
-    ],
-    MODEL_1: [
-        MODE_STANDBY,
-        MODE_MULTI_CHEF, MODE_RICE_CEREALS, MODE_SOUP, MODE_WILDFOWL,
-        MODE_STEAM, MODE_COOKING, MODE_STEWING, MODE_LANGUOR,
-        MODE_FRYING, MODE_BAKING, MODE_PIZZA, MODE_PILAF,
-        MODE_YOGURT, MODE_BREAD, MODE_PASTA, MODE_MILK_PORRIDGE,
-        MODE_BABY_FOOD, MODE_SOUS_VIDE, MODE_DEEP_FRYING, MODE_DESSERTS,
-        MODE_EXPRESS
-    ],
-    MODEL_2: [
-        MODE_STANDBY,
-        MODE_GALANTINE, MODE_FRYING, MODE_PASTA, MODE_BAKING,
-        MODE_STEWING, MODE_YOGURT_DOUGH, MODE_MULTI_CHEF, MODE_BABY_FOOD,
-        MODE_PILAF, MODE_SOUP, MODE_CHEESECAKE, MODE_MILK_PORRIDGE,
-        MODE_BREAD, MODE_STEAM, MODE_RICE_CEREALS, MODE_DESSERTS,
-        MODE_LANGUOR, MODE_SOUS, MODE_DEEP_FRYING, MODE_COOKING,
-        MODE_EXPRESS, MODE_WARMING_UP
-    ],
-    MODEL_3: [
-        MODE_MULTI_CHEF, MODE_MILK_PORRIDGE, MODE_STEWING, MODE_FRYING,
-        MODE_SOUP, MODE_STEAM, MODE_PASTA, MODE_LANGUOR,
-        MODE_COOKING, MODE_BAKING, MODE_RICE_CEREALS, MODE_PILAF,
-        MODE_YOGURT, MODE_PIZZA, MODE_BREAD, MODE_NONE,
-        MODE_SOUS_VIDE, MODE_STANDBY
-    ],
-    MODEL_4: [
-        MODE_STANDBY,
-        MODE_RICE_CEREALS, MODE_FRYING, MODE_STEAM, MODE_BAKING,
-        MODE_STEWING, MODE_MULTI_CHEF, MODE_PILAF, MODE_SOUP,
-        MODE_MILK_PORRIDGE, MODE_YOGURT, MODE_EXPRESS
-    ],
-    MODEL_5: [
-        MODE_STANDBY,
-        MODE_MULTI_CHEF, MODE_MILK_PORRIDGE, MODE_STEWING, MODE_FRYING,
-        MODE_SOUP, MODE_STEAM, MODE_PASTA, MODE_LANGUOR,
-        MODE_COOKING, MODE_BAKING, MODE_RICE_CEREALS, MODE_PILAF,
-        MODE_YOGURT, MODE_PIZZA, MODE_BREAD, MODE_DESSERTS,
-        MODE_EXPRESS
-    ],
-    MODEL_6: [
-        MODE_STANDBY,
-        MODE_MULTI_CHEF, MODE_MILK_PORRIDGE, MODE_STEWING, MODE_FRYING,
-        MODE_SOUP, MODE_STEAM, MODE_PASTA, MODE_LANGUOR,
-        MODE_COOKING, MODE_BAKING, MODE_RICE_CEREALS, MODE_PILAF,
-        MODE_YOGURT, MODE_PIZZA, MODE_BREAD, MODE_DESSERTS,
-        MODE_EXPRESS, MODE_WARMING
-    ],
-    MODEL_7: [
-        MODE_STANDBY,
-        MODE_FRYING, MODE_RICE_CEREALS, MODE_MULTI_CHEF, MODE_PILAF,
-        MODE_STEAM, MODE_BAKING, MODE_STEWING, MODE_SOUP,
-        MODE_MILK_PORRIDGE, MODE_YOGURT, MODE_EXPRESS, MODE_WARMING_UP
-    ],
-}
-
-# Product data for each model
-PRODUCT_DATA = {
-    MODEL_0: [
-        [4, 18, 12, 15, 0], [5, 40, 35, 60, 0], [11, 30, 25, 40, 0]
-    ],
-    MODEL_1: [
-        [2, 60, 50, 40, 30], [4, 35, 30, 25, 20], [5, 40, 30, 20, 18], [6, 50, 40, 20, 18],
-        [8, 18, 15, 12, 16], [18, 18, 16, 15, 13]
-    ],
-    MODEL_2: [
-        [2, 60, 50, 40, 30], [4, 35, 30, 25, 20], [5, 40, 30, 20, 18], [6, 50, 40, 20, 18],
-        [8, 18, 15, 12, 16], [18, 18, 16, 15, 13]
-    ],
-}
-
-# Cooking modes
-
-# Product names for each model
-PRODUCT_NAMES = {
-    MODEL_0: [
-        [
-            "No choice", "Vegetables", "Fish", "Meat", "Bird"
-        ],
-        [
-            "Нет выбора", "Овощи", "Рыба", "Мясо", "Птица"
-        ],
-    ],
-    MODEL_1: [
-        [
-            "No choice", "Vegetables", "Fish", "Meat", "Bird", "Desserts"
-        ],
-        [
-            "Нет выбора", "Овощи", "Рыба", "Мясо", "Птица", "Десерты"
-        ],
-    ],
-    MODEL_2: [
-        [
-            "No choice", "Vegetables", "Fish", "Meat", "Bird", "Desserts"
-        ],
-        [
-            "Нет выбора", "Овощи", "Рыба", "Мясо", "Птица", "Десерты"
-        ],
-    ],
-}
 
 # Status codes
 STATUS_OFF = 0x00
@@ -465,11 +161,13 @@ STATUS_CODES = [
 
 # Config flow constants
 CONF_PERSISTENT_CONNECTION = "persistent_connection"
+CONF_LIVE_APPLY = "live_apply"
 CONF_MODEL = "model"
 
 # Default values
 DEFAULT_SCAN_INTERVAL = 30
 DEFAULT_PERSISTENT_CONNECTION = True
+DEFAULT_LIVE_APPLY = False
 
 # Friendly names
 FRIENDLY_NAME = "SkyCooker"
@@ -500,6 +198,13 @@ SENSOR_TYPE_SUCCESS_RATE = "skycooker_success_rate"
 SENSOR_TYPE_DELAYED_LAUNCH_TIME = "skycooker_delayed_launch_time"
 SENSOR_TYPE_CURRENT_MODE = "skycooker_current_mode"
 SENSOR_TYPE_SUBPROGRAM = "skycooker_subprogram"
+SENSOR_TYPE_CONSECUTIVE_FAILURES = "skycooker_consecutive_failures"
+SENSOR_TYPE_LAST_SUCCESS = "skycooker_last_success"
+SENSOR_TYPE_TIMEOUTS_PER_HOUR = "skycooker_timeouts_per_hour"
+SENSOR_TYPE_POLL_LATENCY = "skycooker_poll_latency"
+LINK_SENSORS = (SENSOR_TYPE_SUCCESS_RATE, SENSOR_TYPE_CONSECUTIVE_FAILURES, SENSOR_TYPE_LAST_SUCCESS,
+                SENSOR_TYPE_TIMEOUTS_PER_HOUR, SENSOR_TYPE_POLL_LATENCY)
+COUNTDOWN_SENSORS = (SENSOR_TYPE_REMAINING_TIME, SENSOR_TYPE_TOTAL_TIME, SENSOR_TYPE_DELAYED_LAUNCH_TIME, SENSOR_TYPE_AUTO_WARM_TIME)
 
 # Switch types
 SWITCH_TYPE_AUTO_WARM = "skycooker_auto_warm"
@@ -513,15 +218,86 @@ MAX_TRIES = 3
 TRIES_INTERVAL = 0.5
 STATS_INTERVAL = 15
 TARGET_TTL = 30
+# Пауза после последнего изменения настроек перед отправкой их на готовящую мультиварку
+LIVE_APPLY_DELAY = 2.0
+LIVE_APPLY_STATUSES = (STATUS_DELAYED_LAUNCH, STATUS_WARMING, STATUS_COOKING)
+# Сколько ждать подтверждения оптимистичного состояния от мультиварки
+OPTIMISTIC_TTL = 10
+# Статусы, в которых таймеры продвигаются локально между опросами
+COUNTDOWN_STATUSES = (STATUS_DELAYED_LAUNCH, STATUS_COOKING, STATUS_AUTO_WARM)
+
+# Pairing probe: одна попытка подключения и короткое ожидание ответа на AUTH
+PROBE_CONNECT_ATTEMPTS = 1
+PROBE_AUTH_TIMEOUT = 1.0
+# Сколько мультиварок одновременно проверяется через один адаптер при поиске
+PROBE_ADAPTER_CONCURRENCY = 3
+# Источник мастера для остальных мультиварок, выбранных при поиске вместе с первой
+SOURCE_BATCH = "batch"
+# Результаты проверки, совпадают с кодами ошибок мастера настройки
+PROBE_OK = "ok"
+PROBE_NOT_REACHABLE = "cant_connect"
+PROBE_NOT_PAIRING = "not_pairing"
+PROBE_AUTH_REJECTED = "cant_auth"
+
+# Diagnostics
+DIAG_FRAMES_HISTORY = 32
+DIAG_POLL_HISTORY = 20
+DIAG_LATENCY_BUCKETS = [0.1, 0.25, 0.5, 1.0, BLE_RECV_TIMEOUT]
+
+# Frame capture
+CAPTURE_SIZE = 2000
+CAPTURE_MAX_SIZE = 100000
+
+# Link quality
+LINK_STATS_WINDOW = 100
+LINK_LATENCY_ALPHA = 0.2
+LINK_TIMEOUTS_PERIOD = 3600
+LINK_TIMEOUTS_LIMIT = 1000
 
 # Data keys
 DATA_CONNECTION = "connection"
 DATA_CANCEL = "cancel"
 DATA_WORKING = "working"
 DATA_DEVICE_INFO = "device_info"
+DATA_ENTITY_UPDATES = "entity_updates"
+DATA_TICK_CANCEL = "tick_cancel"
+# Подключения, проверенные мастером настройки, по MAC до создания записи
+DATA_PAIRED = "paired"
 
 # Dispatcher
 DISPATCHER_UPDATE = "update"
+# Поминутное обновление таймеров, сигнал отдельный для каждой записи: f"{DISPATCHER_TICK}_{entry_id}"
+DISPATCHER_TICK = "tick"
+
+# Services
+SERVICE_RUN_PROGRAM = "run_program"
+ATTR_ENTRY_ID = "entry_id"
+ATTR_MODE = "mode"
+ATTR_SUBPROGRAM = "subprogram"
+ATTR_TEMPERATURE = "temperature"
+ATTR_DURATION = "duration"
+ATTR_DELAY = "delay"
+ATTR_AUTO_WARM = "auto_warm"
+PROGRAM_MIN_TEMP = 35
+PROGRAM_MAX_TEMP = 200
+SERVICE_BULK_COMMAND = "bulk_command"
+SERVICE_REFRESH = "refresh"
+ATTR_MAX_AGE = "max_age"
+ATTR_ENTRY_IDS = "entry_ids"
+ATTR_COMMAND = "command"
+BULK_COMMAND_START = "start"
+BULK_COMMAND_STOP = "stop"
+BULK_COMMAND_PROGRAM = "program"
+BULK_COMMANDS = [BULK_COMMAND_START, BULK_COMMAND_STOP, BULK_COMMAND_PROGRAM]
+# Сколько мультиварок одновременно обслуживает один адаптер при массовых командах
+BULK_ADAPTER_CONCURRENCY = 3
+# Запись кадров протокола для разбора проблем с конкретной мультиваркой
+SERVICE_CAPTURE = "capture"
+ATTR_ACTION = "action"
+ATTR_SIZE = "size"
+CAPTURE_START = "start"
+CAPTURE_STOP = "stop"
+CAPTURE_ACTIONS = [CAPTURE_START, CAPTURE_STOP]
 
 # Commands
 COMMAND_GET_VERSION = 0x01
@@ -534,6 +310,40 @@ COMMAND_SYNC_TIME = 0x6E
 COMMAND_GET_TIME = 0x6F
 COMMAND_AUTH = 0xFF
 
+# Команды, которые можно безопасно считать выполненными по ответу на предыдущий такой же запрос
+IDEMPOTENT_COMMANDS = (COMMAND_GET_VERSION, COMMAND_GET_STATUS, COMMAND_GET_TIME)
+
+# Число последних идентификаторов запросов, ответы на которые ещё принимаются
+RESPONSE_WINDOW = 8
+
+# Обработка ответов с неожиданной командой: (отправленная команда, команда в ответе) -> действие
+RESPONSE_ACK = "ack"            # команда выполнена, ответ заменяется кодом успеха 01
+RESPONSE_PAYLOAD = "payload"    # вернуть данные ответа как есть
+DEFAULT_RESPONSE_RULES = {
+    # После SELECT_MODE, SET_MAIN_MODE и TURN_ON устройство может сразу прислать статус
+    (COMMAND_SELECT_MODE, COMMAND_GET_STATUS): RESPONSE_ACK,
+    (COMMAND_SET_MAIN_MODE, COMMAND_GET_STATUS): RESPONSE_ACK,
+    (COMMAND_TURN_ON, COMMAND_GET_STATUS): RESPONSE_ACK,
+    # Вместо статуса может прийти отложенный ответ на предыдущую команду
+    (COMMAND_GET_STATUS, COMMAND_SELECT_MODE): RESPONSE_PAYLOAD,
+    (COMMAND_GET_STATUS, COMMAND_SET_MAIN_MODE): RESPONSE_PAYLOAD,
+    (COMMAND_GET_STATUS, COMMAND_TURN_OFF): RESPONSE_PAYLOAD,
+}
+# Дополнения и переопределения правил для отдельных моделей: {модель: {(команда, ответ): действие}}.
+# Все известные модели пока обходятся общими правилами
+RESPONSE_RULES = {}
+
+# Model features that do not follow from the mode tables
+# Порядок полей в кадрах SELECT_MODE и SET_MAIN_MODE
+SELECT_MODE_FIELDS = ("mode", "subprog")
+MAIN_MODE_FIELDS = ("mode", "subprog", "target_temp", "target_boil_hours", "target_boil_minutes",
+                    "target_delayed_start_hours", "target_delayed_start_minutes", "auto_warm", "bit_flags")
+DEFAULT_MODEL_FEATURES = {"subprograms": True, "bit_flags": True}
+# MODEL_3 не поддерживает подпрограммы и не принимает битовые флаги
+MODEL_FEATURES = {
+    MODEL_3: {"subprograms": False, "bit_flags": False},
+}
+
 # Bit flags for mode settings (uint8_t)
 # Битовые флаги для настроек режима
 BIT_FLAG_SUBMODE_ENABLE = 0x80        # B[7] - включение подрежима
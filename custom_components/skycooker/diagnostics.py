@@ -0,0 +1,30 @@
+"""Diagnostics support for SkyCooker."""
+from homeassistant.components import bluetooth
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.const import CONF_MAC, CONF_PASSWORD
+
+from .const import *
+
+TO_REDACT = {CONF_MAC, CONF_PASSWORD}
+
+
+async def async_get_config_entry_diagnostics(hass, entry):
+    """Return diagnostics for a config entry."""
+    data = hass.data.get(DOMAIN, {}).get(entry.entry_id, {})
+    skycooker = data.get(DATA_CONNECTION)
+
+    # Путь до устройства: через какой адаптер или прокси его видно последним
+    path = None
+    service_info = bluetooth.async_last_service_info(hass, entry.data[CONF_MAC], connectable=True)
+    if service_info:
+        path = {
+            "source": service_info.source,
+            "rssi": service_info.rssi,
+        }
+
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "path": path,
+        "connection": skycooker.diagnostics() if skycooker else None,
+        "entity_updates": dict(data.get(DATA_ENTITY_UPDATES, {})),
+    }
@@ -0,0 +1,71 @@
+"""Rolling link quality statistics for the SkyCooker connection."""
+from collections import deque
+
+from .clock import SYSTEM_CLOCK
+from .const import *
+
+
+class LinkStats:
+    """Link quality counters updated in O(1) per poll.
+
+    The success rate is kept as a ring of the last results plus a running
+    count of successes, poll latency as an EWMA, and timeouts as a queue of
+    timestamps trimmed to the last hour. Times come from the clock of the
+    connection.
+    """
+
+    def __init__(self, size=LINK_STATS_WINDOW, clock=SYSTEM_CLOCK):
+        self._clock = clock
+        self.window = deque(maxlen=size)
+        self.ok = 0
+        self.consecutive_failures = 0
+        self.last_success = None
+        self.last_success_at = None
+        self.poll_latency = None
+        self._timeouts = deque(maxlen=LINK_TIMEOUTS_LIMIT)
+
+    def add(self, success):
+        """Add a poll result to the ring."""
+        if len(self.window) == self.window.maxlen and self.window[0]:
+            self.ok -= 1
+        self.window.append(success)
+        if success:
+            self.ok += 1
+            self.consecutive_failures = 0
+            self.last_success = self._clock.monotonic()
+            self.last_success_at = self._clock.now()
+        else:
+            self.consecutive_failures += 1
+
+    def reset(self, results):
+        """Replace the ring with the given results."""
+        self.window.clear()
+        self.window.extend(results)
+        self.ok = sum(1 for s in self.window if s)
+
+    def add_latency(self, latency):
+        """Add a successful poll duration to the moving average."""
+        if self.poll_latency is None:
+            self.poll_latency = latency
+        else:
+            self.poll_latency += LINK_LATENCY_ALPHA * (latency - self.poll_latency)
+
+    def add_timeout(self):
+        self._timeouts.append(self._clock.monotonic())
+
+    @property
+    def success_rate(self):
+        if not self.window: return 0
+        return int(100 * self.ok / len(self.window))
+
+    @property
+    def timeouts_per_hour(self):
+        limit = self._clock.monotonic() - LINK_TIMEOUTS_PERIOD
+        while self._timeouts and self._timeouts[0] < limit:
+            self._timeouts.popleft()
+        return len(self._timeouts)
+
+    @property
+    def since_last_success(self):
+        if self.last_success is None: return None
+        return self._clock.monotonic() - self.last_success
@@ -0,0 +1,124 @@
+"""Model capability registry compiled once per model from the tables.py tables."""
+from bisect import bisect_left
+from collections import namedtuple
+from collections.abc import Mapping
+from struct import Struct
+from types import MappingProxyType
+
+from .const import *
+
+
+class FrameLayout(namedtuple("FrameLayout", ["fields", "struct"])):
+    """Field order and byte layout of a command payload."""
+    __slots__ = ()
+
+    def pack(self, **values):
+        return self.struct.pack(*(int(values[name]) for name in self.fields))
+
+
+ModelCapabilities = namedtuple("ModelCapabilities", [
+    "code", "models", "modes", "names", "valid_modes", "none_modes", "mode_by_temp", "temperatures", "temperature_modes",
+    "subprograms", "select_mode_frame", "main_mode_frame", "bit_flags", "products", "product_names",
+])
+
+
+def frame_layout(fields):
+    return FrameLayout(tuple(fields), Struct("<" + "B" * len(fields)))
+
+
+def _compile(model_code):
+    from .tables import MODE_DATA, MODE_NAMES, MODE_NONE, MODE_STANDBY, PRODUCT_DATA, PRODUCT_NAMES
+    modes = tuple(tuple(row) for row in MODE_DATA.get(model_code, []))
+    names = tuple(tuple(row) for row in MODE_NAMES.get(model_code, []))
+    features = {**DEFAULT_MODEL_FEATURES, **MODEL_FEATURES.get(model_code, {})}
+    # Запускать можно только режимы, у которых есть и параметры, и название
+    count = min(len(modes), len(names))
+    valid_modes = frozenset(i for i in range(count) if list(names[i]) not in (MODE_NONE, MODE_STANDBY))
+    mode_by_temp = {}
+    for idx, row in enumerate(modes):
+        mode_by_temp.setdefault(row[0], idx)
+    # Отсортированный индекс температур для поиска ближайшего режима
+    temperatures = tuple(sorted(mode_by_temp))
+    return ModelCapabilities(
+        code=model_code,
+        models=tuple(model for model, code in MODELS.items() if code == model_code),
+        modes=modes,
+        names=names,
+        valid_modes=valid_modes,
+        none_modes=frozenset(i for i, row in enumerate(names) if list(row) == MODE_NONE),
+        mode_by_temp=MappingProxyType(mode_by_temp),
+        temperatures=temperatures,
+        temperature_modes=tuple(mode_by_temp[temp] for temp in temperatures),
+        subprograms=features["subprograms"],
+        select_mode_frame=frame_layout(SELECT_MODE_FIELDS if features["subprograms"] else SELECT_MODE_FIELDS[:1]),
+        main_mode_frame=frame_layout(MAIN_MODE_FIELDS if features["bit_flags"] else MAIN_MODE_FIELDS[:-1]),
+        bit_flags=tuple(row[3] for row in modes) if features["bit_flags"] else None,
+        products=tuple(tuple(row) for row in PRODUCT_DATA.get(model_code, [])),
+        product_names=tuple(tuple(row) for row in PRODUCT_NAMES.get(model_code, [])),
+    )
+
+
+class _CapabilityRegistry(Mapping):
+    """Read-only mapping of model codes to capabilities.
+
+    Tables of a model are compiled on first access, so importing the
+    package does not pay for models that are never configured.
+    """
+
+    def __init__(self, codes):
+        self._codes = tuple(codes)
+        self._compiled = {}
+
+    def __getitem__(self, model_code):
+        capabilities = self._compiled.get(model_code)
+        if capabilities is None:
+            if model_code not in self._codes:
+                raise KeyError(model_code)
+            capabilities = self._compiled[model_code] = _compile(model_code)
+        return capabilities
+
+    def __contains__(self, model_code):
+        return model_code in self._codes
+
+    def __iter__(self):
+        return iter(self._codes)
+
+    def __len__(self):
+        return len(self._codes)
+
+
+MODEL_CAPABILITIES = _CapabilityRegistry(sorted(set(MODELS.values())))
+
+# Для неизвестных моделей кадры собираются в полном формате
+DEFAULT_SELECT_MODE_FRAME = frame_layout(SELECT_MODE_FIELDS)
+DEFAULT_MAIN_MODE_FRAME = frame_layout(MAIN_MODE_FIELDS)
+
+
+def get_capabilities(model_code):
+    """Return the capabilities of a model code, None for an unknown model."""
+    return MODEL_CAPABILITIES.get(model_code)
+
+
+def nearest_mode(capabilities, temperature):
+    """Return the mode whose temperature is closest to the given one.
+
+    Equally close temperatures resolve to the lower mode index. Returns None
+    when the model has no modes.
+    """
+    temperatures = capabilities.temperatures
+    if not temperatures: return None
+    pos = bisect_left(temperatures, temperature)
+    if pos == len(temperatures):
+        return capabilities.temperature_modes[-1]
+    if pos == 0 or temperatures[pos] == temperature:
+        return capabilities.temperature_modes[pos]
+    lower, upper = capabilities.temperature_modes[pos - 1], capabilities.temperature_modes[pos]
+    lower_diff, upper_diff = temperature - temperatures[pos - 1], temperatures[pos] - temperature
+    if lower_diff == upper_diff:
+        return min(lower, upper)
+    return lower if lower_diff < upper_diff else upper
+
+
+def supports_subprograms(model_code):
+    capabilities = get_capabilities(model_code)
+    return capabilities.subprograms if capabilities is not None else True
@@ -1,14 +1,115 @@
 """SkyCooker select entities."""
 import logging
+from collections import namedtuple
+from functools import lru_cache
 
 from homeassistant.components.select import SelectEntity
 from homeassistant.const import CONF_FRIENDLY_NAME
 from homeassistant.helpers.dispatcher import async_dispatcher_connect, async_dispatcher_send
 
 from .const import *
+from .models import get_capabilities, supports_subprograms
 
 _LOGGER = logging.getLogger(__name__)
 
+
+def _mode_option(select):
+    # Используем текущий режим устройства или установленный пользователем
+    mode_id = select.skycooker.current_mode
+    if mode_id is None:
+        return None
+
+    if select.skycooker.model_code is None:
+        return f"Unknown ({mode_id})"
+
+    # Для MODE_NONE и неизвестных режимов названия нет
+    labels = select._mode_options().labels
+    if mode_id >= len(labels) or labels[mode_id] is None:
+        return f"Unknown ({mode_id})"
+    return labels[mode_id]
+
+
+def _subprogram_option(select):
+    # Возвращаем текущую подпрограмму из статуса устройства
+    if select.skycooker.status and select.skycooker.status.subprog is not None:
+        return str(select.skycooker.status.subprog)
+    return "0"
+
+
+def _temperature_option(select):
+    # Возвращаем текущую температуру из пользовательских настроек или статуса
+    if getattr(select.skycooker, '_target_temperature', None) is not None:
+        return str(select.skycooker._target_temperature)
+    elif select.skycooker.status and select.skycooker.status.target_temp:
+        return str(select.skycooker.status.target_temp)
+    return None
+
+
+def _target_option(attribute, status_field):
+    """Option function: the user setting if set, otherwise the value from the status."""
+    def option(select):
+        value = getattr(select.skycooker, attribute, None)
+        if value is not None:
+            return str(value)
+        elif select.skycooker.status:
+            return str(getattr(select.skycooker.status, status_field))
+        return None
+    return option
+
+
+ModeOptions = namedtuple("ModeOptions", ["options", "labels", "index"])
+
+
+@lru_cache(maxsize=None)
+def mode_options(model_code, lang_index):
+    """Compile the mode options of a model for one language.
+
+    Returns the option list, the option of every mode index (None for
+    MODE_NONE) and the first mode index of every option. The result is
+    shared by all entities of the model.
+    """
+    from .tables import MODE_NAMES, MODE_NONE
+    mode_constants = MODE_NAMES.get(model_code, [])
+    options = [c[lang_index] for c in mode_constants if c and len(c) > lang_index]
+    labels = tuple(c[lang_index] if c and len(c) > lang_index and c != MODE_NONE else None
+                   for c in mode_constants)
+    index = {}
+    for idx, mode_constant in enumerate(mode_constants):
+        if mode_constant and len(mode_constant) > lang_index:
+            index.setdefault(mode_constant[lang_index], idx)
+    return ModeOptions(options, labels, index)
+
+
+# Подпрограммы ограничены 0-15 для безопасности, температура 40-200 с шагом 5
+SUBPROGRAM_OPTIONS = [str(i) for i in range(0, 16)]
+TEMPERATURE_OPTIONS = [str(temp) for temp in range(40, 201, 5)]
+HOUR_OPTIONS = [str(hour) for hour in range(0, 24)]
+MINUTE_OPTIONS = [str(minute) for minute in range(0, 60)]
+
+SelectDescription = namedtuple("SelectDescription", ["name", "icon", "current_option", "options"])
+
+SELECT_DESCRIPTIONS = {
+    # Список режимов зависит от модели и языка, см. mode_options()
+    SELECT_TYPE_MODE: SelectDescription("mode", "mdi:chef-hat", _mode_option, None),
+    SELECT_TYPE_SUBPROGRAM: SelectDescription(
+        "subprogram", "mdi:cog-outline", _subprogram_option, SUBPROGRAM_OPTIONS),
+    SELECT_TYPE_TEMPERATURE: SelectDescription(
+        "temperature", "mdi:thermometer", _temperature_option, TEMPERATURE_OPTIONS),
+    SELECT_TYPE_COOKING_TIME_HOURS: SelectDescription(
+        "cooking time (hours)", "mdi:timer",
+        _target_option("target_boil_hours", "target_boil_hours"), HOUR_OPTIONS),
+    SELECT_TYPE_COOKING_TIME_MINUTES: SelectDescription(
+        "cooking time (minutes)", "mdi:timer",
+        _target_option("target_boil_minutes", "target_boil_minutes"), MINUTE_OPTIONS),
+    SELECT_TYPE_DELAYED_START_HOURS: SelectDescription(
+        "delayed start (hours)", "mdi:timer-sand",
+        _target_option("_target_delayed_start_hours", "target_delayed_start_hours"), HOUR_OPTIONS),
+    SELECT_TYPE_DELAYED_START_MINUTES: SelectDescription(
+        "delayed start (minutes)", "mdi:timer-sand",
+        _target_option("_target_delayed_start_minutes", "target_delayed_start_minutes"), MINUTE_OPTIONS),
+}
+
+
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up the SkyCooker select entities."""
     entities = [
@@ -20,22 +121,33 @@ async def async_setup_entry(hass, entry, async_add_entities):
         SkyCookerSelect(hass, entry, SELECT_TYPE_DELAYED_START_MINUTES),
     ]
     
-    # Добавляем селект для подпрограммы только если модель не MODEL_3
+    # Добавляем селект для подпрограммы только если модель поддерживает подпрограммы
     skycooker = hass.data[DOMAIN][entry.entry_id][DATA_CONNECTION]
-    if skycooker.model_code != MODEL_3:
+    if supports_subprograms(skycooker.model_code):
         entities.append(SkyCookerSelect(hass, entry, SELECT_TYPE_SUBPROGRAM))
-    
+
     async_add_entities(entities)
 
 
 class SkyCookerSelect(SelectEntity):
     """Representation of a SkyCooker select entity."""
 
+    _attr_should_poll = False
+    _attr_assumed_state = False
+
     def __init__(self, hass, entry, select_type):
         """Initialize the select entity."""
         self.hass = hass
         self.entry = entry
         self.select_type = select_type
+        # Метаданные не меняются, вычисляем их один раз
+        description = self._description = SELECT_DESCRIPTIONS[select_type]
+        model_name = entry.data.get(CONF_FRIENDLY_NAME, "")
+        base_name = (SKYCOOKER_NAME + " " + model_name).strip()
+        self._attr_unique_id = entity_object_id(select_type, model_name, entry.entry_id)
+        self.entity_id = self._attr_unique_id
+        self._attr_name = f"{base_name} {description.name}"
+        self._attr_icon = description.icon
 
     async def async_added_to_hass(self):
         """When entity is added to hass."""
@@ -44,6 +156,9 @@ class SkyCookerSelect(SelectEntity):
 
     def update(self):
         """Update the select entity."""
+        updates = self.hass.data[DOMAIN].get(self.entry.entry_id, {}).get(DATA_ENTITY_UPDATES)
+        if updates is not None:
+            updates[self.unique_id] += 1
         self.schedule_update_ha_state()
 
     @property
@@ -51,101 +166,11 @@ class SkyCookerSelect(SelectEntity):
         """Get the skycooker connection."""
         return self.hass.data[DOMAIN][self.entry.entry_id][DATA_CONNECTION]
 
-    @property
-    def unique_id(self):
-        """Return a unique ID."""
-        model_name = self.entry.data.get(CONF_FRIENDLY_NAME, "")
-        sanitized_model_name = sanitize_model_name(model_name)
-        sanitized_entry_id = sanitize_entry_id(self.entry.entry_id)
-        if self.select_type == SELECT_TYPE_MODE:
-            return f"skycooker_mode_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.select_type == SELECT_TYPE_SUBPROGRAM:
-            return f"skycooker_subprogram_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.select_type == SELECT_TYPE_TEMPERATURE:
-            return f"skycooker_temperature_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.select_type == SELECT_TYPE_COOKING_TIME_HOURS:
-            return f"skycooker_cooking_time_hours_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.select_type == SELECT_TYPE_COOKING_TIME_MINUTES:
-            return f"skycooker_cooking_time_minutes_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.select_type == SELECT_TYPE_DELAYED_START_HOURS:
-            return f"skycooker_delayed_start_hours_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.select_type == SELECT_TYPE_DELAYED_START_MINUTES:
-            return f"skycooker_delayed_start_minutes_{sanitized_model_name}_{sanitized_entry_id}"
-        return f"skycooker_{self.select_type}_{sanitized_model_name}_{sanitized_entry_id}"
-
-    @property
-    def entity_id(self):
-        """Return the entity ID."""
-        model_name = self.entry.data.get(CONF_FRIENDLY_NAME, "")
-        sanitized_model_name = sanitize_model_name(model_name)
-        sanitized_entry_id = sanitize_entry_id(self.entry.entry_id)
-        if self.select_type == SELECT_TYPE_MODE:
-            return f"skycooker_mode_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.select_type == SELECT_TYPE_SUBPROGRAM:
-            return f"skycooker_subprogram_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.select_type == SELECT_TYPE_TEMPERATURE:
-            return f"skycooker_temperature_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.select_type == SELECT_TYPE_COOKING_TIME_HOURS:
-            return f"skycooker_cooking_time_hours_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.select_type == SELECT_TYPE_COOKING_TIME_MINUTES:
-            return f"skycooker_cooking_time_minutes_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.select_type == SELECT_TYPE_DELAYED_START_HOURS:
-            return f"skycooker_delayed_start_hours_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.select_type == SELECT_TYPE_DELAYED_START_MINUTES:
-            return f"skycooker_delayed_start_minutes_{sanitized_model_name}_{sanitized_entry_id}"
-        return f"skycooker_{self.select_type}_{sanitized_model_name}_{sanitized_entry_id}"
-
     @property
     def device_info(self):
         """Return device info."""
         return self.hass.data[DOMAIN][DATA_DEVICE_INFO]()
 
-    @property
-    def should_poll(self):
-        """No polling needed."""
-        return False
-
-    @property
-    def assumed_state(self):
-        """Return true if unable to access real state of the entity."""
-        return False
-
-    @property
-    def name(self):
-        """Return the name of the select entity."""
-        base_name = (SKYCOOKER_NAME + " " + self.entry.data.get(CONF_FRIENDLY_NAME, "")).strip()
-        if self.select_type == SELECT_TYPE_MODE:
-            return f"{base_name} mode"
-        elif self.select_type == SELECT_TYPE_SUBPROGRAM:
-            return f"{base_name} subprogram"
-        elif self.select_type == SELECT_TYPE_TEMPERATURE:
-            return f"{base_name} temperature"
-        elif self.select_type == SELECT_TYPE_COOKING_TIME_HOURS:
-            return f"{base_name} cooking time (hours)"
-        elif self.select_type == SELECT_TYPE_COOKING_TIME_MINUTES:
-            return f"{base_name} cooking time (minutes)"
-        elif self.select_type == SELECT_TYPE_DELAYED_START_HOURS:
-            return f"{base_name} delayed start (hours)"
-        elif self.select_type == SELECT_TYPE_DELAYED_START_MINUTES:
-            return f"{base_name} delayed start (minutes)"
-         
-        return base_name
-
-    @property
-    def icon(self):
-        """Return the icon."""
-        if self.select_type == SELECT_TYPE_MODE:
-            return "mdi:chef-hat"
-        elif self.select_type == SELECT_TYPE_SUBPROGRAM:
-            return "mdi:cog-outline"
-        elif self.select_type == SELECT_TYPE_TEMPERATURE:
-            return "mdi:thermometer"
-        elif self.select_type in [SELECT_TYPE_COOKING_TIME_HOURS, SELECT_TYPE_COOKING_TIME_MINUTES]:
-            return "mdi:timer"
-        elif self.select_type in [SELECT_TYPE_DELAYED_START_HOURS, SELECT_TYPE_DELAYED_START_MINUTES]:
-            return "mdi:timer-sand"
-        return None
-
     @property
     def available(self):
         """Return if select entity is available."""
@@ -154,151 +179,44 @@ class SkyCookerSelect(SelectEntity):
     @property
     def current_option(self):
         """Return the current selected option."""
-        if self.select_type == SELECT_TYPE_MODE:
-            # Используем текущий режим устройства или установленный пользователем
-            mode_id = self.skycooker.current_mode
-            if mode_id is None:
-                return None
-                
-            # Получаем тип модели из соединения
-            model_type = self.skycooker.model_code
-            if model_type is None:
-                return f"Unknown ({mode_id})"
-                
-            # Получаем названия режимов для текущей модели
-            mode_constants = MODE_NAMES.get(model_type, [])
-            if not mode_constants or mode_id >= len(mode_constants):
-                return f"Unknown ({mode_id})"
-                
-            # Определяем индекс языка (0 для английского, 1 для русского)
-            language = self.hass.config.language
-            lang_index = 0 if language == "en" else 1
-                
-            # Получаем название режима из константы
-            mode_constant = mode_constants[mode_id]
-            if mode_constant and len(mode_constant) > lang_index:
-                # Проверяем, является ли режим MODE_NONE
-                if mode_constant == MODE_NONE:
-                    return f"Unknown ({mode_id})"
-                return mode_constant[lang_index]
-            return f"Unknown ({mode_id})"
-        elif self.select_type == SELECT_TYPE_SUBPROGRAM:
-            # Возвращаем текущую подпрограмму из статуса устройства
-            if self.skycooker.status and self.skycooker.status.subprog is not None:
-                return str(self.skycooker.status.subprog)
-            return "0"
-        elif self.select_type == SELECT_TYPE_TEMPERATURE:
-            # Возвращаем текущую температуру из пользовательских настроек или статуса
-            if hasattr(self.skycooker, '_target_temperature') and self.skycooker._target_temperature is not None:
-                return str(self.skycooker._target_temperature)
-            elif self.skycooker.status and self.skycooker.status.target_temp:
-                return str(self.skycooker.status.target_temp)
-            return None
-        elif self.select_type == SELECT_TYPE_COOKING_TIME_HOURS:
-            # Возвращаем текущие часы из пользовательских настроек или статуса
-            if self.skycooker.target_boil_hours is not None:
-                return str(self.skycooker.target_boil_hours)
-            elif self.skycooker.status:
-                return str(self.skycooker.status.target_boil_hours)
-            return None
-        elif self.select_type == SELECT_TYPE_COOKING_TIME_MINUTES:
-            # Возвращаем текущие минуты из пользовательских настроек или статуса
-            if self.skycooker.target_boil_minutes is not None:
-                return str(self.skycooker.target_boil_minutes)
-            elif self.skycooker.status:
-                return str(self.skycooker.status.target_boil_minutes)
-            return None
-        elif self.select_type == SELECT_TYPE_DELAYED_START_HOURS:
-            # Возвращаем текущие часы отложенного запуска из пользовательских настроек или статуса
-            if getattr(self.skycooker, '_target_delayed_start_hours', None) is not None:
-                return str(self.skycooker._target_delayed_start_hours)
-            elif self.skycooker.status:
-                return str(self.skycooker.status.target_delayed_start_hours)
-            return None
-        elif self.select_type == SELECT_TYPE_DELAYED_START_MINUTES:
-            # Возвращаем текущие минуты отложенного запуска из пользовательских настроек или статуса
-            if getattr(self.skycooker, '_target_delayed_start_minutes', None) is not None:
-                return str(self.skycooker._target_delayed_start_minutes)
-            elif self.skycooker.status:
-                return str(self.skycooker.status.target_delayed_start_minutes)
-            return None
-        return None
+        return self._description.current_option(self)
 
     @property
     def options(self):
         """Return the available options."""
-        if self.select_type == SELECT_TYPE_MODE:
-            # Получаем тип модели из соединения
-            model_type = self.skycooker.model_code
-            if model_type is None:
-                return []
-              
-            # Получаем названия режимов для текущей модели
-            mode_constants = MODE_NAMES.get(model_type, [])
-            if not mode_constants:
-                return []
-              
-            # Определяем индекс языка (0 для английского, 1 для русского)
-            language = self.hass.config.language
-            lang_index = 0 if language == "en" else 1
-              
-            # Извлекаем названия режимов на нужном языке
-            return [mode_constant[lang_index] for mode_constant in mode_constants if mode_constant and len(mode_constant) > lang_index]
-        elif self.select_type == SELECT_TYPE_SUBPROGRAM:
-            # Опции подпрограмм от 0 до максимального значения
-            # Для большинства моделей это 0-255, но мы ограничим до 0-15 для безопасности
-            return [str(i) for i in range(0, 16)]
-        elif self.select_type == SELECT_TYPE_TEMPERATURE:
-            # Опции температуры от 40 до 200 с шагом 5
-            return [str(temp) for temp in range(40, 201, 5)]
-        elif self.select_type == SELECT_TYPE_COOKING_TIME_HOURS:
-            # Опции часов от 0 до 23
-            return [str(hour) for hour in range(0, 24)]
-        elif self.select_type == SELECT_TYPE_COOKING_TIME_MINUTES:
-            # Опции минут от 0 до 59
-            return [str(minute) for minute in range(0, 60)]
-        elif self.select_type == SELECT_TYPE_DELAYED_START_HOURS:
-            # Опции часов отложенного запуска от 0 до 23
-            return [str(hour) for hour in range(0, 24)]
-        elif self.select_type == SELECT_TYPE_DELAYED_START_MINUTES:
-            # Опции минут отложенного запуска от 0 до 59
-            return [str(minute) for minute in range(0, 60)]
-        return []
+        if self._description.options is not None:
+            return self._description.options
+        return self._mode_options().options
+
+    def _mode_options(self):
+        """Return the compiled mode options for the model and the current language."""
+        lang_index = 0 if self.hass.config.language == "en" else 1
+        return mode_options(self.skycooker.model_code, lang_index)
 
     async def async_select_option(self, option: str) -> None:
         """Change the selected option."""
         if self.select_type == SELECT_TYPE_MODE:
             # Получаем тип модели из соединения
             model_type = self.skycooker.model_code
-            if model_type is None:
+            capabilities = get_capabilities(model_type)
+            if capabilities is None:
                 return
                
             # Получаем названия режимов для текущей модели
-            mode_constants = MODE_NAMES.get(model_type, [])
-            if not mode_constants:
+            compiled = self._mode_options()
+            if not compiled.labels:
                 return
                
-            # Определяем индекс языка (0 для английского, 1 для русского)
-            language = self.hass.config.language
-            lang_index = 0 if language == "en" else 1
-               
             # Ищем идентификатор режима по названию
-            mode_id = None
-            for idx, mode_constant in enumerate(mode_constants):
-                if mode_constant and len(mode_constant) > lang_index and mode_constant[lang_index] == option:
-                    # Проверяем, является ли режим MODE_NONE
-                    if mode_constant == MODE_NONE:
-                        _LOGGER.error(f"❌ Попытка установить режим MODE_NONE (индекс {idx})")
-                        return
-                    mode_id = idx
-                    break
+            mode_id = compiled.index.get(option)
+            if mode_id is not None and compiled.labels[mode_id] is None:
+                _LOGGER.error(f"❌ Попытка установить режим MODE_NONE (индекс {mode_id})")
+                return
                    
-            if mode_id is not None:
-                # Получаем значения MODE_DATA для выбранного режима
-                model_type = self.skycooker.model_code
-                if model_type and model_type in MODE_DATA and mode_id < len(MODE_DATA[model_type]):
-                    mode_data = MODE_DATA[model_type][mode_id]
-                    _LOGGER.info(f"Selected mode {mode_id} for model {model_type}: temperature={mode_data[0]}, hours={mode_data[1]}, minutes={mode_data[2]}")
+            if mode_id is not None and mode_id < len(capabilities.modes):
+                # Значения выбранного режима из таблицы модели
+                mode_data = capabilities.modes[mode_id]
+                _LOGGER.info(f"Selected mode {mode_id} for model {model_type}: temperature={mode_data[0]}, hours={mode_data[1]}, minutes={mode_data[2]}")
                          
                 # Обновляем температуру и время приготовления данными режима только если пользователь не установил свои значения
                 if not hasattr(self.skycooker, '_target_temperature') or self.skycooker._target_temperature is None:
@@ -334,6 +252,9 @@ class SkyCookerSelect(SelectEntity):
         elif self.select_type == SELECT_TYPE_SUBPROGRAM:
             # Устанавливаем целевую подпрограмму
             self.skycooker._target_subprogram = int(option)
+
+        # Если мультиварка уже готовит, изменения применяются одним кадром после паузы
+        self.skycooker.schedule_apply()
            
         # Планируем обновление для обновления состояния сущности
         self.async_schedule_update_ha_state(True)
@@ -1,5 +1,6 @@
 """SkyCooker sensors."""
 import logging
+from collections import namedtuple
 
 from homeassistant.components.sensor import (SensorDeviceClass, SensorEntity,
                                               SensorStateClass)
@@ -9,10 +10,140 @@ from homeassistant.helpers.dispatcher import async_dispatcher_connect
 from homeassistant.helpers.entity import EntityCategory
 
 from .const import *
+from .models import supports_subprograms
 
 _LOGGER = logging.getLogger(__name__)
 
 
+SensorDescription = namedtuple("SensorDescription", [
+    "name", "icon", "value", "available", "device_class", "state_class", "unit", "entity_category",
+], defaults=(None, None, None, None))
+
+
+def _lang_index(sensor):
+    """Return 0 for English and 1 for Russian."""
+    return 0 if sensor.hass.config.language == "en" else 1
+
+
+def _standby(sensor):
+    return "Режим ожидания" if sensor.hass.config.language == "ru" else "Standby Mode"
+
+
+def _status_value(sensor):
+    status = sensor.skycooker.status
+    if status and hasattr(status, 'status'):
+        # Название статуса кэшируется в самом статусе
+        return status.status_label(_lang_index(sensor))
+    return "Unknown" if sensor.hass.config.language == "en" else "Неизвестно"
+
+
+def _temperature_value(sensor):
+    if sensor.skycooker.status_code == STATUS_OFF:
+        return 0
+    return sensor.skycooker.target_temp if sensor.skycooker.target_temp is not None else 0
+
+
+def _auto_warm_time_value(sensor):
+    # status_code - это режим, состояние подогрева видно только по полю status
+    status = sensor.skycooker.status
+    if status is not None and getattr(status, "status", None) == STATUS_AUTO_WARM:
+        # Время подогрева растет между опросами, см. SkyCookerConnection.auto_warm_time
+        return sensor.skycooker.auto_warm_time
+    return 0
+
+
+def _delayed_launch_time_value(sensor):
+    # Возвращаем время отложенного запуска, если оно установлено, независимо от текущего статуса
+    if sensor.skycooker.status_code is not None:
+        delayed_time = sensor.skycooker.delayed_start_time
+        # Если delayed_time не является callable (mock-объект) и не равен None, возвращаем его
+        if delayed_time is not None and not callable(delayed_time):
+            return delayed_time
+    return 0
+
+
+def _current_mode_value(sensor):
+    if sensor.skycooker.status_code == STATUS_OFF:
+        return _standby(sensor)
+    current_mode = sensor.skycooker.current_mode
+    if current_mode is None:
+        return _standby(sensor)
+    model_type = sensor.skycooker.model_code
+    if model_type is None:
+        return f"Unknown ({current_mode})"
+    # Название режима кэшируется в самом статусе
+    label = sensor.skycooker.status.mode_label(model_type, _lang_index(sensor))
+    return label if label is not None else f"Unknown ({current_mode})"
+
+
+def _subprogram_value(sensor):
+    if sensor.skycooker.status and sensor.skycooker.status.subprog is not None:
+        return str(sensor.skycooker.status.subprog)
+    return "0"
+
+
+def _or_zero(attribute):
+    """Value function returning a connection attribute, 0 when it is unknown."""
+    def value(sensor):
+        result = getattr(sensor.skycooker, attribute)
+        return result if result is not None else 0
+    return value
+
+
+def _attribute(attribute):
+    """Value function returning a connection attribute as is."""
+    return lambda sensor: getattr(sensor.skycooker, attribute)
+
+
+def _known(attribute):
+    """Availability function: the connection attribute has a value."""
+    return lambda sensor: getattr(sensor.skycooker, attribute) is not None
+
+
+def _always(sensor):
+    return True
+
+
+SENSOR_DESCRIPTIONS = {
+    SENSOR_TYPE_STATUS: SensorDescription(
+        "status", "mdi:information", _status_value, _known("status_code")),
+    SENSOR_TYPE_TEMPERATURE: SensorDescription(
+        "temperature", "mdi:thermometer", _temperature_value, _known("target_temp"),
+        SensorDeviceClass.TEMPERATURE, SensorStateClass.MEASUREMENT, UnitOfTemperature.CELSIUS),
+    SENSOR_TYPE_REMAINING_TIME: SensorDescription(
+        "remaining time", "mdi:timer", _or_zero("remaining_time"), _known("remaining_time"),
+        SensorDeviceClass.DURATION, SensorStateClass.MEASUREMENT, UnitOfTime.MINUTES),
+    SENSOR_TYPE_TOTAL_TIME: SensorDescription(
+        "total time", "mdi:clock", _or_zero("total_time"), _known("total_time"),
+        SensorDeviceClass.DURATION, SensorStateClass.MEASUREMENT, UnitOfTime.MINUTES),
+    SENSOR_TYPE_AUTO_WARM_TIME: SensorDescription(
+        "auto warm time", "mdi:clock-start", _auto_warm_time_value, _known("auto_warm_enabled"),
+        SensorDeviceClass.DURATION, SensorStateClass.MEASUREMENT, UnitOfTime.MINUTES),
+    SENSOR_TYPE_SUCCESS_RATE: SensorDescription(
+        "success rate", "mdi:bluetooth-connect", _or_zero("success_rate"), _always,
+        None, SensorStateClass.MEASUREMENT, PERCENTAGE, EntityCategory.DIAGNOSTIC),
+    SENSOR_TYPE_DELAYED_LAUNCH_TIME: SensorDescription(
+        "delayed launch time", "mdi:timer-sand", _delayed_launch_time_value, _always,
+        SensorDeviceClass.DURATION, SensorStateClass.MEASUREMENT, UnitOfTime.MINUTES),
+    # Режим ожидания показывается и без текущего режима, достаточно кода статуса
+    SENSOR_TYPE_CURRENT_MODE: SensorDescription(
+        "current mode", "mdi:chef-hat", _current_mode_value, _known("status_code")),
+    SENSOR_TYPE_SUBPROGRAM: SensorDescription(
+        "subprogram", "mdi:cog-outline", _subprogram_value,
+        lambda sensor: sensor.skycooker.status and sensor.skycooker.status.subprog is not None),
+    SENSOR_TYPE_CONSECUTIVE_FAILURES: SensorDescription(
+        "consecutive failures", "mdi:bluetooth-off", _attribute("consecutive_failures"), _always,
+        None, SensorStateClass.MEASUREMENT, None, EntityCategory.DIAGNOSTIC),
+    SENSOR_TYPE_LAST_SUCCESS: SensorDescription(
+        "last success", "mdi:bluetooth-audio", _attribute("last_success"), _always,
+        SensorDeviceClass.TIMESTAMP, None, None, EntityCategory.DIAGNOSTIC),
+    SENSOR_TYPE_TIMEOUTS_PER_HOUR: SensorDescription(
+        "timeouts per hour", "mdi:timer-alert-outline", _attribute("timeouts_per_hour"), _always,
+        None, SensorStateClass.MEASUREMENT, None, EntityCategory.DIAGNOSTIC),
+    SENSOR_TYPE_POLL_LATENCY: SensorDescription(
+        "poll latency", "mdi:timer-outline", _attribute("poll_latency"), _always,
+        SensorDeviceClass.DURATION, SensorStateClass.MEASUREMENT, UnitOfTime.SECONDS, EntityCategory.DIAGNOSTIC),
+}
 
 
 async def async_setup_entry(hass, entry, async_add_entities):
@@ -26,32 +157,63 @@ async def async_setup_entry(hass, entry, async_add_entities):
         SkyCookerSensor(hass, entry, SENSOR_TYPE_SUCCESS_RATE),
         SkyCookerSensor(hass, entry, SENSOR_TYPE_DELAYED_LAUNCH_TIME),
         SkyCookerSensor(hass, entry, SENSOR_TYPE_CURRENT_MODE),
+        SkyCookerSensor(hass, entry, SENSOR_TYPE_CONSECUTIVE_FAILURES),
+        SkyCookerSensor(hass, entry, SENSOR_TYPE_LAST_SUCCESS),
+        SkyCookerSensor(hass, entry, SENSOR_TYPE_TIMEOUTS_PER_HOUR),
+        SkyCookerSensor(hass, entry, SENSOR_TYPE_POLL_LATENCY),
     ]
-    
-    # Добавляем сенсор для подпрограммы только если модель не MODEL_3
+
+    # Добавляем сенсор для подпрограммы только если модель поддерживает подпрограммы
     skycooker = hass.data[DOMAIN][entry.entry_id][DATA_CONNECTION]
-    if skycooker.model_code != MODEL_3:
+    if supports_subprograms(skycooker.model_code):
         entities.append(SkyCookerSensor(hass, entry, SENSOR_TYPE_SUBPROGRAM))
-    
+
     async_add_entities(entities)
 
 
 class SkyCookerSensor(SensorEntity):
     """Representation of a SkyCooker sensor."""
 
+    _attr_should_poll = False
+    _attr_assumed_state = False
+
     def __init__(self, hass, entry, sensor_type):
         """Initialize the sensor."""
         self.hass = hass
         self.entry = entry
         self.sensor_type = sensor_type
+        self._written = None
+        # Метаданные не меняются, вычисляем их один раз
+        description = self._description = SENSOR_DESCRIPTIONS[sensor_type]
+        model_name = entry.data.get(CONF_FRIENDLY_NAME, "")
+        base_name = (SKYCOOKER_NAME + " " + model_name).strip()
+        self._attr_unique_id = entity_object_id(sensor_type, model_name, entry.entry_id)
+        self.entity_id = self._attr_unique_id
+        self._attr_name = f"{base_name} {description.name}"
+        self._attr_icon = description.icon
+        self._attr_device_class = description.device_class
+        self._attr_state_class = description.state_class
+        self._attr_native_unit_of_measurement = description.unit
+        self._attr_entity_category = description.entity_category
 
     async def async_added_to_hass(self):
         """When entity is added to hass."""
         self.update()
         self.async_on_remove(async_dispatcher_connect(self.hass, DISPATCHER_UPDATE, self.update))
+        if self.sensor_type in COUNTDOWN_SENSORS:
+            self.async_on_remove(async_dispatcher_connect(self.hass, f"{DISPATCHER_TICK}_{self.entry.entry_id}", self.update))
 
     def update(self):
         """Update the sensor."""
+        updates = self.hass.data[DOMAIN].get(self.entry.entry_id, {}).get(DATA_ENTITY_UPDATES)
+        if updates is not None:
+            updates[self.unique_id] += 1
+        if self.sensor_type in LINK_SENSORS:
+            # Диагностика связи меняется редко, пишем состояние только при изменении
+            state = (self.available, self.native_value)
+            if state == self._written:
+                return
+            self._written = state
         self.schedule_update_ha_state()
 
     @property
@@ -59,272 +221,33 @@ class SkyCookerSensor(SensorEntity):
         """Get the skycooker connection."""
         return self.hass.data[DOMAIN][self.entry.entry_id][DATA_CONNECTION]
 
-    @property
-    def unique_id(self):
-        """Return a unique ID."""
-        model_name = self.entry.data.get(CONF_FRIENDLY_NAME, "")
-        sanitized_model_name = sanitize_model_name(model_name)
-        sanitized_entry_id = sanitize_entry_id(self.entry.entry_id)
-        if self.sensor_type == SENSOR_TYPE_STATUS:
-            return f"skycooker_status_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.sensor_type == SENSOR_TYPE_TEMPERATURE:
-            return f"skycooker_temperature_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.sensor_type == SENSOR_TYPE_REMAINING_TIME:
-            return f"skycooker_remaining_time_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.sensor_type == SENSOR_TYPE_TOTAL_TIME:
-            return f"skycooker_total_time_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.sensor_type == SENSOR_TYPE_AUTO_WARM_TIME:
-            return f"skycooker_auto_warm_time_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.sensor_type == SENSOR_TYPE_SUCCESS_RATE:
-            return f"skycooker_success_rate_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.sensor_type == SENSOR_TYPE_DELAYED_LAUNCH_TIME:
-            return f"skycooker_delayed_launch_time_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.sensor_type == SENSOR_TYPE_CURRENT_MODE:
-            return f"skycooker_current_mode_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.sensor_type == SENSOR_TYPE_SUBPROGRAM:
-            return f"skycooker_subprogram_{sanitized_model_name}_{sanitized_entry_id}"
-        return f"skycooker_{self.sensor_type}_{sanitized_model_name}_{sanitized_entry_id}"
-
-    @property
-    def entity_id(self):
-        """Return the entity ID."""
-        model_name = self.entry.data.get(CONF_FRIENDLY_NAME, "")
-        sanitized_model_name = sanitize_model_name(model_name)
-        sanitized_entry_id = sanitize_entry_id(self.entry.entry_id)
-        if self.sensor_type == SENSOR_TYPE_STATUS:
-            return f"skycooker_status_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.sensor_type == SENSOR_TYPE_TEMPERATURE:
-            return f"skycooker_temperature_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.sensor_type == SENSOR_TYPE_REMAINING_TIME:
-            return f"skycooker_remaining_time_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.sensor_type == SENSOR_TYPE_TOTAL_TIME:
-            return f"skycooker_total_time_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.sensor_type == SENSOR_TYPE_AUTO_WARM_TIME:
-            return f"skycooker_auto_warm_time_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.sensor_type == SENSOR_TYPE_SUCCESS_RATE:
-            return f"skycooker_success_rate_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.sensor_type == SENSOR_TYPE_DELAYED_LAUNCH_TIME:
-            return f"skycooker_delayed_launch_time_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.sensor_type == SENSOR_TYPE_CURRENT_MODE:
-            return f"skycooker_current_mode_{sanitized_model_name}_{sanitized_entry_id}"
-        elif self.sensor_type == SENSOR_TYPE_SUBPROGRAM:
-            return f"skycooker_subprogram_{sanitized_model_name}_{sanitized_entry_id}"
-        return f"skycooker_{self.sensor_type}_{sanitized_model_name}_{sanitized_entry_id}"
-
     @property
     def device_info(self):
         """Return device info."""
         return self.hass.data[DOMAIN][DATA_DEVICE_INFO]()
 
     @property
-    def should_poll(self):
-        """No polling needed."""
-        return False
-
-    @property
-    def assumed_state(self):
-        """Return true if unable to access real state of the entity."""
-        return False
-
-    @property
-    def last_reset(self):
-        """Return last reset."""
-        return None
-
-    @property
-    def name(self):
-        """Return the name of the sensor."""
-        base_name = (SKYCOOKER_NAME + " " + self.entry.data.get(CONF_FRIENDLY_NAME, "")).strip()
-        if self.sensor_type == SENSOR_TYPE_STATUS:
-            return f"{base_name} status"
-        elif self.sensor_type == SENSOR_TYPE_TEMPERATURE:
-            return f"{base_name} temperature"
-        elif self.sensor_type == SENSOR_TYPE_REMAINING_TIME:
-            return f"{base_name} remaining time"
-        elif self.sensor_type == SENSOR_TYPE_TOTAL_TIME:
-            return f"{base_name} total time"
-        elif self.sensor_type == SENSOR_TYPE_AUTO_WARM_TIME:
-            return f"{base_name} auto warm time"
-        elif self.sensor_type == SENSOR_TYPE_SUCCESS_RATE:
-            return f"{base_name} success rate"
-        elif self.sensor_type == SENSOR_TYPE_DELAYED_LAUNCH_TIME:
-            return f"{base_name} delayed launch time"
-        elif self.sensor_type == SENSOR_TYPE_CURRENT_MODE:
-            return f"{base_name} current mode"
-        elif self.sensor_type == SENSOR_TYPE_SUBPROGRAM:
-            return f"{base_name} subprogram"
-          
-        return base_name
-
-    @property
-    def icon(self):
-        """Return the icon."""
-        if self.sensor_type == SENSOR_TYPE_STATUS:
-            return "mdi:information"
-        elif self.sensor_type == SENSOR_TYPE_TEMPERATURE:
-            return "mdi:thermometer"
-        elif self.sensor_type == SENSOR_TYPE_REMAINING_TIME:
-            return "mdi:timer"
-        elif self.sensor_type == SENSOR_TYPE_TOTAL_TIME:
-            return "mdi:clock"
-        elif self.sensor_type == SENSOR_TYPE_AUTO_WARM_TIME:
-            return "mdi:clock-start"
-        elif self.sensor_type == SENSOR_TYPE_SUCCESS_RATE:
-            return "mdi:bluetooth-connect"
-        elif self.sensor_type == SENSOR_TYPE_DELAYED_LAUNCH_TIME:
-            return "mdi:timer-sand"
-        elif self.sensor_type == SENSOR_TYPE_CURRENT_MODE:
-            return "mdi:chef-hat"
-        elif self.sensor_type == SENSOR_TYPE_SUBPROGRAM:
-            return "mdi:cog-outline"
+    def extra_state_attributes(self):
+        """Return the error of the last unconfirmed action."""
+        if self.sensor_type == SENSOR_TYPE_STATUS and self.skycooker.last_error:
+            return {"last_error": self.skycooker.last_error}
         return None
 
     @property
     def available(self):
         """Return if sensor is available."""
+        # Диагностика связи нужна как раз тогда, когда мультиварка недоступна
+        if self.sensor_type in LINK_SENSORS and self.sensor_type != SENSOR_TYPE_SUCCESS_RATE:
+            return True
+
         # Если skycooker недоступен, возвращаем False
         if not self.skycooker.available:
             return False
-           
-        # Для датчиков успеха, времени отложенного запуска и версии ПО всегда возвращаем True, если skycooker доступен
-        if self.sensor_type in [SENSOR_TYPE_SUCCESS_RATE, SENSOR_TYPE_DELAYED_LAUNCH_TIME]:
-            return True
-           
-        # Для датчика подпрограммы проверяем, есть ли данные о подпрограмме
-        if self.sensor_type == SENSOR_TYPE_SUBPROGRAM:
-            return self.skycooker.status and self.skycooker.status.subprog is not None
-           
-        # Для других датчиков проверяем, есть ли данные из статуса устройства
-        # Датчики должны использовать только данные из статуса устройства, а не из пользовательских настроек
-        if self.sensor_type == SENSOR_TYPE_STATUS:
-            return self.skycooker.status_code is not None
-        elif self.sensor_type == SENSOR_TYPE_TEMPERATURE:
-            return self.skycooker.target_temp is not None
-        elif self.sensor_type == SENSOR_TYPE_REMAINING_TIME:
-            return self.skycooker.remaining_time is not None
-        elif self.sensor_type == SENSOR_TYPE_TOTAL_TIME:
-            return self.skycooker.total_time is not None
-        elif self.sensor_type == SENSOR_TYPE_AUTO_WARM_TIME:
-            return self.skycooker.auto_warm_enabled is not None
-        elif self.sensor_type == SENSOR_TYPE_CURRENT_MODE:
-            # For current mode, we should return True if we have a status code
-            # even if current_mode is None, as we can show "Standby Mode" or "Режим ожидания"
-            return self.skycooker.status_code is not None
-           
-        return False
-
-    @property
-    def entity_category(self):
-        """Return entity category."""
-        if self.sensor_type == SENSOR_TYPE_SUCCESS_RATE:
-            return EntityCategory.DIAGNOSTIC
-        return None
 
-    @property
-    def device_class(self):
-        """Return device class."""
-        if self.sensor_type == SENSOR_TYPE_TEMPERATURE:
-            return SensorDeviceClass.TEMPERATURE
-        elif self.sensor_type in [SENSOR_TYPE_REMAINING_TIME, SENSOR_TYPE_TOTAL_TIME, 
-                                  SENSOR_TYPE_AUTO_WARM_TIME, SENSOR_TYPE_DELAYED_LAUNCH_TIME]:
-            return SensorDeviceClass.DURATION
-        return None
-
-    @property
-    def state_class(self):
-        """Return state class."""
-        if self.sensor_type == SENSOR_TYPE_TEMPERATURE:
-            return SensorStateClass.MEASUREMENT
-        elif self.sensor_type in [SENSOR_TYPE_REMAINING_TIME, SENSOR_TYPE_TOTAL_TIME, 
-                                  SENSOR_TYPE_AUTO_WARM_TIME, SENSOR_TYPE_DELAYED_LAUNCH_TIME]:
-            return SensorStateClass.MEASUREMENT
-        elif self.sensor_type == SENSOR_TYPE_SUCCESS_RATE:
-            return SensorStateClass.MEASUREMENT
-        return None
-
-    @property
-    def native_unit_of_measurement(self):
-        """Return unit of measurement."""
-        if self.sensor_type == SENSOR_TYPE_TEMPERATURE:
-            return UnitOfTemperature.CELSIUS
-        elif self.sensor_type in [SENSOR_TYPE_REMAINING_TIME, SENSOR_TYPE_TOTAL_TIME, 
-                                  SENSOR_TYPE_AUTO_WARM_TIME, SENSOR_TYPE_DELAYED_LAUNCH_TIME]:
-            return UnitOfTime.MINUTES
-        elif self.sensor_type == SENSOR_TYPE_SUCCESS_RATE:
-            return PERCENTAGE
-        return None
+        # Датчики должны использовать только данные из статуса устройства, а не из пользовательских настроек
+        return self._description.available(self)
 
     @property
     def native_value(self):
         """Return the state of the sensor."""
-        if self.sensor_type == SENSOR_TYPE_STATUS:
-            # Получаем статус из self._status.status
-            status = self.skycooker.status
-            if status and hasattr(status, 'status'):
-                status_code = status.status
-                # Определяем индекс языка (0 для английского, 1 для русского)
-                language = self.hass.config.language
-                lang_index = 0 if language == "en" else 1
-                return STATUS_CODES[lang_index].get(status_code, f"Unknown ({status_code})" if lang_index == 0 else f"Неизвестно ({status_code})")
-            return "Unknown" if self.hass.config.language == "en" else "Неизвестно"
-        elif self.sensor_type == SENSOR_TYPE_TEMPERATURE:
-            status_code = self.skycooker.status_code
-            if status_code == STATUS_OFF:
-                return 0
-            return self.skycooker.target_temp if self.skycooker.target_temp is not None else 0
-        elif self.sensor_type == SENSOR_TYPE_REMAINING_TIME:
-            return self.skycooker.remaining_time if self.skycooker.remaining_time is not None else 0
-        elif self.sensor_type == SENSOR_TYPE_TOTAL_TIME:
-            return self.skycooker.total_time if self.skycooker.total_time is not None else 0
-        elif self.sensor_type == SENSOR_TYPE_AUTO_WARM_TIME:
-            status_code = self.skycooker.status_code
-            if status_code is not None:
-                return self.skycooker.remaining_time if status_code == STATUS_AUTO_WARM else 0
-            return 0
-        elif self.sensor_type == SENSOR_TYPE_SUCCESS_RATE:
-            return self.skycooker.success_rate if self.skycooker.success_rate is not None else 0
-        elif self.sensor_type == SENSOR_TYPE_DELAYED_LAUNCH_TIME:
-            # Возвращаем время отложенного запуска, если оно установлено, независимо от текущего статуса
-            if self.skycooker.status_code is not None:
-                # Проверяем, есть ли установленное время отложенного запуска
-                delayed_time = self.skycooker.delayed_start_time
-                # Если delayed_time не является callable (mock-объект) и не равен None, возвращаем его
-                if delayed_time is not None and not callable(delayed_time):
-                    return delayed_time
-            return 0
-        elif self.sensor_type == SENSOR_TYPE_CURRENT_MODE:
-            status_code = self.skycooker.status_code
-            if status_code == STATUS_OFF:
-                return "Режим ожидания" if self.hass.config.language == "ru" else "Standby Mode"
-            current_mode = self.skycooker.current_mode
-            if current_mode is not None:
-                # Получаем тип модели из соединения
-                model_type = self.skycooker.model_code
-                if model_type is None:
-                    return f"Unknown ({current_mode})"
-                
-                # Получаем названия режимов для текущей модели
-                mode_constants = MODE_NAMES.get(model_type, [])
-                if not mode_constants or current_mode >= len(mode_constants):
-                    return f"Unknown ({current_mode})"
-                
-                # Определяем индекс языка (0 для английского, 1 для русского)
-                language = self.hass.config.language
-                lang_index = 0 if language == "en" else 1
-                
-                # Получаем название режима из константы
-                mode_constant = mode_constants[current_mode]
-                if mode_constant and len(mode_constant) > lang_index:
-                    # Проверяем, является ли режим MODE_NONE
-                    if mode_constant == MODE_NONE:
-                        return f"Unknown ({current_mode})"
-                    return mode_constant[lang_index]
-                return f"Unknown ({current_mode})"
-            return "Режим ожидания" if self.hass.config.language == "ru" else "Standby Mode"
-        elif self.sensor_type == SENSOR_TYPE_SUBPROGRAM:
-            # Возвращаем текущую подпрограмму из статуса устройства
-            if self.skycooker.status and self.skycooker.status.subprog is not None:
-                return str(self.skycooker.status.subprog)
-            return "0"
-          
-        return None
\ No newline at end of file
+        return self._description.value(self)
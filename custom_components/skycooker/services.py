@@ -0,0 +1,217 @@
+"""SkyCooker services."""
+import asyncio
+import logging
+from time import monotonic, time
+
+import voluptuous as vol
+
+import homeassistant.helpers.config_validation as cv
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import *
+from .models import get_capabilities
+
+_LOGGER = logging.getLogger(__name__)
+
+PROGRAM_FIELDS = {
+    vol.Optional(ATTR_SUBPROGRAM, default=0): vol.All(vol.Coerce(int), vol.Range(min=0, max=15)),
+    vol.Optional(ATTR_TEMPERATURE): vol.All(vol.Coerce(int), vol.Range(min=PROGRAM_MIN_TEMP, max=PROGRAM_MAX_TEMP)),
+    vol.Optional(ATTR_DURATION): cv.time_period,
+    vol.Optional(ATTR_DELAY): cv.time_period,
+    vol.Optional(ATTR_AUTO_WARM): cv.boolean,
+}
+
+RUN_PROGRAM_SCHEMA = vol.Schema({
+    vol.Required(ATTR_ENTRY_ID): cv.string,
+    vol.Required(ATTR_MODE): vol.Any(vol.Coerce(int), cv.string),
+    **PROGRAM_FIELDS,
+})
+
+BULK_COMMAND_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_ENTRY_IDS): vol.All(cv.ensure_list, [cv.string]),
+    vol.Required(ATTR_COMMAND): vol.In(BULK_COMMANDS),
+    vol.Optional(ATTR_MODE): vol.Any(vol.Coerce(int), cv.string),
+    **PROGRAM_FIELDS,
+})
+
+CAPTURE_SCHEMA = vol.Schema({
+    vol.Required(ATTR_ENTRY_ID): cv.string,
+    vol.Required(ATTR_ACTION): vol.In(CAPTURE_ACTIONS),
+    vol.Optional(ATTR_SIZE, default=CAPTURE_SIZE): vol.All(vol.Coerce(int), vol.Range(min=1, max=CAPTURE_MAX_SIZE)),
+})
+
+REFRESH_SCHEMA = vol.Schema({
+    vol.Optional(ATTR_ENTRY_IDS): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_MAX_AGE, default=0): vol.All(vol.Coerce(float), vol.Range(min=0)),
+})
+
+
+def get_connection(hass, entry_id):
+    """Return the connection of a loaded config entry."""
+    skycooker = hass.data.get(DOMAIN, {}).get(entry_id, {}).get(DATA_CONNECTION)
+    if skycooker is None:
+        raise ServiceValidationError(f"Мультиварка {entry_id} не найдена или не загружена")
+    return skycooker
+
+
+def resolve_mode(skycooker, mode):
+    """Return the mode index for an index or a mode name in any language."""
+    if isinstance(mode, int):
+        return mode
+    name = mode.strip().lower()
+    capabilities = get_capabilities(skycooker.model_code)
+    for idx, mode_constant in enumerate(capabilities.names if capabilities else ()):
+        if idx not in capabilities.none_modes and name in (n.lower() for n in mode_constant):
+            return idx
+    raise ServiceValidationError(f"Неизвестный режим \"{mode}\" для модели {skycooker.model}")
+
+
+def split_time(period):
+    """Split a time period into (hours, minutes)."""
+    if period is None:
+        return None, None
+    return divmod(int(period.total_seconds()) // 60, 60)
+
+
+async def run_program(skycooker, data):
+    """Run a program described by service call data on one cooker."""
+    mode = resolve_mode(skycooker, data[ATTR_MODE])
+    boil_hours, boil_minutes = split_time(data.get(ATTR_DURATION))
+    delayed_start_hours, delayed_start_minutes = split_time(data.get(ATTR_DELAY))
+    await skycooker.run_program(
+        mode,
+        subprog=data.get(ATTR_SUBPROGRAM, 0),
+        temp=data.get(ATTR_TEMPERATURE),
+        boil_hours=boil_hours,
+        boil_minutes=boil_minutes,
+        delayed_start_hours=delayed_start_hours or 0,
+        delayed_start_minutes=delayed_start_minutes or 0,
+        auto_warm=data.get(ATTR_AUTO_WARM),
+    )
+
+
+def get_connections(hass, entry_ids=None):
+    """Return {entry_id: connection or None} for the given or all loaded entries."""
+    domain_data = hass.data.get(DOMAIN, {})
+    if entry_ids is None:
+        entry_ids = [k for k, v in domain_data.items() if isinstance(v, dict) and v.get(DATA_CONNECTION)]
+    return {entry_id: domain_data.get(entry_id, {}).get(DATA_CONNECTION) for entry_id in entry_ids}
+
+
+def readiness(skycooker):
+    """Sort key: connected cookers first, then the ones whose last connection succeeded."""
+    return (not skycooker.connected, not skycooker.available)
+
+
+async def bulk_command(connections, command, data):
+    """Run a command on several cookers with bounded concurrency per adapter.
+
+    Returns per-device results with the time spent waiting for an adapter
+    slot and the time of the command itself.
+    """
+    started = monotonic()
+    results = {}
+    semaphores = {}
+    tasks = []
+
+    async def run_one(entry_id, skycooker, semaphore):
+        queued = monotonic()
+        async with semaphore:
+            begin = monotonic()
+            try:
+                if command == BULK_COMMAND_START:
+                    await skycooker.start()
+                elif command == BULK_COMMAND_STOP:
+                    await skycooker.stop_cooking()
+                else:
+                    await run_program(skycooker, data)
+                result = {"success": True}
+            except Exception as ex:
+                result = {"success": False, "error": str(ex)}
+            result["queued"] = round(begin - queued, 3)
+            result["duration"] = round(monotonic() - begin, 3)
+            results[entry_id] = result
+
+    for entry_id, skycooker in connections.items():
+        if skycooker is None:
+            results[entry_id] = {"success": False, "error": "Мультиварка не найдена или не загружена"}
+    ready = sorted(((k, v) for k, v in connections.items() if v is not None), key=lambda item: readiness(item[1]))
+    for entry_id, skycooker in ready:
+        semaphore = semaphores.setdefault(skycooker.adapter, asyncio.Semaphore(BULK_ADAPTER_CONCURRENCY))
+        tasks.append(run_one(entry_id, skycooker, semaphore))
+    await asyncio.gather(*tasks)
+    return {"results": results, "elapsed": round(monotonic() - started, 3)}
+
+
+def async_setup_services(hass: HomeAssistant):
+    """Register SkyCooker services."""
+
+    async def async_run_program(call: ServiceCall):
+        skycooker = get_connection(hass, call.data[ATTR_ENTRY_ID])
+        try:
+            await run_program(skycooker, call.data)
+        except HomeAssistantError:
+            raise
+        except ValueError as ex:
+            raise ServiceValidationError(str(ex)) from ex
+        except Exception as ex:
+            raise HomeAssistantError(f"Ошибка при запуске программы: {ex}") from ex
+        finally:
+            async_dispatcher_send(hass, DISPATCHER_UPDATE)
+
+    async def async_bulk_command(call: ServiceCall):
+        command = call.data[ATTR_COMMAND]
+        if command == BULK_COMMAND_PROGRAM and ATTR_MODE not in call.data:
+            raise ServiceValidationError("Для команды program нужно указать режим")
+        connections = get_connections(hass, call.data.get(ATTR_ENTRY_IDS))
+        try:
+            response = await bulk_command(connections, command, call.data)
+        finally:
+            async_dispatcher_send(hass, DISPATCHER_UPDATE)
+        _LOGGER.debug("📦 Массовая команда %s: %s", command, response)
+        return response
+
+    async def async_refresh(call: ServiceCall):
+        connections = get_connections(hass, call.data.get(ATTR_ENTRY_IDS))
+        max_age = call.data.get(ATTR_MAX_AGE, 0)
+
+        async def refresh_one(skycooker):
+            if skycooker is None:
+                return {"success": False, "error": "Мультиварка не найдена или не загружена"}
+            try:
+                status = await skycooker.get_status_cached(max_age)
+            except Exception as ex:
+                return {"success": False, "error": str(ex)}
+            return {"success": True, "status": status._asdict() if status else None}
+
+        try:
+            results = await asyncio.gather(*(refresh_one(c) for c in connections.values()))
+        finally:
+            async_dispatcher_send(hass, DISPATCHER_UPDATE)
+        return {"results": dict(zip(connections, results))}
+
+    async def async_capture(call: ServiceCall):
+        entry_id = call.data[ATTR_ENTRY_ID]
+        skycooker = get_connection(hass, entry_id)
+        if call.data[ATTR_ACTION] == CAPTURE_START:
+            skycooker.enable_capture(call.data.get(ATTR_SIZE, CAPTURE_SIZE))
+            _LOGGER.info("⏺️  Запись кадров %s включена", entry_id)
+            return {"capturing": True}
+        capture = skycooker.disable_capture()
+        if capture is None:
+            raise ServiceValidationError(f"Запись кадров {entry_id} не включена")
+        # Файл пишется в каталог конфигурации, ключ AUTH в нем уже скрыт
+        path = hass.config.path(f"{DOMAIN}_capture_{entry_id}_{int(time())}.jsonl")
+        await hass.async_add_executor_job(capture.dump_jsonl, path)
+        _LOGGER.info("💾 Записано кадров: %d, файл %s", len(capture), path)
+        return {"capturing": False, "path": path, "frames": len(capture)}
+
+    hass.services.async_register(DOMAIN, SERVICE_RUN_PROGRAM, async_run_program, schema=RUN_PROGRAM_SCHEMA)
+    hass.services.async_register(DOMAIN, SERVICE_BULK_COMMAND, async_bulk_command, schema=BULK_COMMAND_SCHEMA,
+                                 supports_response=SupportsResponse.OPTIONAL)
+    hass.services.async_register(DOMAIN, SERVICE_REFRESH, async_refresh, schema=REFRESH_SCHEMA,
+                                 supports_response=SupportsResponse.OPTIONAL)
+    hass.services.async_register(DOMAIN, SERVICE_CAPTURE, async_capture, schema=CAPTURE_SCHEMA,
+                                 supports_response=SupportsResponse.OPTIONAL)
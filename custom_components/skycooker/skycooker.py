@@ -1,32 +1,123 @@
 #!/usr/local/bin/python3
 # coding: utf-8
 
-import calendar
 import logging
 import time
 from abc import ABC, abstractmethod
-from collections import namedtuple
 from datetime import datetime
 from struct import pack, unpack
 
 from .const import *
+from .models import DEFAULT_MAIN_MODE_FRAME, DEFAULT_SELECT_MODE_FRAME, get_capabilities
 
 _LOGGER = logging.getLogger(__name__)
 
 
-class SkyCooker(ABC):
-    Status = namedtuple("Status", ["mode", "subprog", "target_temp",
+class Status:
+    """Decoded GET_STATUS payload.
+
+    Immutable and slotted, built once per frame. Keeps the raw payload,
+    computes derived times once and caches localized labels on first use.
+    Equality and hash use a precomputed key, so unchanged statuses compare
+    cheaply.
+    """
+    _fields = ("mode", "subprog", "target_temp",
         "auto_warm", "is_on", "sound_enabled", "parental_control",
         "error_code", "target_boil_hours", "target_boil_minutes",
-        "target_delayed_start_hours", "target_delayed_start_minutes", "status"])
+        "target_delayed_start_hours", "target_delayed_start_minutes", "status")
+    __slots__ = _fields + ("raw", "boil_time", "delayed_start_time", "remaining_time",
+        "status_code", "current_mode", "_key", "_hash", "_labels")
+
+    def __init__(self, mode, subprog, target_temp, auto_warm, is_on, sound_enabled, parental_control,
+                 error_code, target_boil_hours, target_boil_minutes, target_delayed_start_hours,
+                 target_delayed_start_minutes, status, raw=None):
+        key = (mode, subprog, target_temp, auto_warm, is_on, sound_enabled, parental_control,
+               error_code, target_boil_hours, target_boil_minutes, target_delayed_start_hours,
+               target_delayed_start_minutes, status)
+        init = object.__setattr__
+        for name, value in zip(self._fields, key):
+            init(self, name, value)
+        boil_time = target_boil_hours * 60 + target_boil_minutes
+        delayed_start_time = target_delayed_start_hours * 60 + target_delayed_start_minutes
+        if status == STATUS_OFF:
+            remaining_time = 0
+        elif status == STATUS_DELAYED_LAUNCH:
+            remaining_time = delayed_start_time + boil_time
+        else:
+            remaining_time = boil_time
+        init(self, "raw", bytes(raw) if raw is not None else None)
+        init(self, "boil_time", boil_time)
+        init(self, "delayed_start_time", delayed_start_time)
+        init(self, "remaining_time", remaining_time)
+        init(self, "status_code", mode if is_on else STATUS_OFF)
+        init(self, "current_mode", mode if is_on else None)
+        init(self, "_key", key)
+        init(self, "_hash", hash(key))
+        init(self, "_labels", {})
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Status is immutable")
+
+    __delattr__ = __setattr__
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, Status):
+            return NotImplemented
+        return self._hash == other._hash and self._key == other._key
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return "Status(" + ", ".join(f"{name}={value!r}" for name, value in zip(self._fields, self._key)) + ")"
+
+    def __reduce__(self):
+        return (Status, self._key + (self.raw,))
+
+    def _asdict(self):
+        return dict(zip(self._fields, self._key))
+
+    def _replace(self, **changes):
+        return Status(**{**self._asdict(), **changes})
+
+    def status_label(self, lang_index):
+        """Return the localized status name."""
+        key = ("status", lang_index)
+        if key not in self._labels:
+            self._labels[key] = STATUS_CODES[lang_index].get(
+                self.status, f"Unknown ({self.status})" if lang_index == 0 else f"Неизвестно ({self.status})")
+        return self._labels[key]
+
+    def mode_label(self, model_code, lang_index):
+        """Return the localized mode name, None if the model does not know the mode."""
+        key = (model_code, lang_index)
+        if key not in self._labels:
+            from .tables import MODE_NAMES, MODE_NONE
+            names = MODE_NAMES.get(model_code, [])
+            label = None
+            if self.mode < len(names) and names[self.mode] != MODE_NONE and len(names[self.mode]) > lang_index:
+                label = names[self.mode][lang_index]
+            self._labels[key] = label
+        return self._labels[key]
+
+
+class SkyCooker(ABC):
+    Status = Status
 
     def __init__(self, model):
-        _LOGGER.info(f"SkyCooker model: {model}")
+        _LOGGER.debug("SkyCooker model: %s", model)
         self.model = model
         self.model_code = self.get_model_code(model)
         if not self.model_code:
             raise SkyCookerError("Unknown SkyCooker model")
 
+    @property
+    def capabilities(self):
+        """Return the compiled capabilities of the model, None if it is unknown."""
+        return get_capabilities(self.model_code)
+
     @staticmethod
     def get_model_code(model):
         if model in MODELS:
@@ -42,134 +133,107 @@ class SkyCooker(ABC):
     async def auth(self, key):
         r = await self.command(COMMAND_AUTH, key)
         ok = r[0] != 0
-        _LOGGER.debug(f"Auth: ok={ok}")
+        _LOGGER.debug("Auth: ok=%s", ok)
         return ok
 
     async def get_version(self):
         r = await self.command(COMMAND_GET_VERSION)
         major, minor = unpack("BB", r)
         ver = f"{major}.{minor}"
-        _LOGGER.debug(f"Version: {ver}")
+        _LOGGER.debug("Version: %s", ver)
         return ver
 
     async def turn_on(self):
         r = await self.command(COMMAND_TURN_ON)
         if r[0] != 1: raise SkyCookerError("can't turn on")
-        _LOGGER.debug(f"Turned on")
+        _LOGGER.debug("Turned on")
 
     async def turn_off(self):
         r = await self.command(COMMAND_TURN_OFF)
         if r[0] != 1: raise SkyCookerError("can't turn off")
-        _LOGGER.debug(f"Turned off")
+        _LOGGER.debug("Turned off")
 
     async def select_mode(self, mode, subprog=0):
-        # Для MODEL_3 отправляем только mode (1 байт), для остальных - mode и subprog (2 байта)
-        if self.model_code == MODEL_3:
-            data = pack("B", int(mode))
-            _LOGGER.debug(f"📤 Отправка команды SELECT_MODE (0x09) для MODEL_3 с данными: {data.hex().upper()}")
-            _LOGGER.debug(f"   Параметры: mode={mode}")
-        else:
-            data = pack("BB", int(mode), int(subprog))
-            _LOGGER.debug(f"📤 Отправка команды SELECT_MODE (0x09) с данными: {data.hex().upper()}")
-            _LOGGER.debug(f"   Параметры: mode={mode}, subprog={subprog}")
+        # Модели без подпрограмм получают только mode (1 байт), остальные - mode и subprog (2 байта)
+        capabilities = self.capabilities
+        frame = capabilities.select_mode_frame if capabilities else DEFAULT_SELECT_MODE_FRAME
+        data = frame.pack(mode=mode, subprog=subprog)
+        _LOGGER.debug("📤 SELECT_MODE (0x09): mode=%s, subprog=%s", mode, subprog)
 
         try:
-            r = await self.command(COMMAND_SELECT_MODE, list(data))
-            _LOGGER.debug(f"📥 Получен ответ на SELECT_MODE: {r.hex().upper() if r else 'None'}")
-            if r and len(r) > 0:
-                _LOGGER.debug(f"   Первый байт ответа: {r[0]} (ожидалось 1 для успеха)")
+            r = await self.command(COMMAND_SELECT_MODE, data)
             # Accept both success code (0x01) and status updates as success
             if r and r[0] != 1 and len(r) != 1:
-                _LOGGER.error(f"❌ Ошибка выбора режима: устройство вернуло код ошибки {r[0]}")
+                _LOGGER.error("❌ Ошибка выбора режима: устройство вернуло код ошибки %s", r[0])
                 raise SkyCookerError(f"Ошибка выбора режима: код {r[0]}")
-            _LOGGER.debug(f"✅ Режим успешно выбран: mode={mode}")
         except Exception as e:
-            _LOGGER.error(f"❌ Исключение при выборе режима: {e}")
+            _LOGGER.error("❌ Исключение при выборе режима: %s", e)
             raise SkyCookerError(f"Исключение при выборе режима: {e}")
 
     async def set_main_mode(self, mode, subprog=0, target_temp=0, target_boil_hours=0, target_boil_minutes=0, target_delayed_start_hours=0, target_delayed_start_minutes=0, auto_warm=0, bit_flags=0):
-        # В текущей реализации битовые флаги берутся из MODE_DATA
-        # Для MODEL_3 битовые флаги не добавляются
-        # В будущем, когда будет понятно, как использовать битовые флаги, этот код будет обновлен
+        # В текущей реализации битовые флаги по умолчанию берутся из MODE_DATA
+        # Модели без битовых флагов (MODEL_3) получают кадр без последнего байта
         # Параметр auto_warm используется для передачи флага автоподогрева
-        if self.model_code == MODEL_3:
-            # Для MODEL_3 используем auto_warm как флаг автоподогрева
-            data = pack("BBBBBBBB", int(mode), int(subprog), int(target_temp), int(target_boil_hours), int(target_boil_minutes), int(target_delayed_start_hours), int(target_delayed_start_minutes), int(auto_warm))
-        else:
-            mode_data = MODE_DATA.get(self.model_code, [])
-            if mode < len(mode_data) and bit_flags == 0:
-                bit_flags = mode_data[mode][3]
-            data = pack("BBBBBBBBB", int(mode), int(subprog), int(target_temp), int(target_boil_hours), int(target_boil_minutes), int(target_delayed_start_hours), int(target_delayed_start_minutes), int(auto_warm), int(bit_flags))
+        capabilities = self.capabilities
+        frame = capabilities.main_mode_frame if capabilities else DEFAULT_MAIN_MODE_FRAME
+        if capabilities and capabilities.bit_flags and mode < len(capabilities.bit_flags) and bit_flags == 0:
+            bit_flags = capabilities.bit_flags[mode]
+        data = frame.pack(mode=mode, subprog=subprog, target_temp=target_temp,
+                          target_boil_hours=target_boil_hours, target_boil_minutes=target_boil_minutes,
+                          target_delayed_start_hours=target_delayed_start_hours,
+                          target_delayed_start_minutes=target_delayed_start_minutes,
+                          auto_warm=auto_warm, bit_flags=bit_flags)
 
-        _LOGGER.debug(f"📤 Отправка команды SET_MAIN_MODE (0x05) с данными: {data.hex().upper()}")
-        _LOGGER.debug(f"   Параметры: mode={mode}, subprog={subprog}, target_temp={target_temp}, target_boil_hours={target_boil_hours}, target_boil_minutes={target_boil_minutes}, target_delayed_start_hours={target_delayed_start_hours}, target_delayed_start_minutes={target_delayed_start_minutes}, auto_warm={auto_warm}, bit_flags={bit_flags}")
+        _LOGGER.debug("📤 SET_MAIN_MODE (0x05): mode=%s, subprog=%s, target_temp=%s, boil=%s:%s, delayed_start=%s:%s, auto_warm=%s, bit_flags=%s",
+                      mode, subprog, target_temp, target_boil_hours, target_boil_minutes,
+                      target_delayed_start_hours, target_delayed_start_minutes, auto_warm, bit_flags)
 
         try:
-            r = await self.command(COMMAND_SET_MAIN_MODE, list(data))
-            _LOGGER.debug(f"📥 Получен ответ на SET_MAIN_MODE: {r.hex().upper() if r else 'None'}")
-            if r and len(r) > 0:
-                _LOGGER.debug(f"   Первый байт ответа: {r[0]} (ожидалось 1 для успеха)")
+            r = await self.command(COMMAND_SET_MAIN_MODE, data)
             # Accept both success code (0x01) and status updates as success
             if r and r[0] != 1 and len(r) != 1:
-                _LOGGER.error(f"❌ Ошибка установки режима: устройство вернуло код ошибки {r[0]}")
+                _LOGGER.error("❌ Ошибка установки режима: устройство вернуло код ошибки %s", r[0])
                 raise SkyCookerError(f"Ошибка установки режима: код {r[0]}")
-            _LOGGER.debug(f"✅ Режим успешно установлен: mode={mode}")
         except Exception as e:
-            _LOGGER.error(f"❌ Исключение при установке режима: {e}")
+            _LOGGER.error("❌ Исключение при установке режима: %s", e)
             raise SkyCookerError(f"Исключение при установке режима: {e}")
 
     async def get_status(self):
         r = await self.command(COMMAND_GET_STATUS)
-        _LOGGER.debug(f"Raw status data: {r.hex().upper()}, length: {len(r)}")
         if len(r) < 16:
-            _LOGGER.error(f"❌ Ошибка: получено {len(r)} байт вместо ожидаемых 16")
+            _LOGGER.error("❌ Ошибка: получено %d байт вместо ожидаемых 16", len(r))
             raise SkyCookerError(f"Некорректный размер данных статуса: {len(r)} байт")
-        try:
-            # Parse the 16-byte status response according to the new format
-            # Format: mode(1), subprog(1), target_temp(1), target_boil_hours(1), target_boil_minutes(1),
-            #         target_delayed_start_hours(1), target_delayed_start_minutes(1), auto_warm(1), status(1), ...
-            mode = r[0]
-            subprog = r[1]
-            target_temp = r[2]
-            target_boil_hours = r[3]
-            target_boil_minutes = r[4]
-            target_delayed_start_hours = r[5]
-            target_delayed_start_minutes = r[6]
-            auto_warm = r[7]
-            status = r[8]
-            is_on = r[8] != 0
-            sound_enabled = r[9] != 0
-            
-            status = SkyCooker.Status(
-                mode=mode,
-                subprog=subprog,
-                target_temp=target_temp,
-                auto_warm=auto_warm,
-                is_on=is_on,
-                sound_enabled=sound_enabled,
-                parental_control=False,
-                error_code=0,
-                target_boil_hours=target_boil_hours,
-                target_boil_minutes=target_boil_minutes,
-                target_delayed_start_hours=target_delayed_start_hours,
-                target_delayed_start_minutes=target_delayed_start_minutes,
-                status=status,
-            )
-        except Exception as e:
-            _LOGGER.error(f"❌ Ошибка распаковки статуса: {e}")
-            raise SkyCookerError(f"Ошибка распаковки статуса: {e}")
-         
-        _LOGGER.debug(f"Status: mode={status.mode}, subprog={status.subprog}, is_on={status.is_on}, "+
-                     f"target_temp={status.target_temp}, "+
-                     f"auto_warm={status.auto_warm}, sound_enabled={status.sound_enabled}, "+
-                     f"target_boil_hours={status.target_boil_hours}, target_boil_minutes={status.target_boil_minutes}, "+
-                     f"target_delayed_start_hours={status.target_delayed_start_hours}, target_delayed_start_minutes={status.target_delayed_start_minutes}")
+        status = self.parse_status(r)
+        _LOGGER.debug("Status: %s", status)
         return status
 
+    @staticmethod
+    def parse_status(r):
+        """Decode a 16-byte GET_STATUS payload."""
+        # Parse the 16-byte status response according to the new format
+        # Format: mode(1), subprog(1), target_temp(1), target_boil_hours(1), target_boil_minutes(1),
+        #         target_delayed_start_hours(1), target_delayed_start_minutes(1), auto_warm(1), status(1), ...
+        return SkyCooker.Status(
+            mode=r[0],
+            subprog=r[1],
+            target_temp=r[2],
+            auto_warm=r[7],
+            is_on=r[8] != 0,
+            sound_enabled=r[9] != 0,
+            parental_control=False,
+            error_code=0,
+            target_boil_hours=r[3],
+            target_boil_minutes=r[4],
+            target_delayed_start_hours=r[5],
+            target_delayed_start_minutes=r[6],
+            status=r[8],
+            raw=r[:16],
+        )
+
     async def sync_time(self):
         try:
             t = time.localtime()
-            offset = calendar.timegm(t) - calendar.timegm(time.gmtime(time.mktime(t)))
+            offset = t.tm_gmtoff
             now = int(time.time())
             data = pack("<ii", now, offset)
             _LOGGER.debug(f"🕒 Синхронизация времени: time={now}, offset={offset}")
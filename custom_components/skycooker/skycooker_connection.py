@@ -3,13 +3,18 @@
 
 import asyncio
 import logging
-import traceback
-from time import monotonic
+from collections import OrderedDict, deque
 
 from bleak_retry_connector import establish_connection, BleakClientWithServiceCache
 
 from homeassistant.components import bluetooth
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 
+from .capture import FrameCapture
+from .clock import SYSTEM_CLOCK
+from .codec import decode_frame, encode_frame, redact_frame
+from .link_stats import LinkStats
+from .models import nearest_mode, supports_subprograms
 from .const import *
 from .skycooker import SkyCooker, SkyCookerError
 
@@ -18,37 +23,76 @@ _LOGGER = logging.getLogger(__name__)
 
 class SkyCookerConnection(SkyCooker):
 
-    def __init__(self, mac, key, persistent=True, adapter=None, hass=None, model=None):
+    def __init__(self, mac, key, persistent=True, adapter=None, hass=None, model=None, live_apply=False, clock=None):
         super().__init__(model)
+        # Источник времени: монотонные часы и паузы, в тестах - виртуальное время
+        self.clock = clock or SYSTEM_CLOCK
         self._device = None
         self._client = None
         self._mac = mac
         self._key = key
         self.persistent = persistent
+        self.live_apply = live_apply
         self.adapter = adapter
         self.hass = hass
         self._auth_ok = False
         self._sw_version = '1.8'
         self._iter = 0
         self._update_lock = asyncio.Lock()
+        # Отложенное применение настроек к уже запущенной программе
+        self._apply_handle = None
+        self._apply_task = None
         self._last_set_target = 0
         self._last_get_stats = 0
         self._last_connect_ok = False
         self._last_auth_ok = False
-        self._successes = []
+        self.link_stats = LinkStats(clock=self.clock)
         self._target_mode = None
         self._auto_warm_enabled = False
+        # Автоподогрев переключен пользователем после запуска программы
+        self._auto_warm_changed = False
         self._target_temperature = None
         self._target_boil_hours = None
         self._target_boil_minutes = None
         self._target_delayed_start_hours = None
         self._target_delayed_start_minutes = None
         self._status = None
+        # Оптимистичное состояние: ожидаемые поля статуса до подтверждения реальным кадром
+        self._real_status = None
+        self._status_time = 0
+        # От какого момента локально отсчитываются таймеры статуса
+        self._countdown_time = 0
+        # Программа, отправленная этим подключением: (режим, подпрограмма, запрошенные параметры)
+        self._program = None
+        # Общее для всех ожидающих чтение статуса
+        self._refresh_task = None
+        self._expected = None
+        self._expected_check = None
+        self._expected_deadline = 0
+        self.last_error = None
         self._stats = None
         self._disposed = False
         self._last_data = None
-
-    async def command(self, command, params=None):
+        # Маршрутизация ответов: идентификатор запроса -> команда и время его отправки
+        self._pending = OrderedDict()
+        self._sent_at = {}
+        self._late_answer = None
+        self._late_replies = 0
+        # Последний статус, присланный устройством вместо подтверждения команды
+        self._pushed_status = None
+        self._response_rules = {**DEFAULT_RESPONSE_RULES, **RESPONSE_RULES.get(self.model_code, {})}
+        # Диагностика
+        # Кольцевой буфер трассировки кадров вместо подробного логирования каждого пакета
+        self._trace = deque(maxlen=DIAG_FRAMES_HISTORY)
+        # Необязательный захват всех кадров для последующего воспроизведения
+        self.capture = None
+        self._polls = deque(maxlen=DIAG_POLL_HISTORY)
+        self._latency = {}
+        self._timeouts = {}
+        self._retries = 0
+        self._connect_timings = {}
+
+    async def command(self, command, params=None, timeout=BLE_RECV_TIMEOUT):
         if params is None:
             params = []
         if self._disposed:
@@ -56,80 +100,130 @@ class SkyCookerConnection(SkyCooker):
         if not self._client or not self._client.is_connected:
             raise IOError("🔌 Не подключено")
         self._iter = (self._iter + 1) % 256
-        _LOGGER.debug(f"📤 Отправка команды {command:02x}, данные: [{' '.join([f'{c:02x}' for c in params])}]")
-        data = bytes([0x55, self._iter, command] + list(params) + [0xAA])
+        data = encode_frame(self._iter, command, params)
         self._last_data = None
+        self._late_answer = None
+        # Запоминаем запрос в скользящем окне, чтобы распознать поздний ответ на него
+        self._pending.pop(self._iter, None)
+        self._pending[self._iter] = command
+        self._sent_at[self._iter] = self.clock.monotonic()
+        while len(self._pending) > RESPONSE_WINDOW:
+            self._sent_at.pop(self._pending.popitem(last=False)[0], None)
+        started = self.clock.monotonic()
         try:
             await self._client.write_gatt_char(UUID_TX, data)
-            _LOGGER.debug(f"📋 Отправленный пакет: {data.hex().upper()}")
+            self._trace.append((started, "tx", redact_frame(data)))
+            if self.capture is not None: self.capture.record("tx", data)
         except Exception as e:
-            _LOGGER.error(f"🚫 Ошибка отправки команды: {e}")
+            _LOGGER.error("🚫 Ошибка отправки команды: %s", e)
             raise IOError(f"Ошибка отправки команды: {e}")
-        timeout_time = monotonic() + BLE_RECV_TIMEOUT
+        timeout_time = self.clock.monotonic() + timeout
         while True:
-            await asyncio.sleep(0.05)
+            await self.clock.sleep(0.05)
             if self._last_data:
                 r = self._last_data
-                _LOGGER.debug(f"📥 Получен сырой ответ: {r.hex().upper()}")
-                if len(r) < 4 or r[0] != 0x55 or r[-1] != 0xAA:
-                    _LOGGER.error(f"❌ Некорректный формат ответа: {r.hex().upper()}")
+                try:
+                    seq, reply, payload = decode_frame(r)
+                except ValueError as e:
+                    _LOGGER.error("❌ %s", e)
                     raise IOError("Некорректный формат ответа")
-                if r[1] == self._iter:
-                    _LOGGER.debug(f"✅ Правильный идентификатор запроса {self._iter} в ответе")
+                if seq == self._iter:
                     break
-                else:
-                    _LOGGER.warning(f"⚠️  Неправильный идентификатор запроса в ответе: ожидалось {self._iter}, получено {r[1]}")
-                    _LOGGER.warning(f"💡 Это может быть ответ на предыдущий запрос или от другого устройства")
-                    self._last_data = None
-            if monotonic() >= timeout_time:
-                _LOGGER.error(f"⏱️  Таймаут приема ответа на команду {command:02x}")
+                self._last_data = None
+                self._late_reply(seq, reply, payload)
+            if self._late_answer is not None:
+                # Поздний ответ на такой же предыдущий запрос отвечает и на текущий
+                seq, reply, payload = self._iter, command, self._late_answer
+                break
+            if self.clock.monotonic() >= timeout_time:
+                self._timeouts[command] = self._timeouts.get(command, 0) + 1
+                self.link_stats.add_timeout()
+                _LOGGER.error("⏱️  Таймаут приема ответа на команду %02x", command)
                 raise IOError("Таймаут приема")
-        # Check if the response command matches the expected command
-        # For some commands like SELECT_MODE, the device may send asynchronous status updates
-        # In such cases, we should check if the device actually processed the command correctly
-        if r[2] != command:
-            _LOGGER.warning(f"⚠️  Получена неожиданная команда ответа: ожидалось {command:02x}, получено {r[2]:02x}")
-            _LOGGER.warning(f"💡 Это может быть асинхронный ответ от устройства")
-            
-            # For SELECT_MODE and SET_MAIN_MODE commands, if we get a status update (0x06),
-            # it might mean the device processed the command and sent its current status
-            if command in [COMMAND_SELECT_MODE, COMMAND_SET_MAIN_MODE] and r[2] == COMMAND_GET_STATUS:
-                _LOGGER.info(f"📊 Устройство отправило обновление статуса после команды {command:02x}")
-                _LOGGER.info(f"💡 Вероятно, команда была обработана успешно")
-                # Return a success response for compatibility
-                clean = bytes([0x01])  # Success code
-                _LOGGER.debug(f"📥 Очищенные данные ответа: 01 (успех)")
-                return clean
-            # For TURN_ON command, if we get a status update (0x06),
-            # it might mean the device processed the command and sent its current status
-            elif command == COMMAND_TURN_ON and r[2] == COMMAND_GET_STATUS:
-                _LOGGER.info(f"📊 Устройство отправило обновление статуса после команды {command:02x}")
-                _LOGGER.info(f"💡 Вероятно, команда была обработана успешно")
-                # Return a success response for compatibility
-                clean = bytes([0x01])  # Success code
-                _LOGGER.debug(f"📥 Очищенные данные ответа: 01 (успех)")
-                return clean
-            elif command == COMMAND_GET_STATUS and r[2] in [COMMAND_SELECT_MODE, COMMAND_SET_MAIN_MODE, COMMAND_TURN_OFF]:
-                # If we were expecting a status update but got a command response,
-                # this might be a delayed response from a previous command
-                _LOGGER.info(f"📊 Получен отложенный ответ на команду {r[2]:02x} вместо статуса")
-                _LOGGER.info(f"💡 Вероятно, предыдущая команда была обработана успешно")
-                # Return the response data for processing
-                clean = bytes(r[3:-1])
-                _LOGGER.debug(f"📥 Очищенные данные ответа: {' '.join([f'{c:02x}' for c in clean])}")
-                return clean
-            else:
-                _LOGGER.error(f"❌ Некорректная команда ответа: ожидалось {command:02x}, получено {r[2]:02x}")
-                raise IOError("Некорректная команда ответа")
-        
-        clean = bytes(r[3:-1])
-        _LOGGER.debug(f"📥 Очищенные данные ответа: {' '.join([f'{c:02x}' for c in clean])}")
-        return clean
+        self._pending.pop(self._iter, None)
+        self._sent_at.pop(self._iter, None)
+        self._add_latency(command, self.clock.monotonic() - started)
+        if _LOGGER.isEnabledFor(logging.DEBUG):
+            _LOGGER.debug("📨 %02x #%d: %s → %s", command, self._iter, data.hex().upper(), bytes(r).hex().upper() if self._late_answer is None else "late")
+        # Устройство может ответить другой командой (например, асинхронным статусом),
+        # как это трактовать - описано в таблице правил для модели
+        if reply != command:
+            rule = self._response_rules.get((command, reply))
+            if rule == RESPONSE_ACK:
+                _LOGGER.debug("📊 Ответ %02x на команду %02x, команда считается выполненной", reply, command)
+                if reply == COMMAND_GET_STATUS and len(payload) >= 16:
+                    self._pushed_status = self.parse_status(payload)
+                return bytes([0x01])  # Success code
+            elif rule == RESPONSE_PAYLOAD:
+                _LOGGER.debug("📊 Получен отложенный ответ на команду %02x вместо %02x", reply, command)
+                return payload
+            _LOGGER.error("❌ Некорректная команда ответа: ожидалось %02x, получено %02x", command, reply)
+            raise IOError("Некорректная команда ответа")
+
+        return payload
 
     def _rx_callback(self, sender, data):
+        self._trace.append((self.clock.monotonic(), "rx", bytes(data)))
+        if self.capture is not None: self.capture.record("rx", data)
+        try:
+            seq, reply, payload = decode_frame(data)
+        except ValueError:
+            # Ожидающая команда сама сообщит о некорректном формате
+            self._last_data = data
+            return
+        if seq != self._iter and seq in self._pending:
+            self._late_reply(seq, reply, payload)
+            return
         self._last_data = data
 
-    async def _connect(self):
+    def _late_reply(self, seq, reply, payload):
+        """Handle a reply to an earlier request instead of discarding it."""
+        command = self._pending.pop(seq, None)
+        sent = self._sent_at.pop(seq, 0)
+        self._late_replies += 1
+        if command is None:
+            _LOGGER.debug("📬 Поздний ответ #%d (%02x) на неизвестную команду", seq, reply)
+        else:
+            _LOGGER.debug("📬 Поздний ответ #%d (%02x) на команду %02x", seq, reply, command)
+        if reply == COMMAND_GET_STATUS and len(payload) >= 16:
+            if self._status_time > sent:
+                # Статус, прочитанный после этого запроса, новее позднего кадра
+                _LOGGER.debug("📬 Поздний статус #%d старше сохраненного, пропущен", seq)
+            else:
+                self._set_status(self.parse_status(payload), fresh=False, since=sent)
+        waiting = self._pending.get(self._iter)
+        if command is not None and command == reply == waiting and command in IDEMPOTENT_COMMANDS:
+            self._late_answer = payload
+
+    def enable_capture(self, size=CAPTURE_SIZE):
+        """Start recording every TX and RX frame."""
+        self.capture = FrameCapture(size, self.clock)
+        return self.capture
+
+    def disable_capture(self):
+        """Stop recording frames and return the capture."""
+        capture, self.capture = self.capture, None
+        return capture
+
+    def _add_latency(self, command, latency):
+        """Add a command round trip time to the latency histogram."""
+        stats = self._latency.get(command)
+        if stats is None:
+            stats = self._latency[command] = {
+                "count": 0, "total": 0.0, "max": 0.0,
+                "buckets": [0] * (len(DIAG_LATENCY_BUCKETS) + 1),
+            }
+        stats["count"] += 1
+        stats["total"] += latency
+        stats["max"] = max(stats["max"], latency)
+        for i, bound in enumerate(DIAG_LATENCY_BUCKETS):
+            if latency <= bound:
+                stats["buckets"][i] += 1
+                break
+        else:
+            stats["buckets"][-1] += 1
+
+    async def _connect(self, max_attempts=5):
         if self._disposed:
             raise DisposedError()
         if self._client and self._client.is_connected:
@@ -139,21 +233,28 @@ class SkyCookerConnection(SkyCooker):
             # Очистка предыдущих подключений
             await self._cleanup_previous_connections()
             
+            self._connect_timings = {}
+            started = self.clock.monotonic()
             self._device = bluetooth.async_ble_device_from_address(self.hass, self._mac)
+            self._connect_timings["lookup"] = self.clock.monotonic() - started
             if not self._device:
                 _LOGGER.error("❌ Устройство %s не найдено", self._mac)
                 raise IOError(f"Устройство {self._mac} не найдено")
-            _LOGGER.info("🔌 Подключение к мультиварке %s (%s)...", self._mac, self._device.name)
+            _LOGGER.debug("🔌 Подключение к мультиварке %s (%s)...", self._mac, self._device.name)
+            started = self.clock.monotonic()
             self._client = await establish_connection(
                 BleakClientWithServiceCache,
                 self._device,
                 self._device.name or "Unknown Device",
-                max_attempts=5,
+                max_attempts=max_attempts,
                 retry_interval=1.0  # Добавляем задержку между попытками
             )
-            _LOGGER.info("✅ Успешно подключено к мультиварке %s", self._mac)
+            self._connect_timings["establish"] = self.clock.monotonic() - started
+            _LOGGER.debug("✅ Успешно подключено к мультиварке %s", self._mac)
+            started = self.clock.monotonic()
             await self._client.start_notify(UUID_RX, self._rx_callback)
-            _LOGGER.info("📡 Подписка на уведомления от мультиварки")
+            self._connect_timings["notify"] = self.clock.monotonic() - started
+            _LOGGER.debug("📡 Подписка на уведомления от мультиварки")
         except Exception as e:
             _LOGGER.error("❌ Ошибка подключения к мультиварке: %s", e)
             _LOGGER.error("💡 Проверьте, что устройство находится в режиме сопряжения и рядом с адаптером")
@@ -168,29 +269,26 @@ class SkyCookerConnection(SkyCooker):
     auth = lambda self: super().auth(self._key)
 
     async def select_mode(self, mode, subprog=0):
+        from .tables import MODE_STANDBY
         # Проверяем, поддерживается ли режим устройством
         # Режим MODE_STANDBY (ожидание) не может быть установлен напрямую, но может быть получен как текущий статус
         if mode != MODE_STANDBY and not self._is_mode_supported(mode):
-            _LOGGER.error(f"❌ Попытка установить неподдерживаемый режим {mode}")
+            _LOGGER.error("❌ Попытка установить неподдерживаемый режим %s", mode)
             raise ValueError(f"Режим {mode} не поддерживается устройством")
          
         # Проверяем, является ли режим MODE_NONE
-        model_type = self.model_code
-        if model_type and model_type in MODE_NAMES and mode < len(MODE_NAMES[model_type]):
-            mode_constant = MODE_NAMES[model_type][mode]
-            if mode_constant == MODE_NONE:
-                _LOGGER.error(f"❌ Попытка установить режим MODE_NONE (индекс {mode})")
-                raise ValueError(f"Режим {mode} не поддерживается устройством (MODE_NONE)")
+        capabilities = self.capabilities
+        if capabilities and mode in capabilities.none_modes:
+            _LOGGER.error("❌ Попытка установить режим MODE_NONE (индекс %s)", mode)
+            raise ValueError(f"Режим {mode} не поддерживается устройством (MODE_NONE)")
             
         # Вызываем метод базового класса для отправки команды
-        _LOGGER.debug(f"📤 Отправка команды SELECT_MODE для режима {mode}")
         await super().select_mode(mode, subprog)
           
         # При выборе режима устанавливаем Number значения из MODE_DATA для текущего режима
         # ТОЛЬКО ЕСЛИ ПОЛЬЗОВАТЕЛЬ НЕ ИЗМЕНЯЛ ИХ ВРУЧНУЮ
-        model_type = self.model_code
-        if model_type and model_type in MODE_DATA and mode < len(MODE_DATA[model_type]):
-            mode_data = MODE_DATA[model_type][mode]
+        mode_data = self._mode_data(mode)
+        if mode_data is not None:
             
             # Устанавливаем температуру из MODE_DATA только если пользователь не установил свою
             target_temp_from_mode = mode_data[0]
@@ -221,7 +319,7 @@ class SkyCookerConnection(SkyCooker):
                 self._client = None
             self._device = None
         except Exception as e:
-            _LOGGER.warning(f"⚠️  Ошибка очистки предыдущего соединения: {e}")
+            _LOGGER.warning("⚠️  Ошибка очистки предыдущего соединения: %s", e)
 
     async def _disconnect(self):
         try:
@@ -251,21 +349,67 @@ class SkyCookerConnection(SkyCooker):
             except Exception as ex:
                 await self.disconnect()
                 self._last_connect_ok = False
-                _LOGGER.error(f"🚫 Ошибка подключения к мультиварке: {ex}")
+                _LOGGER.error("🚫 Ошибка подключения к мультиварке: %s", ex)
                 raise ex
         if not self._auth_ok:
+            started = self.clock.monotonic()
             self._last_auth_ok = self._auth_ok = await self.auth()
+            self._connect_timings["auth"] = self.clock.monotonic() - started
             if not self._auth_ok:
                 _LOGGER.error("🚫 Ошибка аутентификации. Необходимо включить режим сопряжения на мультиварке.")
                 raise AuthError("Ошибка аутентификации")
-            _LOGGER.info("✅ Аутентификация успешна")
+            _LOGGER.debug("✅ Аутентификация успешна")
+            started = self.clock.monotonic()
             self._sw_version = await self.get_version()
-            _LOGGER.info(f"📋 Версия ПО: {self._sw_version}")
+            self._connect_timings["version"] = self.clock.monotonic() - started
+            _LOGGER.debug("📋 Версия ПО: %s", self._sw_version)
             # try:
             #     await self.sync_time()
             # except Exception as e:
             #     _LOGGER.warning(f"⚠️  Ошибка синхронизации времени: {e}")
 
+    async def probe(self, auth_timeout=PROBE_AUTH_TIMEOUT):
+        """Check that the cooker can be paired, keeping the session on success.
+
+        Connects once and sends AUTH with a short timeout. Returns PROBE_OK,
+        PROBE_NOT_REACHABLE when the cooker can't be connected,
+        PROBE_NOT_PAIRING when it doesn't answer AUTH (not in pairing mode)
+        or PROBE_AUTH_REJECTED when it refuses the key. A failed version read
+        after AUTH disconnects and counts as PROBE_NOT_REACHABLE. Phase
+        timings are kept in the connect timings of diagnostics().
+        """
+        try:
+            await self._connect(max_attempts=PROBE_CONNECT_ATTEMPTS)
+        except Exception as e:
+            _LOGGER.debug("🔍 Мультиварка %s недоступна: %s", self._mac, e)
+            self._last_connect_ok = False
+            await self.disconnect()
+            return PROBE_NOT_REACHABLE
+        self._last_connect_ok = True
+        started = self.clock.monotonic()
+        try:
+            r = await self.command(COMMAND_AUTH, self._key, timeout=auth_timeout)
+        except Exception as e:
+            _LOGGER.debug("🔍 Нет ответа на AUTH от %s: %s", self._mac, e)
+            r = None
+        self._connect_timings["auth"] = self.clock.monotonic() - started
+        self._last_auth_ok = self._auth_ok = bool(r) and r[0] != 0
+        if not self._auth_ok:
+            await self.disconnect()
+            return PROBE_NOT_PAIRING if r is None else PROBE_AUTH_REJECTED
+        started = self.clock.monotonic()
+        try:
+            self._sw_version = await self.get_version()
+        except Exception as e:
+            # Связь оборвалась после AUTH - сессию не оставляем висеть
+            _LOGGER.debug("🔍 Не удалось прочитать версию %s: %s", self._mac, e)
+            self._last_connect_ok = False
+            await self.disconnect()
+            return PROBE_NOT_REACHABLE
+        self._connect_timings["version"] = self.clock.monotonic() - started
+        _LOGGER.debug("✅ Проверка сопряжения %s пройдена за %.2f с", self._mac, sum(self._connect_timings.values()))
+        return PROBE_OK
+
     async def _disconnect_if_need(self):
         if not self.persistent:
             await self.disconnect()
@@ -274,23 +418,22 @@ class SkyCookerConnection(SkyCooker):
         try:
             async with self._update_lock:
                 if self._disposed: return None
-                _LOGGER.info("🔄 Обновление состояния мультиварки")
+                _LOGGER.debug("🔄 Обновление состояния мультиварки")
                 if not self.available: force_stats = True
                 await self._connect_if_need()
   
                 if extra_action: await extra_action
   
                 try:
-                    self._status = await self.get_status()
+                    self._set_status(await self.get_status())
                 except Exception as e:
-                    _LOGGER.warning(f"⚠️  Ошибка получения статуса: {e}")
+                    _LOGGER.warning("⚠️  Ошибка получения статуса: %s", e)
                     self._status = None
                     raise
   
                 # Метод update() теперь только читает статус и не отправляет команды
                 # Все команды отправляются только в методах start() и start_delayed()
                 # при явном нажатии пользователем "Старт" или "Отложенный старт"
-                _LOGGER.debug("📊 Статус устройства успешно получен, команды не отправляются")
 
                 await self._disconnect_if_need()
                 self.add_stat(True)
@@ -299,28 +442,125 @@ class SkyCookerConnection(SkyCooker):
 
         except Exception as ex:
             await self.disconnect()
-            if hasattr(self, '_target_mode') and self._target_mode is not None and self._last_set_target + TARGET_TTL < monotonic():
-                _LOGGER.warning(f"⚠️  Не удалось установить режим {self._target_mode} в течение {TARGET_TTL} секунд, прекращаю попытки")
+            if hasattr(self, '_target_mode') and self._target_mode is not None and self._last_set_target + TARGET_TTL < self.clock.monotonic():
+                _LOGGER.warning("⚠️  Не удалось установить режим %s в течение %s секунд, прекращаю попытки", self._target_mode, TARGET_TTL)
                 self._target_mode = None
             if type(ex) == AuthError: return None
             self.add_stat(False)
             if tries > 1 and extra_action is None:
-                _LOGGER.debug(f"🚫 {type(ex).__name__}: {str(ex)}, повтор #{MAX_TRIES - tries + 1}")
-                await asyncio.sleep(TRIES_INTERVAL)
+                self._retries += 1
+                _LOGGER.debug("🚫 %s: %s, повтор #%d", type(ex).__name__, ex, MAX_TRIES - tries + 1)
+                await self.clock.sleep(TRIES_INTERVAL)
                 return await self.update(tries=tries-1, force_stats=force_stats, extra_action=extra_action, commit=commit)
             else:
-                _LOGGER.warning(f"⚠️  Не удалось обновить состояние, {type(ex).__name__}: {str(ex)}")
-                _LOGGER.debug(traceback.format_exc())
+                _LOGGER.warning("⚠️  Не удалось обновить состояние, %s: %s", type(ex).__name__, ex)
+                _LOGGER.debug("%s", ex, exc_info=True)
             return False
 
+    async def get_status_cached(self, max_age=0):
+        """Return the status if it is not older than max_age seconds, otherwise read it.
+
+        Concurrent callers share one read instead of queueing their own.
+        """
+        if self._status is not None and self.clock.monotonic() - self._status_time <= max_age:
+            return self._status
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.ensure_future(self._refresh())
+        return await asyncio.shield(self._refresh_task)
+
+    async def _refresh(self):
+        try:
+            if not await self.update():
+                raise IOError("Не удалось получить статус мультиварки")
+            return self._status
+        finally:
+            self._refresh_task = None
+
     def add_stat(self, value):
-        self._successes.append(value)
-        if len(self._successes) > 100: self._successes = self._successes[-100:]
+        self.link_stats.add(value)
+
+    @property
+    def _successes(self):
+        return self.link_stats.window
+
+    @_successes.setter
+    def _successes(self, value):
+        self.link_stats.reset(value)
 
     @property
     def success_rate(self):
-        if len(self._successes) == 0: return 0
-        return int(100 * len([s for s in self._successes if s]) / len(self._successes))
+        return self.link_stats.success_rate
+
+    @property
+    def consecutive_failures(self):
+        return self.link_stats.consecutive_failures
+
+    @property
+    def last_success(self):
+        """Return the time of the last successful poll as an aware datetime."""
+        return self.link_stats.last_success_at
+
+    @property
+    def timeouts_per_hour(self):
+        return self.link_stats.timeouts_per_hour
+
+    @property
+    def poll_latency(self):
+        """Return the moving average of successful poll durations in seconds."""
+        latency = self.link_stats.poll_latency
+        return round(latency, 3) if latency is not None else None
+
+    def add_poll(self, started, duration, result, next_interval):
+        """Record a scheduled poll for diagnostics."""
+        self._polls.append((started, duration, result, next_interval))
+        if result:
+            self.link_stats.add_latency(duration)
+
+    def diagnostics(self):
+        """Return a performance snapshot of the connection."""
+        now = self.clock.monotonic()
+        since = self.link_stats.since_last_success
+        return {
+            "model": self.model,
+            "model_code": self.model_code,
+            "sw_version": self._sw_version,
+            "persistent": self.persistent,
+            "adapter": self.adapter,
+            "connected": self.connected,
+            "auth_ok": self._auth_ok,
+            "last_connect_ok": self._last_connect_ok,
+            "last_auth_ok": self._last_auth_ok,
+            "success_rate": self.success_rate,
+            "consecutive_failures": self.consecutive_failures,
+            "since_last_success": round(since, 1) if since is not None else None,
+            "timeouts_per_hour": self.timeouts_per_hour,
+            "poll_latency": self.poll_latency,
+            "retries": self._retries,
+            "late_replies": self._late_replies,
+            "timeouts": {f"{c:02x}": n for c, n in self._timeouts.items()},
+            "latency": {
+                f"{c:02x}": {
+                    "count": s["count"],
+                    "mean": round(s["total"] / s["count"], 4),
+                    "max": round(s["max"], 4),
+                    "buckets": dict(zip([f"<={b}" for b in DIAG_LATENCY_BUCKETS] + ["inf"], s["buckets"])),
+                }
+                for c, s in self._latency.items()
+            },
+            "connect_timings": {k: round(v, 4) for k, v in self._connect_timings.items()},
+            "polls": [
+                {"age": round(now - t, 1), "duration": round(d, 3), "result": r, "next_interval": i}
+                for t, d, r, i in self._polls
+            ],
+            "frames": [
+                {"age": round(now - t, 3), "dir": direction, "seq": data[1] if len(data) > 1 else None,
+                 "cmd": f"{data[2]:02x}" if len(data) > 2 else None, "data": data.hex().upper()}
+                for t, direction, data in self._trace
+            ],
+            "status": self._status._asdict() if self._status else None,
+            "optimistic": self._expected,
+            "last_error": self.last_error,
+        }
 
     async def commit(self):
         """Commit changes to the device."""
@@ -329,20 +569,23 @@ class SkyCookerConnection(SkyCooker):
 
     def _is_mode_supported(self, mode):
         """Проверяет, поддерживается ли режим устройством."""
-        model_type = self.model_code
-        if model_type and model_type in MODE_DATA:
-            if mode >= len(MODE_DATA[model_type]):
-                _LOGGER.warning(f"⚠️  Режим {mode} не поддерживается для модели {model_type}")
-                return False
-            # Режим MODE_STANDBY - это режим ожидания, его нельзя устанавливать напрямую
-            # Но он может быть текущим состоянием устройства, поэтому разрешаем его как допустимое состояние
-            if mode == MODE_STANDBY:
-                _LOGGER.debug(f"📋 Режим 16 (ожидание) - это допустимое состояние устройства, но его нельзя устанавливать напрямую")
-                return True
+        capabilities = self.capabilities
+        if capabilities and mode >= len(capabilities.modes):
+            _LOGGER.warning("⚠️  Режим %s не поддерживается для модели %s", mode, self.model_code)
+            return False
+        # Режим ожидания нельзя устанавливать напрямую, но он может быть текущим состоянием устройства
         return True
 
+    def _mode_data(self, mode):
+        """Return the MODE_DATA row of a mode, None if the model does not have it."""
+        capabilities = self.capabilities
+        if capabilities and mode < len(capabilities.modes):
+            return capabilities.modes[mode]
+        return None
+
     async def stop(self):
         if self._disposed: return
+        self.cancel_apply()
         await self._disconnect()
         self._disposed = True
         _LOGGER.info("Stopped.")
@@ -373,8 +616,8 @@ class SkyCookerConnection(SkyCooker):
 
     @property
     def current_mode(self):
-        if self._status and self._status.is_on:
-            return self._status.mode
+        if self._status:
+            return self._status.current_mode
         return None
 
     @property
@@ -472,51 +715,52 @@ class SkyCookerConnection(SkyCooker):
     @property
     def status_code(self):
         if not self._status: return None
-        return self._status.mode if self._status.is_on else STATUS_OFF
+        return self._status.status_code
 
     @property
     def remaining_time(self):
         if not self._status: return None
-        # If device is off, return 0
-        if self._status.status == STATUS_OFF:
-            return 0
+        # Производные значения посчитаны один раз при разборе статуса
         if self._status.status == STATUS_DELAYED_LAUNCH:
-            # Return remaining time based on target_boil_hours and target_boil_minutes
-            return (self._status.target_delayed_start_hours * 60 + self._status.target_delayed_start_minutes) + (self._status.target_boil_hours * 60 + self._status.target_boil_minutes)
-        return self._status.target_boil_hours * 60 + self._status.target_boil_minutes
+            return self._countdown(self._status.delayed_start_time) + self._status.boil_time
+        if self._status.status == STATUS_COOKING:
+            return self._countdown(self._status.boil_time)
+        return self._status.remaining_time
 
     @property
     def total_time(self):
-        if not self._status: return None
-        # For total time, we need to calculate based on status
-        # If device is off, return 0
-        if self._status.status == STATUS_OFF:
-            return 0
-        # If delayed start is active, include delayed start time in total time
-        if self._status.status == STATUS_DELAYED_LAUNCH:
-            return (self._status.target_delayed_start_hours * 60 + self._status.target_delayed_start_minutes) + (self._status.target_boil_hours * 60 + self._status.target_boil_minutes)
-        # Otherwise, return only cooking time
-        return self._status.target_boil_hours * 60 + self._status.target_boil_minutes
+        # Total time is the cooking time, plus the delay while delayed start is active
+        return self.remaining_time
 
     @property
     def delayed_start_time(self):
         if not self._status: return None
-        # For delayed start time, we need to calculate based on status
-        # Return delayed start time only if delayed start is active (STATUS_DELAYED_LAUNCH)
-        # Check if delayed start time is set in the status and device is in delayed launch mode
-        if hasattr(self._status, 'target_delayed_start_hours') and hasattr(self._status, 'target_delayed_start_minutes'):
-            if self._status.target_delayed_start_hours is not None and self._status.target_delayed_start_minutes is not None:
-                # Return delayed start time only if device is in delayed launch mode
-                if self._status.status == STATUS_DELAYED_LAUNCH:
-                    return (self._status.target_delayed_start_hours * 60 + self._status.target_delayed_start_minutes)
+        # Return delayed start time only if device is in delayed launch mode
+        if self._status.status == STATUS_DELAYED_LAUNCH:
+            return self._countdown(self._status.delayed_start_time)
         return 0
 
     @property
     def auto_warm_time(self):
         if not self._status: return None
-        # For auto warm time, we need to calculate based on status
-        # For now, return target_boil_hours and target_boil_minutes if in auto warm mode, else 0
-        return (self._status.target_delayed_start_hours * 60 + self._status.target_delayed_start_minutes) if self._status.status == STATUS_AUTO_WARM else 0
+        # Время автоподогрева растет, пока мультиварка держит блюдо теплым
+        return (self._status.delayed_start_time + self.elapsed_minutes) if self._status.status == STATUS_AUTO_WARM else 0
+
+    @property
+    def elapsed_minutes(self):
+        """Whole minutes passed since the last real status."""
+        if not self._countdown_time: return 0
+        return int((self.clock.monotonic() - self._countdown_time) // 60)
+
+    def _countdown(self, minutes):
+        # Таймеры на устройстве идут дальше между опросами, продвигаем их локально
+        return max(0, minutes - self.elapsed_minutes)
+
+    def next_tick_delay(self):
+        """Seconds until the local countdown changes, None if nothing is counting."""
+        if not self._status or not self._countdown_time or self._status.status not in COUNTDOWN_STATUSES:
+            return None
+        return 60 - (self.clock.monotonic() - self._countdown_time) % 60
 
     @property
     def auto_warm_enabled(self):
@@ -581,7 +825,7 @@ class SkyCookerConnection(SkyCooker):
         model_type = self.model_code
           
         # Validate target_mode - if it's invalid (e.g., MODE_STANDBY for MODEL_3), use mode 0 (Multi-chef)
-        if model_type and model_type in MODE_DATA and target_mode >= len(MODE_DATA[model_type]):
+        if self.capabilities and target_mode >= len(self.capabilities.modes):
             _LOGGER.warning(f"⚠️  Некорректный режим {target_mode} для модели {model_type}, использую режим 0 (Multi-chef)")
             target_mode = 0
           
@@ -592,6 +836,7 @@ class SkyCookerConnection(SkyCooker):
           
         # Если текущий режим устройства - MODE_STANDBY (ожидание), и пользователь не выбрал режим,
         # используем режим 0 (Multi-chef) вместо режима MODE_STANDBY
+        from .tables import MODE_STANDBY
         if target_mode == MODE_STANDBY:
             _LOGGER.warning(f"⚠️  Режим 16 (ожидание) не может быть установлен напрямую, использую режим 0 (Multi-chef)")
             target_mode = 0
@@ -611,16 +856,15 @@ class SkyCookerConnection(SkyCooker):
         _LOGGER.info(f"🎯 Используется подпрограмма {target_subprogram}")
           
         # If user hasn't set custom temperature, use default from MODE_DATA
-        if target_temp is None:
-            if model_type and model_type in MODE_DATA and target_mode < len(MODE_DATA[model_type]):
-                target_temp = MODE_DATA[model_type][target_mode][0]
+        mode_data = self._mode_data(target_mode)
+        if target_temp is None and mode_data is not None:
+            target_temp = mode_data[0]
           
         # If user hasn't set custom cooking time, use default from MODE_DATA
         # But if user has set custom cooking time, respect their choice
-        if (target_boil_hours == 0 and target_boil_minutes == 0):
-            if model_type and model_type in MODE_DATA and target_mode < len(MODE_DATA[model_type]):
-                target_boil_hours = MODE_DATA[model_type][target_mode][1]
-                target_boil_minutes = MODE_DATA[model_type][target_mode][2]
+        if target_boil_hours == 0 and target_boil_minutes == 0 and mode_data is not None:
+            target_boil_hours = mode_data[1]
+            target_boil_minutes = mode_data[2]
          
         # Ensure all values are integers (not None)
         target_boil_hours = target_boil_hours or 0
@@ -628,76 +872,13 @@ class SkyCookerConnection(SkyCooker):
          
         _LOGGER.info(f"Starting cooking: mode={target_mode}, temp={target_temp}, time={target_boil_hours}:{target_boil_minutes:02d}")
          
-        # Check if device is in standby mode (MODE_STANDBY) or if we need to wake it up
-        is_in_standby = self._status and self._status.mode == MODE_STANDBY
-        current_device_mode = self._status.mode if self._status else None
-        device_is_on = self._status.is_on if self._status else False
-         
         try:
             # Connect if needed
             await self._connect_if_need()
-             
-            # Implement the correct sequence according to the requirements
-            # 1. Если в режиме ожидания (MODE_STANDBY статус) - отправляем команду 09 с выбранным режимом
-            #    и после получения ответа - отправляем COMMAND_SET_MAIN_MODE = 0x05 с выбранными параметрами
-            #    После ответа - отправляем COMMAND_TURN_ON = 0x03
-            if is_in_standby:
-                _LOGGER.info("🔄 Устройство находится в режиме ожидания (MODE_STANDBY статус)")
-                _LOGGER.info("📤 Отправка команды 09 с выбранным режимом и подпрограммой")
-                await self.select_mode(target_mode, target_subprogram)
-                await asyncio.sleep(0.5)
-                 
-                _LOGGER.info("📤 Отправка COMMAND_SET_MAIN_MODE = 0x05 с выбранными параметрами")
-                await self.set_main_mode(target_mode, target_subprogram, target_temp, target_boil_hours, target_boil_minutes, 0, 0, auto_warm_flag)
-                await asyncio.sleep(0.3)
-                 
-                _LOGGER.info("📤 Отправка COMMAND_TURN_ON = 0x03")
-                await self.turn_on()
-            # 2. Если на мультиварке уже выбран режим, и он совпадает с выбранным в интерфейсе
-            #    отправляем COMMAND_SET_MAIN_MODE = 0x05 с выбранными параметрами
-            #    После ответа - отправляем COMMAND_TURN_ON = 0x03
-            elif current_device_mode == target_mode and device_is_on:
-                _LOGGER.info(f"🔄 На мультиварке уже выбран режим {target_mode}, и он совпадает с выбранным в интерфейсе")
-                _LOGGER.info("📤 Отправка COMMAND_SET_MAIN_MODE = 0x05 с выбранными параметрами")
-                await self.set_main_mode(target_mode, target_subprogram, target_temp, target_boil_hours, target_boil_minutes, 0, 0, auto_warm_flag)
-                await asyncio.sleep(0.3)
-                 
-                _LOGGER.info("📤 Отправка COMMAND_TURN_ON = 0x03")
-                await self.turn_on()
-            # 3. Если на мультиварке уже выбран режим, и он НЕ совпадает с выбранным в интерфейсе
-            #    отправляем команду 09 с выбранным режимом
-            #    и после получения ответа - отправляем COMMAND_SET_MAIN_MODE = 0x05 с выбранными параметрами
-            #    После ответа - отправляем COMMAND_TURN_ON = 0x03
-            elif current_device_mode != target_mode:
-                _LOGGER.info(f"🔄 На мультиварке уже выбран режим {current_device_mode}, и он НЕ совпадает с выбранным в интерфейсе ({target_mode})")
-                _LOGGER.info("📤 Отправка команды 09 с выбранным режимом и подпрограммой")
-                await self.select_mode(target_mode, target_subprogram)
-                await asyncio.sleep(0.5)
-                 
-                _LOGGER.info("📤 Отправка COMMAND_SET_MAIN_MODE = 0x05 с выбранными параметрами")
-                await self.set_main_mode(target_mode, target_subprogram, target_temp, target_boil_hours, target_boil_minutes, 0, 0, auto_warm_flag)
-                await asyncio.sleep(0.3)
-                 
-                _LOGGER.info("📤 Отправка COMMAND_TURN_ON = 0x03")
-                await self.turn_on()
-            else:
-                # Default case - send all commands
-                _LOGGER.info("🔄 Неизвестное состояние устройства, отправляем все команды")
-                if is_in_standby:
-                    _LOGGER.info("🔄 Устройство находится в режиме ожидания, отправляем команду SELECT_MODE для пробуждения")
-                    await self.select_mode(target_mode, target_subprogram)
-                    await asyncio.sleep(0.5)
-                 
-                await self.select_mode(target_mode, target_subprogram)
-                await asyncio.sleep(0.3)
-                 
-                await self.set_main_mode(target_mode, target_subprogram, target_temp, target_boil_hours, target_boil_minutes, 0, 0, auto_warm_flag)
-                await asyncio.sleep(0.3)
-                 
-                await self.turn_on()
-             
-            # Update status after starting
-            self._status = await self.get_status()
+
+            # Отправляем только те команды, которые действительно меняют состояние устройства
+            await self._run_start(target_mode, target_subprogram, target_temp, target_boil_hours, target_boil_minutes,
+                                  0, 0, auto_warm_flag, (STATUS_WARMING, STATUS_COOKING))
               
             # Set target mode and temperature for future reference
             self._target_mode = target_mode
@@ -709,6 +890,7 @@ class SkyCookerConnection(SkyCooker):
              
         except Exception as ex:
             _LOGGER.error(f"❌ Ошибка при запуске приготовления: {str(ex)}")
+            self.rollback(f"Ошибка при запуске приготовления: {ex}")
             # Add more detailed error handling
             if "Некорректный размер данных статуса" in str(ex):
                 _LOGGER.error("💡 Проверьте соединение с устройством и повторите попытку")
@@ -716,12 +898,201 @@ class SkyCookerConnection(SkyCooker):
         finally:
             await self._disconnect_if_need()
 
+    def _plan_start(self, mode, subprog, params, running):
+        """Compare the desired program with the last real device status.
+
+        Returns a (select, set) pair: whether SELECT_MODE is needed and whether
+        SET_MAIN_MODE followed by TURN_ON is needed. params is
+        (temp, boil hours, boil minutes, delay hours, delay minutes, auto warm).
+        The optimistic status is not used, the device may not run it yet. The
+        device counts the time fields down, so durations are compared with
+        the program this connection started rather than with the status.
+        """
+        status = self._real_status
+        if (not status or not status.is_on or status.mode != mode
+                or (supports_subprograms(self.model_code) and status.subprog != subprog)):
+            return True, True
+        same = (self._program == (mode, subprog, params)
+                and status.target_temp == params[0] and status.auto_warm == params[-1])
+        return False, not same or status.status not in running
+
+    async def _run_start(self, mode, subprog, temp, boil_hours, boil_minutes,
+                         delayed_start_hours, delayed_start_minutes, auto_warm, running):
+        """Send the minimal command sequence that brings the device to the desired program."""
+        params = (temp, boil_hours, boil_minutes, delayed_start_hours, delayed_start_minutes, auto_warm)
+        need_select, need_set = self._plan_start(mode, subprog, params, running)
+        _LOGGER.debug("🧭 План запуска режима %s: SELECT_MODE=%s, SET_MAIN_MODE+TURN_ON=%s", mode, need_select, need_set)
+        if not need_set:
+            _LOGGER.info("✅ Программа %s уже выполняется с теми же параметрами", mode)
+            return
+        # Интерфейс сразу показывает запущенную программу, подтверждение придет с реальным статусом
+        self.expect(lambda s: s.is_on and s.mode == mode and s.status in running,
+                    mode=mode, is_on=True, status=running[-1], target_temp=temp)
+        if need_select:
+            await self.select_mode(mode, subprog)
+            await self.clock.sleep(0.5)
+        await self.set_main_mode(mode, subprog, temp, boil_hours, boil_minutes,
+                                 delayed_start_hours, delayed_start_minutes, auto_warm)
+        self._program = (mode, subprog, params)
+        await self.clock.sleep(0.3)
+        # Статус, присланный устройством в ответ на TURN_ON, заменяет отдельный GET_STATUS
+        self._pushed_status = None
+        await self.turn_on()
+        if self._pushed_status is not None:
+            self._set_status(self._pushed_status)
+        else:
+            self._set_status(await self.get_status())
+
+    def expect(self, check=None, **fields):
+        """Show status fields optimistically until a real status frame confirms them.
+
+        check(status) tells whether a real status confirms the expectation, by
+        default all fields have to match. If nothing confirms it within
+        OPTIMISTIC_TTL the last real status is restored and last_error is set.
+        """
+        if not self._status:
+            return
+        if self._expected is None:
+            self._real_status = self._status
+        self._expected = fields
+        self._expected_check = check
+        self._expected_deadline = self.clock.monotonic() + OPTIMISTIC_TTL
+        self.last_error = None
+        self._status = self._status._replace(**fields)
+        self._notify()
+
+    def _set_status(self, status, fresh=True, since=None):
+        """Store a real status and reconcile it with the optimistic one.
+
+        A status from a late reply is not fresh: it keeps the age of the
+        previous status, so the refresh cache does not take it for new.
+        Its timers count down from since, when its request was sent.
+        """
+        self._real_status = status
+        if status is not None:
+            if fresh:
+                self._status_time = self._countdown_time = self.clock.monotonic()
+            elif since:
+                self._countdown_time = since
+            if not status.is_on:
+                self._program = None
+        expected = self._expected
+        if expected is None or status is None:
+            self._status = status
+            return
+        check = self._expected_check or (lambda s: all(getattr(s, k) == v for k, v in expected.items()))
+        if check(status):
+            _LOGGER.debug("✅ Оптимистичное состояние подтверждено")
+            self._expected = None
+            self._status = status
+        elif self.clock.monotonic() < self._expected_deadline:
+            self._status = status._replace(**expected)
+        else:
+            self.rollback("Мультиварка не подтвердила изменение состояния")
+
+    def rollback(self, error):
+        """Drop the optimistic state and return to the last real status."""
+        if self._expected is None:
+            return
+        self._expected = None
+        self._status = self._real_status
+        self.last_error = error
+        _LOGGER.warning("↩️  %s, состояние восстановлено", error)
+        self._notify()
+
+    def _notify(self):
+        if self.hass:
+            async_dispatcher_send(self.hass, DISPATCHER_UPDATE)
+
+    def schedule_apply(self):
+        """Debounce settings changes into one SET_MAIN_MODE for a running program.
+
+        Every call restarts the quiet period, so several select changes made in
+        a row reach the device as a single frame. Returns True if scheduled.
+        """
+        if not self.live_apply or not self._status or self._status.status not in LIVE_APPLY_STATUSES:
+            return False
+        # Уже отправляемые настройки не прерываются, следующее применение дождется блокировки
+        if self._apply_handle:
+            self._apply_handle.cancel()
+        self._apply_handle = asyncio.get_running_loop().call_later(LIVE_APPLY_DELAY, self._run_apply)
+        return True
+
+    def _run_apply(self):
+        self._apply_handle = None
+        if self.hass:
+            self._apply_task = self.hass.async_create_task(self.apply_settings())
+        else:
+            self._apply_task = asyncio.get_running_loop().create_task(self.apply_settings())
+
+    def cancel_apply(self):
+        if self._apply_handle:
+            self._apply_handle.cancel()
+            self._apply_handle = None
+        if self._apply_task:
+            self._apply_task.cancel()
+            self._apply_task = None
+
+    async def apply_settings(self):
+        """Send the pending settings of the running program with one SET_MAIN_MODE.
+
+        Settings the user did not change are taken from the device: the boil
+        time continues from the remaining time and auto warm keeps its state.
+        """
+        async with self._update_lock:
+            status = self._status
+            if self._disposed or not status or status.status not in LIVE_APPLY_STATUSES:
+                return False
+            if self._target_mode is not None and self._target_mode != status.mode:
+                # Смена режима требует SELECT_MODE и перезапуска программы кнопкой "Старт"
+                _LOGGER.debug("⏭️  Режим %s отличается от выполняемого %s, применение отложено до старта", self._target_mode, status.mode)
+                return False
+            subprog = getattr(self, '_target_subprogram', status.subprog)
+            temp = self._target_temperature if self._target_temperature is not None else status.target_temp
+            # Длительность, с которой программа была запущена; статус показывает оставшееся время
+            program = self._program if self._program and self._program[:2] == (status.mode, subprog) else None
+            requested = (self._target_boil_hours, self._target_boil_minutes)
+            if program and requested == program[2][1:3]:
+                boil_hours, boil_minutes = status.target_boil_hours, status.target_boil_minutes
+            else:
+                boil_hours = self._target_boil_hours if self._target_boil_hours is not None else status.target_boil_hours
+                boil_minutes = self._target_boil_minutes if self._target_boil_minutes is not None else status.target_boil_minutes
+            delayed_start_hours = delayed_start_minutes = 0
+            if status.status == STATUS_DELAYED_LAUNCH:
+                delayed_start_hours = getattr(self, '_target_delayed_start_hours', None)
+                delayed_start_minutes = getattr(self, '_target_delayed_start_minutes', None)
+                if delayed_start_hours is None: delayed_start_hours = status.target_delayed_start_hours
+                if delayed_start_minutes is None: delayed_start_minutes = status.target_delayed_start_minutes
+            if self._auto_warm_changed:
+                auto_warm = 1 if self._auto_warm_enabled else 0
+            else:
+                auto_warm = status.auto_warm
+            self.expect(target_temp=temp)
+            try:
+                await self._connect_if_need()
+                self._pushed_status = None
+                await self.set_main_mode(status.mode, subprog, temp, boil_hours, boil_minutes,
+                                         delayed_start_hours, delayed_start_minutes, auto_warm)
+                duration = program[2][1:3] if program and requested == program[2][1:3] else (boil_hours, boil_minutes)
+                self._program = (status.mode, subprog, (temp, *duration, delayed_start_hours, delayed_start_minutes, auto_warm))
+                if self._pushed_status is not None:
+                    self._set_status(self._pushed_status)
+                self._last_set_target = self.clock.monotonic()
+                _LOGGER.debug("✅ Настройки применены: %s°C, %d:%02d", temp, boil_hours, boil_minutes)
+                return True
+            except Exception as ex:
+                self.rollback(f"Не удалось применить настройки: {ex}")
+                return False
+            finally:
+                await self._disconnect_if_need()
+
     async def enable_auto_warm(self):
         """Enable auto warm mode."""
         _LOGGER.info("Enabling auto warm mode")
         # Автоподогрев - это просто флаг, который будет использоваться при запуске приготовления
         # Никакие команды не отправляются, просто устанавливаем флаг
         self._auto_warm_enabled = True
+        self._auto_warm_changed = True
         _LOGGER.info("✅ Auto warm mode enabled (flag set)")
 
     async def disable_auto_warm(self):
@@ -730,6 +1101,7 @@ class SkyCookerConnection(SkyCooker):
         # Автоподогрев - это просто флаг, который будет использоваться при запуске приготовления
         # Никакие команды не отправляются, просто сбрасываем флаг
         self._auto_warm_enabled = False
+        self._auto_warm_changed = True
         _LOGGER.info("✅ Auto warm mode disabled (flag cleared)")
 
     async def stop_cooking(self):
@@ -737,7 +1109,12 @@ class SkyCookerConnection(SkyCooker):
         _LOGGER.info("Stopping cooking")
            
         # Turn off the device
-        await self.turn_off()
+        self.expect(lambda s: s.status in (STATUS_OFF, STATUS_FULL_OFF), is_on=False, status=STATUS_OFF)
+        try:
+            await self.turn_off()
+        except Exception as ex:
+            self.rollback(f"Ошибка при остановке приготовления: {ex}")
+            raise
            
         # Reset target state to default values
         self._target_mode = None
@@ -747,6 +1124,7 @@ class SkyCookerConnection(SkyCooker):
         self._target_delayed_start_hours = 0  # Стандартное значение для часов отложенного старта
         self._target_delayed_start_minutes = 0  # Стандартное значение для минут отложенного старта
         self._auto_warm_enabled = True  # Стандартное значение для автоподгрева
+        self._auto_warm_changed = False
 
     async def start_delayed(self):
         """Start cooking with delayed start."""
@@ -773,7 +1151,7 @@ class SkyCookerConnection(SkyCooker):
         model_type = self.model_code
           
         # Validate target_mode - if it's invalid (e.g., 16 for MODEL_3), use mode 0 (Multi-chef)
-        if model_type and model_type in MODE_DATA and target_mode >= len(MODE_DATA[model_type]):
+        if self.capabilities and target_mode >= len(self.capabilities.modes):
             _LOGGER.warning(f"⚠️  Некорректный режим {target_mode} для модели {model_type}, использую режим 0 (Multi-chef)")
             target_mode = 0
          
@@ -800,16 +1178,15 @@ class SkyCookerConnection(SkyCooker):
         _LOGGER.info(f"🔥 Автоподогрев {'включен' if auto_warm_flag else 'выключен'}")
           
         # If user hasn't set custom temperature, use default from MODE_DATA
-        if target_temp is None:
-            if model_type and model_type in MODE_DATA and target_mode < len(MODE_DATA[model_type]):
-                target_temp = MODE_DATA[model_type][target_mode][0]
+        mode_data = self._mode_data(target_mode)
+        if target_temp is None and mode_data is not None:
+            target_temp = mode_data[0]
          
         # If user hasn't set custom cooking time, use default from MODE_DATA
         # But if user has set custom cooking time, respect their choice
-        if (target_boil_hours == 0 and target_boil_minutes == 0):
-            if model_type and model_type in MODE_DATA and target_mode < len(MODE_DATA[model_type]):
-                target_boil_hours = MODE_DATA[model_type][target_mode][1]
-                target_boil_minutes = MODE_DATA[model_type][target_mode][2]
+        if target_boil_hours == 0 and target_boil_minutes == 0 and mode_data is not None:
+            target_boil_hours = mode_data[1]
+            target_boil_minutes = mode_data[2]
         
         # Ensure all values are integers (not None)
         target_boil_hours = target_boil_hours or 0
@@ -820,76 +1197,13 @@ class SkyCookerConnection(SkyCooker):
         # Не суммируем время, а храним отдельно часы и минуты для готовки, отложенного старта и автоподогрева
         _LOGGER.info(f"Delayed start: wait {target_delayed_start_hours}:{target_delayed_start_minutes:02d}, cook {target_boil_hours}:{target_boil_minutes:02d}")
          
-        # Check if device is in standby mode (MODE_STANDBY) or if we need to wake it up
-        is_in_standby = self._status and self._status.mode == MODE_STANDBY
-        current_device_mode = self._status.mode if self._status else None
-        device_is_on = self._status.is_on if self._status else False
-         
         try:
             # Connect if needed
             await self._connect_if_need()
-             
-            # Implement the correct sequence according to the requirements
-            # 1. Если в режиме ожидания (MODE_STANDBY статус) - отправляем команду 09 с выбранным режимом
-            #    и после получения ответа - отправляем COMMAND_SET_MAIN_MODE = 0x05 с выбранными параметрами
-            #    После ответа - отправляем COMMAND_TURN_ON = 0x03
-            if is_in_standby:
-                _LOGGER.info("🔄 Устройство находится в режиме ожидания (MODE_STANDBY статус)")
-                _LOGGER.info("📤 Отправка команды 09 с выбранным режимом и подпрограммой")
-                await self.select_mode(target_mode, target_subprogram)
-                await asyncio.sleep(0.5)
-                 
-                _LOGGER.info("📤 Отправка COMMAND_SET_MAIN_MODE = 0x05 с выбранными параметрами")
-                await self.set_main_mode(target_mode, target_subprogram, target_temp, target_boil_hours, target_boil_minutes, target_delayed_start_hours, target_delayed_start_minutes)
-                await asyncio.sleep(0.3)
-                 
-                _LOGGER.info("📤 Отправка COMMAND_TURN_ON = 0x03")
-                await self.turn_on()
-            # 2. Если на мультиварке уже выбран режим, и он совпадает с выбранным в интерфейсе
-            #    отправляем COMMAND_SET_MAIN_MODE = 0x05 с выбранными параметрами
-            #    После ответа - отправляем COMMAND_TURN_ON = 0x03
-            elif current_device_mode == target_mode and device_is_on:
-                _LOGGER.info(f"🔄 На мультиварке уже выбран режим {target_mode}, и он совпадает с выбранным в интерфейсе")
-                _LOGGER.info("📤 Отправка COMMAND_SET_MAIN_MODE = 0x05 с выбранными параметрами")
-                await self.set_main_mode(target_mode, target_subprogram, target_temp, target_boil_hours, target_boil_minutes, target_delayed_start_hours, target_delayed_start_minutes)
-                await asyncio.sleep(0.3)
-                 
-                _LOGGER.info("📤 Отправка COMMAND_TURN_ON = 0x03")
-                await self.turn_on()
-            # 3. Если на мультиварке уже выбран режим, и он НЕ совпадает с выбранным в интерфейсе
-            #    отправляем команду 09 с выбранным режимом
-            #    и после получения ответа - отправляем COMMAND_SET_MAIN_MODE = 0x05 с выбранными параметрами
-            #    После ответа - отправляем COMMAND_TURN_ON = 0x03
-            elif current_device_mode != target_mode:
-                _LOGGER.info(f"🔄 На мультиварке уже выбран режим {current_device_mode}, и он НЕ совпадает с выбранным в интерфейсе ({target_mode})")
-                _LOGGER.info("📤 Отправка команды 09 с выбранным режимом и подпрограммой")
-                await self.select_mode(target_mode, target_subprogram)
-                await asyncio.sleep(0.5)
-                 
-                _LOGGER.info("📤 Отправка COMMAND_SET_MAIN_MODE = 0x05 с выбранными параметрами")
-                await self.set_main_mode(target_mode, target_subprogram, target_temp, target_boil_hours, target_boil_minutes, target_delayed_start_hours, target_delayed_start_minutes)
-                await asyncio.sleep(0.3)
-                 
-                _LOGGER.info("📤 Отправка COMMAND_TURN_ON = 0x03")
-                await self.turn_on()
-            else:
-                # Default case - send all commands
-                _LOGGER.info("🔄 Неизвестное состояние устройства, отправляем все команды")
-                if is_in_standby:
-                    _LOGGER.info("🔄 Устройство находится в режиме ожидания, отправляем команду SELECT_MODE для пробуждения")
-                    await self.select_mode(target_mode, target_subprogram)
-                    await asyncio.sleep(0.5)
-                 
-                await self.select_mode(target_mode, target_subprogram)
-                await asyncio.sleep(0.3)
-                 
-                await self.set_main_mode(target_mode, target_subprogram, target_temp, target_boil_hours, target_boil_minutes, target_delayed_start_hours, target_delayed_start_minutes)
-                await asyncio.sleep(0.3)
-                 
-                await self.turn_on()
-             
-            # Update status after starting
-            self._status = await self.get_status()
+
+            # Отправляем только те команды, которые действительно меняют состояние устройства
+            await self._run_start(target_mode, target_subprogram, target_temp, target_boil_hours, target_boil_minutes,
+                                  target_delayed_start_hours, target_delayed_start_minutes, 0, (STATUS_DELAYED_LAUNCH,))
               
             # Set target mode and temperature for future reference
             self._target_mode = target_mode
@@ -901,6 +1215,7 @@ class SkyCookerConnection(SkyCooker):
              
         except Exception as ex:
             _LOGGER.error(f"❌ Ошибка при настройке отложенного старта: {str(ex)}")
+            self.rollback(f"Ошибка при настройке отложенного старта: {ex}")
             raise
         finally:
             await self._disconnect_if_need()
@@ -911,6 +1226,63 @@ class SkyCookerConnection(SkyCooker):
         if hasattr(self, '_target_delayed_start_minutes'):
             delattr(self, '_target_delayed_start_minutes')
 
+    def validate_program(self, mode, subprog=0, temp=None, boil_hours=None, boil_minutes=None,
+                         delayed_start_hours=0, delayed_start_minutes=0):
+        """Check a program against the model capabilities and return its MODE_DATA row."""
+        capabilities = self.capabilities
+        if capabilities is None or mode not in capabilities.valid_modes:
+            raise ValueError(f"Режим {mode} не поддерживается устройством")
+        if subprog and not capabilities.subprograms:
+            raise ValueError(f"Модель {self.model} не поддерживает подпрограммы")
+        if temp is not None and not PROGRAM_MIN_TEMP <= temp <= PROGRAM_MAX_TEMP:
+            raise ValueError(f"Температура {temp} вне диапазона {PROGRAM_MIN_TEMP}-{PROGRAM_MAX_TEMP}")
+        if not 0 <= (boil_hours or 0) <= 23 or not 0 <= (boil_minutes or 0) <= 59:
+            raise ValueError(f"Некорректное время приготовления {boil_hours}:{boil_minutes}")
+        if not 0 <= delayed_start_hours <= 23 or not 0 <= delayed_start_minutes <= 59:
+            raise ValueError(f"Некорректное время отложенного старта {delayed_start_hours}:{delayed_start_minutes}")
+        return capabilities.modes[mode]
+
+    async def run_program(self, mode, subprog=0, temp=None, boil_hours=None, boil_minutes=None,
+                          delayed_start_hours=0, delayed_start_minutes=0, auto_warm=None):
+        """Run a whole cooking program in one connection session.
+
+        The program is validated before connecting. Missing temperature and
+        cooking time are taken from MODE_DATA, a non-zero delay sets up a
+        delayed launch. The status is refreshed once at the end.
+        """
+        mode_data = self.validate_program(mode, subprog, temp, boil_hours, boil_minutes,
+                                          delayed_start_hours, delayed_start_minutes)
+        if temp is None:
+            temp = mode_data[0]
+        if boil_hours is None and boil_minutes is None:
+            boil_hours, boil_minutes = mode_data[1], mode_data[2]
+        boil_hours = boil_hours or 0
+        boil_minutes = boil_minutes or 0
+        if auto_warm is None:
+            auto_warm = self._auto_warm_enabled
+        delayed = delayed_start_hours or delayed_start_minutes
+        running = (STATUS_DELAYED_LAUNCH,) if delayed else (STATUS_WARMING, STATUS_COOKING)
+        _LOGGER.info("▶️  Запуск программы: режим=%s, подпрограмма=%s, %s°C, %d:%02d, отсрочка %d:%02d, автоподогрев=%s",
+                     mode, subprog, temp, boil_hours, boil_minutes, delayed_start_hours, delayed_start_minutes, auto_warm)
+        async with self._update_lock:
+            try:
+                await self._connect_if_need()
+                await self._run_start(mode, subprog, temp, boil_hours, boil_minutes,
+                                      delayed_start_hours, delayed_start_minutes, 1 if auto_warm else 0, running)
+            except Exception as ex:
+                self.rollback(f"Ошибка при запуске программы: {ex}")
+                raise
+            finally:
+                await self._disconnect_if_need()
+        # Селекты показывают параметры запущенной программы
+        self._target_mode = mode
+        self._target_subprogram = subprog
+        self._target_temperature = temp
+        self._target_boil_hours = boil_hours
+        self._target_boil_minutes = boil_minutes
+        self._auto_warm_enabled = bool(auto_warm)
+        self._auto_warm_changed = False
+
     async def set_target_temp(self, target_temp, operation_mode = None):
         if target_temp == self.target_temp: return
         _LOGGER.info(f"Setting target temperature to {target_temp}")
@@ -926,40 +1298,26 @@ class SkyCookerConnection(SkyCooker):
         if target_temp < 35:
             target_mode = None
         else:
-            # Find the mode that matches the target temperature
-            for mode_idx, mode_data in enumerate(MODE_DATA.get(model_type, [])):
-                if mode_data[0] == target_temp:
-                    # Проверяем, поддерживается ли режим устройством
-                    if self._is_mode_supported(mode_idx):
-                        target_mode = mode_idx
-                        # Set cooking time from MODE_DATA only if user hasn't set custom cooking time
-                        if (not hasattr(self, '_target_boil_hours') or self._target_boil_hours is None or
-                            not hasattr(self, '_target_boil_minutes') or self._target_boil_minutes is None):
-                            self._target_boil_hours = mode_data[1]
-                            self._target_boil_minutes = mode_data[2]
-                        break
-               
-            # If no exact match found, use the closest mode
-            if target_mode is None:
-                closest_diff = float('inf')
-                for mode_idx, mode_data in enumerate(MODE_DATA.get(model_type, [])):
-                    # Проверяем, поддерживается ли режим устройством
-                    if self._is_mode_supported(mode_idx):
-                        diff = abs(mode_data[0] - target_temp)
-                        if diff < closest_diff:
-                            closest_diff = diff
-                            target_mode = mode_idx
-                            # Set cooking time from MODE_DATA only if user hasn't set custom cooking time
-                            if (not hasattr(self, '_target_boil_hours') or self._target_boil_hours is None or
-                                not hasattr(self, '_target_boil_minutes') or self._target_boil_minutes is None):
-                                self._target_boil_hours = mode_data[1]
-                                self._target_boil_minutes = mode_data[2]
+            # Find the mode that matches the target temperature, otherwise the closest one
+            capabilities = self.capabilities
+            mode_idx = capabilities.mode_by_temp.get(target_temp) if capabilities else None
+            if mode_idx is None and target_mode is None and capabilities:
+                # Индекс содержит только режимы модели, проверка поддержки не нужна
+                mode_idx = nearest_mode(capabilities, target_temp)
+            if mode_idx is not None:
+                target_mode = mode_idx
+                mode_data = capabilities.modes[mode_idx]
+                # Set cooking time from MODE_DATA only if user hasn't set custom cooking time
+                if (not hasattr(self, '_target_boil_hours') or self._target_boil_hours is None or
+                    not hasattr(self, '_target_boil_minutes') or self._target_boil_minutes is None):
+                    self._target_boil_hours = mode_data[1]
+                    self._target_boil_minutes = mode_data[2]
          
         if target_mode != self.current_mode:
             _LOGGER.info(f"Mode autoswitched to {target_mode}")
         self._target_temperature = target_temp
         self._target_mode = target_mode
-        self._last_set_target = monotonic()
+        self._last_set_target = self.clock.monotonic()
 
     async def set_target_mode(self, operation_mode):
         if operation_mode == self._target_mode: return
@@ -971,9 +1329,8 @@ class SkyCookerConnection(SkyCooker):
             return
           
         # Get MODE_DATA values for the selected mode
-        model_type = self.model_code
-        if model_type and model_type in MODE_DATA and operation_mode < len(MODE_DATA[model_type]):
-            mode_data = MODE_DATA[model_type][operation_mode]
+        mode_data = self._mode_data(operation_mode)
+        if mode_data is not None:
             _LOGGER.info(f"Mode {operation_mode} data: temperature={mode_data[0]}, hours={mode_data[1]}, minutes={mode_data[2]}")
                
             # Set temperature from MODE_DATA only if user hasn't set custom temperature
@@ -1000,7 +1357,7 @@ class SkyCookerConnection(SkyCooker):
             # Set target mode and temperature directly
             self._target_mode = operation_mode
             self._target_temperature = target_temp
-            self._last_set_target = monotonic()
+            self._last_set_target = self.clock.monotonic()
                
             # Always update boil time to the default values from MODE_DATA
             self._target_boil_hours = target_boil_hours
@@ -1023,7 +1380,7 @@ class SkyCookerConnection(SkyCooker):
             # Set target mode and temperature directly
             self._target_mode = target_mode
             self._target_temperature = target_temp
-            self._last_set_target = monotonic()
+            self._last_set_target = self.clock.monotonic()
 
 
 class AuthError(Exception):
@@ -1,5 +1,6 @@
 """SkyCooker switches."""
 import logging
+from collections import namedtuple
 
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.const import CONF_FRIENDLY_NAME
@@ -10,6 +11,13 @@ from .const import *
 _LOGGER = logging.getLogger(__name__)
 
 
+SwitchDescription = namedtuple("SwitchDescription", ["name", "icon", "value"])
+
+SWITCH_DESCRIPTIONS = {
+    # Используем только значение, установленное пользователем
+    SWITCH_TYPE_AUTO_WARM: SwitchDescription(
+        "auto warm", "mdi:heat-wave", lambda skycooker: getattr(skycooker, '_auto_warm_enabled', False)),
+}
 
 
 async def async_setup_entry(hass, entry, async_add_entities):
@@ -22,11 +30,22 @@ async def async_setup_entry(hass, entry, async_add_entities):
 class SkyCookerSwitch(SwitchEntity):
     """Representation of a SkyCooker switch."""
 
+    _attr_should_poll = False
+    _attr_assumed_state = False
+
     def __init__(self, hass, entry, switch_type):
         """Initialize the switch."""
         self.hass = hass
         self.entry = entry
         self.switch_type = switch_type
+        # Метаданные не меняются, вычисляем их один раз
+        description = self._description = SWITCH_DESCRIPTIONS[switch_type]
+        model_name = entry.data.get(CONF_FRIENDLY_NAME, "")
+        base_name = (SKYCOOKER_NAME + " " + model_name).strip()
+        self._attr_unique_id = entity_object_id(switch_type, model_name, entry.entry_id)
+        self.entity_id = self._attr_unique_id
+        self._attr_name = f"{base_name} {description.name}"
+        self._attr_icon = description.icon
 
     async def async_added_to_hass(self):
         """When entity is added to hass."""
@@ -35,6 +54,9 @@ class SkyCookerSwitch(SwitchEntity):
 
     def update(self):
         """Update the switch."""
+        updates = self.hass.data[DOMAIN].get(self.entry.entry_id, {}).get(DATA_ENTITY_UPDATES)
+        if updates is not None:
+            updates[self.unique_id] += 1
         self.schedule_update_ha_state()
 
     @property
@@ -42,57 +64,11 @@ class SkyCookerSwitch(SwitchEntity):
         """Get the skycooker connection."""
         return self.hass.data[DOMAIN][self.entry.entry_id][DATA_CONNECTION]
 
-    @property
-    def unique_id(self):
-        """Return a unique ID."""
-        model_name = self.entry.data.get(CONF_FRIENDLY_NAME, "")
-        sanitized_model_name = sanitize_model_name(model_name)
-        sanitized_entry_id = sanitize_entry_id(self.entry.entry_id)
-        if self.switch_type == SWITCH_TYPE_AUTO_WARM:
-            return f"skycooker_auto_warm_{sanitized_model_name}_{sanitized_entry_id}"
-        return f"skycooker_{self.switch_type}_{sanitized_model_name}_{sanitized_entry_id}"
-
-    @property
-    def entity_id(self):
-        """Return the entity ID."""
-        model_name = self.entry.data.get(CONF_FRIENDLY_NAME, "")
-        sanitized_model_name = sanitize_model_name(model_name)
-        sanitized_entry_id = sanitize_entry_id(self.entry.entry_id)
-        if self.switch_type == SWITCH_TYPE_AUTO_WARM:
-            return f"skycooker_auto_warm_{sanitized_model_name}_{sanitized_entry_id}"
-        return f"skycooker_{self.switch_type}_{sanitized_model_name}_{sanitized_entry_id}"
-
     @property
     def device_info(self):
         """Return device info."""
         return self.hass.data[DOMAIN][DATA_DEVICE_INFO]()
 
-    @property
-    def should_poll(self):
-        """No polling needed."""
-        return False
-
-    @property
-    def assumed_state(self):
-        """Return true if unable to access real state of the entity."""
-        return False
-
-    @property
-    def name(self):
-        """Return the name of the switch."""
-        base_name = (SKYCOOKER_NAME + " " + self.entry.data.get(CONF_FRIENDLY_NAME, "")).strip()
-        if self.switch_type == SWITCH_TYPE_AUTO_WARM:
-            return f"{base_name} auto warm"
-         
-        return base_name
-
-    @property
-    def icon(self):
-        """Return the icon."""
-        if self.switch_type == SWITCH_TYPE_AUTO_WARM:
-            return "mdi:heat-wave"
-        return None
-
     @property
     def available(self):
         """Return if switch is available."""
@@ -101,16 +77,16 @@ class SkyCookerSwitch(SwitchEntity):
     @property
     def is_on(self):
         """Return true if switch is on."""
-        if self.switch_type == SWITCH_TYPE_AUTO_WARM:
-            # Используем только значение, установленное пользователем
-            return getattr(self.skycooker, '_auto_warm_enabled', False)
-        return False
+        return self._description.value(self.skycooker)
 
     async def async_turn_on(self, **kwargs):
         """Turn the switch on."""
         if self.switch_type == SWITCH_TYPE_AUTO_WARM:
             # Устанавливаем флаг автоподогрева без отправки команд на устройство
             self.skycooker._auto_warm_enabled = True
+            self.skycooker._auto_warm_changed = True
+            # Во время готовки флаг уходит на устройство вместе с остальными настройками
+            self.skycooker.schedule_apply()
             self.update()
 
     async def async_turn_off(self, **kwargs):
@@ -118,4 +94,6 @@ class SkyCookerSwitch(SwitchEntity):
         if self.switch_type == SWITCH_TYPE_AUTO_WARM:
             # Сбрасываем флаг автоподогрева без отправки команд на устройство
             self.skycooker._auto_warm_enabled = False
+            self.skycooker._auto_warm_changed = True
+            self.skycooker.schedule_apply()
             self.update()
\ No newline at end of file
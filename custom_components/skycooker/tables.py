@@ -0,0 +1,328 @@
+"""Mode and product tables of every model.
+
+Loaded on first use: the capability registry and the entities read them
+once a cooker is configured, importing the integration does not.
+"""
+from .const import *
+
+# Mode data for each model
+MODE_DATA = {
+    MODEL_0: [
+        [0, 0, 0, 0],
+        [100, 0, 30, 15], [100, 0, 35, 7], [97, 3, 0, 7], [110, 1, 0, 7],
+        [180, 0, 15, 133], [100, 1, 0, 135], [100, 0, 8, 5], [95, 0, 35, 7],
+        [99, 1, 0, 7], [40, 8, 0, 6], [145, 0, 45, 7], [100, 0, 40, 135],
+        [100, 0, 40, 7]
+    ],
+    MODEL_1: [
+        [0, 0, 0, 0],
+        [100, 0, 30, 15], [100, 0, 30, 7], [100, 1, 0, 135], [100, 1, 30, 7],
+        [100, 0, 35, 135], [100, 0, 40, 135], [100, 0, 50, 135], [97, 3, 0, 7],
+        [170, 0, 18, 133], [145, 1, 0, 7], [150, 0, 30, 7], [110, 0, 35, 7],
+        [38, 8, 0, 6], [150, 3, 0, 7], [100, 0, 8, 4], [98, 0, 15, 7],
+        [40, 0, 10, 7], [63, 2, 30, 6], [160, 0, 18, 132], [98, 0, 20, 7],
+        [100, 0, 20, 64]
+    ],
+    MODEL_2: [
+        [0, 0, 0, 0],
+        [100, 3, 0, 135], [170, 0, 18, 133], [100, 0, 8, 4], [145, 1, 0, 7],
+        [100, 1, 0, 135], [38, 8, 0, 6], [100, 0, 30, 15], [40, 0, 10, 7],
+        [110, 0, 35, 7], [100, 0, 40, 135], [140, 1, 0, 7], [98, 0, 20, 7],
+        [150, 3, 0, 7], [100, 0, 20, 135], [100, 0, 15, 7], [98, 0, 30, 7],
+        [97, 3, 0, 7], [100, 0, 30, 4], [160, 0, 16, 132], [100, 0, 40, 135],
+        [100, 0, 30, 64], [70, 0, 0, 64]
+    ],
+    MODEL_3: [
+        [100, 0, 30, 15], [101, 0, 30, 7], [100, 1, 0, 7], [165, 0, 18, 5],
+        [100, 1, 0, 7], [100, 0, 35, 7], [100, 0, 8, 4], [98, 3, 0, 7],
+        [100, 0, 40, 7], [140, 1, 0, 7], [100, 0, 25, 7], [110, 1, 0, 7],
+        [40, 8, 0, 6], [145, 0, 20, 7], [140, 3, 0, 7],
+        [0, 0, 0, 0], [62, 2, 30, 6]
+    ],
+    MODEL_4: [
+        [0, 0, 0, 0],
+        [100, 0, 10, 7], [150, 0, 15, 5], [100, 0, 25, 7], [140, 1, 0, 7],
+        [100, 1, 0, 7], [100, 0, 30, 15], [110, 1, 0, 7], [100, 1, 0, 7],
+        [100, 0, 30, 7], [38, 8, 0, 6], [100, 0, 0, 64]
+    ],
+    MODEL_5: [
+        [0, 0, 0, 0],
+        [100, 0, 30, 15], [97, 0, 10, 7], [100, 1, 0, 7], [170, 0, 15, 5],
+        [99, 1, 0, 7], [100, 0, 20, 7], [100, 0, 8, 4], [97, 5, 0, 7],
+        [100, 0, 40, 7], [145, 1, 0, 7], [100, 0, 35, 7], [110, 1, 0, 7],
+        [38, 8, 0, 6], [150, 0, 25, 7], [150, 3, 0, 7], [98, 0, 20, 7],
+        [100, 0, 20, 64]
+    ],
+    MODEL_6: [
+        [0, 0, 0, 0],
+        [100, 0, 30, 15], [97, 0, 10, 7], [100, 1, 0, 7], [170, 0, 15, 5],
+        [99, 1, 0, 7], [100, 0, 20, 7], [100, 0, 8, 4], [97, 5, 0, 7],
+        [100, 0, 40, 7], [145, 1, 0, 7], [100, 0, 35, 7], [110, 1, 0, 7],
+        [38, 8, 0, 6], [150, 0, 25, 7], [150, 3, 0, 7], [98, 0, 20, 7],
+        [100, 0, 0, 64], [100, 70, 30, 64]
+    ],
+    MODEL_7: [
+        [0, 0, 0, 0],
+        [150, 0, 15, 5], [100, 0, 25, 7], [100, 0, 30, 15], [110, 1, 0, 7],
+        [100, 0, 25, 7], [140, 1, 0, 7], [100, 1, 0, 7], [100, 1, 0, 7],
+        [100, 0, 30, 7], [40, 8, 0, 6], [100, 0, 20, 64], [70, 0, 30, 64]
+    ],
+}
+
+# Constants for mode names
+MODE_STANDBY = [
+    "Standby Mode",
+    "Режим ожидания",
+]
+
+MODE_MULTI_CHEF = [
+    "Multi-chef",
+    "Мультиповар",
+]
+
+MODE_RICE_CEREALS = [
+    "Rice/Cereals",
+    "Рис/Крупы",
+]
+
+MODE_LANGUOR = [
+    "Languor",
+    "Томление",
+]
+
+MODE_PILAF = [
+    "Pilaf",
+    "Плов",
+]
+
+MODE_FRYING = [
+    "Frying",
+    "Жарка",
+]
+
+MODE_STEWING = [
+    "Stewing",
+    "Тушение",
+]
+
+MODE_PASTA = [
+    "Pasta",
+    "Паста/Макароны",
+]
+
+MODE_MILK_PORRIDGE = [
+    "Milk porridge",
+    "Молочная каша",
+]
+
+MODE_SOUP = [
+    "Soup",
+    "Суп",
+]
+
+MODE_YOGURT = [
+    "Yogurt",
+    "Йогурт",
+]
+
+MODE_BAKING = [
+    "Baking",
+    "Выпечка",
+]
+
+MODE_STEAM = [
+    "Steam",
+    "На пару",
+]
+
+MODE_COOKING_LEGUMES = [
+    "Cooking/Legumes",
+    "Варка/Бобовые",
+]
+
+MODE_WILDFOWL = [
+    "Wildfowl",
+    "Дичь",
+]
+
+MODE_PIZZA = [
+    "Pizza",
+    "Пицца",
+]
+
+MODE_BREAD = [
+    "Bread",
+    "Хлеб",
+]
+
+MODE_BABY_FOOD = [
+    "Baby food",
+    "Детское питание",
+]
+
+MODE_SOUS_VIDE = [
+    "Sous-vide",
+    "Вакуум",
+]
+
+MODE_DEEP_FRYING = [
+    "Deep frying",
+    "Фритюр",
+]
+
+MODE_DESSERTS = [
+    "Desserts",
+    "Десерты",
+]
+
+MODE_EXPRESS = [
+    "Express",
+    "Экспресс",
+]
+
+MODE_GALANTINE = [
+    "Galantine",
+    "Холодец",
+]
+
+MODE_YOGURT_DOUGH = [
+    "Yogurt/Dough",
+    "Йогурт/Тесто",
+]
+
+MODE_CHEESECAKE = [
+    "Cheesecake",
+    "Запеканка/Чизкейк",
+]
+
+MODE_SOUS = [
+    "Sous",
+    "Соус",
+]
+
+MODE_WARMING_UP = [
+    "Warming up",
+    "Разогрев",
+]
+
+MODE_WARMING = [
+    "Warming",
+    "Подогрев",
+]
+
+MODE_COOKING = [
+    "Cooking",
+    "Варка",
+]
+
+MODE_NONE = [
+    "None",
+    "Нет"
+]
+
+# Mode names for each model
+MODE_NAMES = {
+    MODEL_0: [
+        MODE_STANDBY,
+        MODE_MULTI_CHEF, MODE_RICE_CEREALS, MODE_LANGUOR, MODE_PILAF,
+        MODE_FRYING, MODE_STEWING, MODE_PASTA, MODE_MILK_PORRIDGE,
+        MODE_SOUP, MODE_YOGURT, MODE_BAKING, MODE_STEAM,
+        MODE_COOKING_LEGUMES
+    ],
+    MODEL_1: [
+        MODE_STANDBY,
+        MODE_MULTI_CHEF, MODE_RICE_CEREALS, MODE_SOUP, MODE_WILDFOWL,
+        MODE_STEAM, MODE_COOKING, MODE_STEWING, MODE_LANGUOR,
+        MODE_FRYING, MODE_BAKING, MODE_PIZZA, MODE_PILAF,
+        MODE_YOGURT, MODE_BREAD, MODE_PASTA, MODE_MILK_PORRIDGE,
+        MODE_BABY_FOOD, MODE_SOUS_VIDE, MODE_DEEP_FRYING, MODE_DESSERTS,
+        MODE_EXPRESS
+    ],
+    MODEL_2: [
+        MODE_STANDBY,
+        MODE_GALANTINE, MODE_FRYING, MODE_PASTA, MODE_BAKING,
+        MODE_STEWING, MODE_YOGURT_DOUGH, MODE_MULTI_CHEF, MODE_BABY_FOOD,
+        MODE_PILAF, MODE_SOUP, MODE_CHEESECAKE, MODE_MILK_PORRIDGE,
+        MODE_BREAD, MODE_STEAM, MODE_RICE_CEREALS, MODE_DESSERTS,
+        MODE_LANGUOR, MODE_SOUS, MODE_DEEP_FRYING, MODE_COOKING,
+        MODE_EXPRESS, MODE_WARMING_UP
+    ],
+    MODEL_3: [
+        MODE_MULTI_CHEF, MODE_MILK_PORRIDGE, MODE_STEWING, MODE_FRYING,
+        MODE_SOUP, MODE_STEAM, MODE_PASTA, MODE_LANGUOR,
+        MODE_COOKING, MODE_BAKING, MODE_RICE_CEREALS, MODE_PILAF,
+        MODE_YOGURT, MODE_PIZZA, MODE_BREAD, MODE_NONE,
+        MODE_SOUS_VIDE, MODE_STANDBY
+    ],
+    MODEL_4: [
+        MODE_STANDBY,
+        MODE_RICE_CEREALS, MODE_FRYING, MODE_STEAM, MODE_BAKING,
+        MODE_STEWING, MODE_MULTI_CHEF, MODE_PILAF, MODE_SOUP,
+        MODE_MILK_PORRIDGE, MODE_YOGURT, MODE_EXPRESS
+    ],
+    MODEL_5: [
+        MODE_STANDBY,
+        MODE_MULTI_CHEF, MODE_MILK_PORRIDGE, MODE_STEWING, MODE_FRYING,
+        MODE_SOUP, MODE_STEAM, MODE_PASTA, MODE_LANGUOR,
+        MODE_COOKING, MODE_BAKING, MODE_RICE_CEREALS, MODE_PILAF,
+        MODE_YOGURT, MODE_PIZZA, MODE_BREAD, MODE_DESSERTS,
+        MODE_EXPRESS
+    ],
+    MODEL_6: [
+        MODE_STANDBY,
+        MODE_MULTI_CHEF, MODE_MILK_PORRIDGE, MODE_STEWING, MODE_FRYING,
+        MODE_SOUP, MODE_STEAM, MODE_PASTA, MODE_LANGUOR,
+        MODE_COOKING, MODE_BAKING, MODE_RICE_CEREALS, MODE_PILAF,
+        MODE_YOGURT, MODE_PIZZA, MODE_BREAD, MODE_DESSERTS,
+        MODE_EXPRESS, MODE_WARMING
+    ],
+    MODEL_7: [
+        MODE_STANDBY,
+        MODE_FRYING, MODE_RICE_CEREALS, MODE_MULTI_CHEF, MODE_PILAF,
+        MODE_STEAM, MODE_BAKING, MODE_STEWING, MODE_SOUP,
+        MODE_MILK_PORRIDGE, MODE_YOGURT, MODE_EXPRESS, MODE_WARMING_UP
+    ],
+}
+
+# Product data for each model
+PRODUCT_DATA = {
+    MODEL_0: [
+        [4, 18, 12, 15, 0], [5, 40, 35, 60, 0], [11, 30, 25, 40, 0]
+    ],
+    MODEL_1: [
+        [2, 60, 50, 40, 30], [4, 35, 30, 25, 20], [5, 40, 30, 20, 18], [6, 50, 40, 20, 18],
+        [8, 18, 15, 12, 16], [18, 18, 16, 15, 13]
+    ],
+    MODEL_2: [
+        [2, 60, 50, 40, 30], [4, 35, 30, 25, 20], [5, 40, 30, 20, 18], [6, 50, 40, 20, 18],
+        [8, 18, 15, 12, 16], [18, 18, 16, 15, 13]
+    ],
+}
+
+# Product names for each model
+PRODUCT_NAMES = {
+    MODEL_0: [
+        [
+            "No choice", "Vegetables", "Fish", "Meat", "Bird"
+        ],
+        [
+            "Нет выбора", "Овощи", "Рыба", "Мясо", "Птица"
+        ],
+    ],
+    MODEL_1: [
+        [
+            "No choice", "Vegetables", "Fish", "Meat", "Bird", "Desserts"
+        ],
+        [
+            "Нет выбора", "Овощи", "Рыба", "Мясо", "Птица", "Десерты"
+        ],
+    ],
+    MODEL_2: [
+        [
+            "No choice", "Vegetables", "Fish", "Meat", "Bird", "Desserts"
+        ],
+        [
+            "Нет выбора", "Овощи", "Рыба", "Мясо", "Птица", "Десерты"
+        ],
+    ],
+}
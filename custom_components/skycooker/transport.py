@@ -0,0 +1,155 @@
+"""Frame transports for the standalone SkyCooker client.
+
+A transport moves raw protocol frames between the client and a cooker. It
+knows nothing about HomeAssistant: BleakTransport talks to a real cooker
+through bleak, FakeCooker answers from memory and is used by the CLI
+benchmark and in tests.
+"""
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from struct import pack
+
+from .codec import decode_frame, encode_frame
+from .const import *
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class Transport(ABC):
+    """Connection to a cooker that writes frames and reports received ones."""
+
+    @property
+    @abstractmethod
+    def is_connected(self):
+        pass
+
+    @abstractmethod
+    async def connect(self, on_frame):
+        """Connect and call on_frame(data) for every received frame."""
+
+    @abstractmethod
+    async def write(self, data):
+        pass
+
+    @abstractmethod
+    async def disconnect(self):
+        pass
+
+
+class BleakTransport(Transport):
+    """Nordic UART transport over bleak, without the HomeAssistant bluetooth stack."""
+
+    def __init__(self, address, adapter=None, timeout=10.0):
+        self.address = address
+        self.adapter = adapter
+        self.timeout = timeout
+        self._client = None
+
+    @property
+    def is_connected(self):
+        return self._client is not None and self._client.is_connected
+
+    async def connect(self, on_frame):
+        # bleak нужен только для реального устройства
+        from bleak import BleakClient
+
+        kwargs = {"adapter": self.adapter} if self.adapter else {}
+        self._client = BleakClient(self.address, timeout=self.timeout, **kwargs)
+        await self._client.connect()
+        await self._client.start_notify(UUID_RX, lambda sender, data: on_frame(bytes(data)))
+        _LOGGER.debug("✅ Подключено к %s", self.address)
+
+    async def write(self, data):
+        await self._client.write_gatt_char(UUID_TX, data)
+
+    async def disconnect(self):
+        client, self._client = self._client, None
+        if client is not None and client.is_connected:
+            await client.disconnect()
+
+
+class FakeCooker(Transport):
+    """In-memory cooker answering protocol frames like the real device.
+
+    Keeps the program set by SELECT_MODE/SET_MAIN_MODE and the on/off
+    state, replies after `latency` seconds and rejects keys other than
+    `key`.
+    """
+
+    def __init__(self, key=None, version=(1, 8), latency=0.0):
+        self.key = bytes(key) if key is not None else None
+        self.version = version
+        self.latency = latency
+        self.frames = 0
+        self.state = dict(mode=0, subprog=0, target_temp=0, target_boil_hours=0, target_boil_minutes=0,
+                          target_delayed_start_hours=0, target_delayed_start_minutes=0, auto_warm=0)
+        self.status = STATUS_OFF
+        self._on_frame = None
+        # Ответы, еще не доставленные к моменту отключения, отменяются
+        self._timers = set()
+
+    @property
+    def is_connected(self):
+        return self._on_frame is not None
+
+    async def connect(self, on_frame):
+        self._on_frame = on_frame
+
+    async def disconnect(self):
+        self._on_frame = None
+        for timer in self._timers:
+            timer.cancel()
+        self._timers.clear()
+
+    async def write(self, data):
+        if self._on_frame is None:
+            raise IOError("Не подключено")
+        self.frames += 1
+        seq, command, payload = decode_frame(data)
+        reply = encode_frame(seq, command, self.handle(command, payload))
+        loop = asyncio.get_running_loop()
+
+        def deliver():
+            self._timers.discard(timer)
+            self._deliver(reply)
+
+        timer = loop.call_later(self.latency, deliver) if self.latency else loop.call_soon(deliver)
+        self._timers.add(timer)
+
+    def _deliver(self, reply):
+        if self._on_frame is not None:
+            self._on_frame(reply)
+
+    def status_payload(self):
+        s = self.state
+        return bytes([s["mode"], s["subprog"], s["target_temp"], s["target_boil_hours"],
+                      s["target_boil_minutes"], s["target_delayed_start_hours"],
+                      s["target_delayed_start_minutes"], s["auto_warm"], self.status, 0, 0, 0, 0, 0, 0, 0])
+
+    def handle(self, command, payload):
+        """Return the reply payload of a command."""
+        if command == COMMAND_AUTH:
+            return bytes([1 if self.key is None or payload == self.key else 0])
+        if command == COMMAND_GET_VERSION:
+            return bytes(self.version)
+        if command == COMMAND_GET_STATUS:
+            return self.status_payload()
+        if command == COMMAND_SELECT_MODE:
+            self.state.update(zip(SELECT_MODE_FIELDS, payload))
+            return bytes([1])
+        if command == COMMAND_SET_MAIN_MODE:
+            self.state.update(zip(MAIN_MODE_FIELDS[:-1], payload))
+            return bytes([1])
+        if command == COMMAND_TURN_ON:
+            delayed = self.state["target_delayed_start_hours"] or self.state["target_delayed_start_minutes"]
+            self.status = STATUS_DELAYED_LAUNCH if delayed else STATUS_COOKING
+            return bytes([1])
+        if command == COMMAND_TURN_OFF:
+            self.status = STATUS_OFF
+            return bytes([1])
+        if command == COMMAND_SYNC_TIME:
+            return bytes([0])
+        if command == COMMAND_GET_TIME:
+            return pack("<ii", 0, 0)
+        return bytes([0])
@@ -0,0 +1,468 @@
+"""Shared fixtures: virtual-time event loop, a scripted fake GATT client and the many-device harness."""
+
+import asyncio
+import importlib
+import tracemalloc
+from collections import defaultdict, deque, namedtuple
+from contextlib import ExitStack
+from datetime import datetime, timedelta
+from time import perf_counter, process_time
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+from homeassistant.const import (CONF_DEVICE, CONF_FRIENDLY_NAME, CONF_MAC,
+                                 CONF_PASSWORD, CONF_SCAN_INTERVAL)
+from custom_components.skycooker import PLATFORMS, async_setup_entry
+from custom_components.skycooker.clock import Clock
+from custom_components.skycooker.codec import decode_frame, encode_frame
+from custom_components.skycooker.skycooker_connection import SkyCookerConnection
+from custom_components.skycooker.const import *
+from custom_components.skycooker.transport import FakeCooker
+
+
+class VirtualTimeLoop(asyncio.SelectorEventLoop):
+    """Event loop whose clock jumps to the next timer instead of waiting for it."""
+
+    def __init__(self):
+        super().__init__()
+        self._virtual_time = 0.0
+
+    def time(self):
+        return self._virtual_time
+
+    def _run_once(self):
+        if not self._ready:
+            timers = [handle.when() for handle in self._scheduled if not handle.cancelled()]
+            if timers:
+                self._virtual_time = max(self._virtual_time, min(timers))
+        super()._run_once()
+
+
+class VirtualClock(Clock):
+    """Connection clock reading the virtual time of the loop."""
+
+    def __init__(self, loop):
+        self.loop = loop
+
+    def monotonic(self):
+        return self.loop.time()
+
+
+class FakeGattClient:
+    """GATT client answering like a cooker, with scripted deviations.
+
+    Replies come from a FakeCooker after `latency` seconds of virtual time.
+    `script` maps a command to a queue of replies used first: bytes is the
+    reply payload, (command, payload) replies with another command and None
+    drops the request.
+    """
+
+    def __init__(self, loop, cooker=None, latency=0.05, script=None, connect_failures=0):
+        self.loop = loop
+        self.cooker = cooker or FakeCooker()
+        self.latency = latency
+        self.script = {command: deque(replies) for command, replies in (script or {}).items()}
+        self.connect_failures = connect_failures
+        self.connects = 0
+        self.is_connected = False
+        self.writes = []
+        self._callback = None
+
+    async def start_notify(self, uuid, callback):
+        self._callback = callback
+
+    async def write_gatt_char(self, uuid, data):
+        seq, command, payload = decode_frame(data)
+        self.writes.append((self.loop.time(), command))
+        replies = self.script.get(command)
+        reply = replies.popleft() if replies else self.cooker.handle(command, payload)
+        if reply is None:
+            return
+        reply_command, reply = reply if isinstance(reply, tuple) else (command, reply)
+        self.loop.call_later(self.latency, self._notify, encode_frame(seq, reply_command, reply))
+
+    def _notify(self, frame):
+        if self.is_connected and self._callback is not None:
+            self._callback(None, bytearray(frame))
+
+    async def disconnect(self):
+        self.is_connected = False
+
+    def commands(self):
+        return [command for _, command in self.writes]
+
+
+class VirtualTime:
+    """Runs coroutines on a virtual-time loop and builds connections wired to fake clients."""
+
+    def __init__(self):
+        self.loop = VirtualTimeLoop()
+        self.clock = VirtualClock(self.loop)
+        self._patches = []
+
+    def run(self, coro):
+        return self.loop.run_until_complete(coro)
+
+    def client(self, **kwargs):
+        return FakeGattClient(self.loop, **kwargs)
+
+    def connection(self, client, model="RMC-M40S", **kwargs):
+        """Create a connection whose BLE connect returns the fake client."""
+        async def establish_connection(*args, **kw):
+            client.connects += 1
+            if client.connect_failures:
+                client.connect_failures -= 1
+                raise IOError("Устройство не отвечает")
+            client.is_connected = True
+            return client
+
+        device = MagicMock()
+        device.name = model
+        for target, value in (("establish_connection", establish_connection),
+                              ("bluetooth.async_ble_device_from_address", MagicMock(return_value=device))):
+            patcher = patch(f"custom_components.skycooker.skycooker_connection.{target}", value)
+            patcher.start()
+            self._patches.append(patcher)
+        return SkyCookerConnection("AA:BB:CC:DD:EE:FF", [0x00] * 8, model=model, clock=self.clock, **kwargs)
+
+    def close(self):
+        for patcher in reversed(self._patches):
+            patcher.stop()
+        self.loop.close()
+
+
+@pytest.fixture
+def virtual_time():
+    """Deterministic virtual-time event loop, see VirtualTime."""
+    virtual = VirtualTime()
+    yield virtual
+    virtual.close()
+
+
+class MeasuredLoop(VirtualTimeLoop):
+    """Virtual-time loop recording the wall time of every iteration.
+
+    Virtual time never waits, so the wall time of an iteration is the time
+    its callbacks blocked the loop, i.e. the lag they add to everything else.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.iterations = []
+
+    def _run_once(self):
+        started = perf_counter()
+        super()._run_once()
+        self.iterations.append(perf_counter() - started)
+
+
+class SimulatedClient(FakeGattClient):
+    """Fake GATT client holding a connection slot of its adapter while connected."""
+
+    def __init__(self, adapter, **kwargs):
+        super().__init__(adapter.loop, **kwargs)
+        self.adapter = adapter
+
+    async def disconnect(self):
+        self.is_connected = False
+        self.adapter.connected.discard(self)
+
+
+class SimulatedAdapter:
+    """Bluetooth adapter with a limited number of connection slots.
+
+    Stands in for bluetooth.async_ble_device_from_address and
+    establish_connection: a connection takes connect_time and fails with
+    "out of connection slots" while all slots are busy, like a local
+    adapter or a proxy does.
+    """
+
+    def __init__(self, loop, slots=3, connect_time=0.3, latency=0.05):
+        self.loop = loop
+        self.slots = slots
+        self.connect_time = connect_time
+        self.latency = latency
+        self.devices = {}
+        self.clients = {}
+        self.connected = set()
+        self.peak = 0
+        self.rejected = 0
+
+    def add_device(self, mac, model):
+        self.devices[mac] = SimpleNamespace(address=mac, name=model)
+        client = self.clients[mac] = SimulatedClient(self, latency=self.latency)
+        return client
+
+    def ble_device_from_address(self, hass, mac, connectable=True):
+        return self.devices.get(mac)
+
+    async def establish_connection(self, client_class, device, name, max_attempts=5, retry_interval=1.0, **kwargs):
+        client = self.clients[device.address]
+        for attempt in range(max_attempts):
+            await asyncio.sleep(self.connect_time)
+            if len(self.connected) < self.slots:
+                self.connected.add(client)
+                self.peak = max(self.peak, len(self.connected))
+                client.is_connected = True
+                return client
+            self.rejected += 1
+            if attempt + 1 < max_attempts:
+                await asyncio.sleep(retry_interval)
+        raise IOError(f"{name}: out of connection slots")
+
+
+class SimulatedDispatcher:
+    """Dispatcher with HomeAssistant semantics: every target of a signal is called on the loop.
+
+    HomeAssistant hands targets that are not callbacks (entity update()) to
+    the executor; here they run on the loop, so the measured lag is an
+    upper bound.
+    """
+
+    def __init__(self, loop):
+        self.loop = loop
+        self.targets = defaultdict(list)
+        self.sends = 0
+        self.calls = 0
+
+    def connect(self, hass, signal, target):
+        self.targets[signal].append(target)
+        return lambda: self.targets[signal].remove(target)
+
+    def async_send(self, hass, signal, *args):
+        self.sends += 1
+        for target in list(self.targets.get(signal, ())):
+            self.calls += 1
+            target(*args)
+
+    def send(self, hass, signal, *args):
+        self.loop.call_soon_threadsafe(self.async_send, hass, signal, *args)
+
+
+class SimulatedHass:
+    """The part of HomeAssistant the integration uses, running on the harness loop."""
+
+    def __init__(self, harness):
+        self.harness = harness
+        self.loop = harness.loop
+        self.data = {DOMAIN: {}}
+        self.config = SimpleNamespace(language="en")
+        self.config_entries = SimpleNamespace(async_forward_entry_setups=harness.forward_entry_setups)
+
+    def async_create_task(self, coro):
+        return self.loop.create_task(coro)
+
+    async def async_add_executor_job(self, func, *args):
+        return func(*args)
+
+
+class SimulatedEntry:
+    """Config entry of a simulated cooker."""
+
+    def __init__(self, entry_id, data):
+        self.entry_id = entry_id
+        self.data = data
+        self.on_unload = []
+
+    def async_on_unload(self, func):
+        self.on_unload.append(func)
+
+    def add_update_listener(self, listener):
+        return lambda: None
+
+
+ScaleReport = namedtuple("ScaleReport", [
+    "devices", "entities", "duration", "polls", "state_writes", "writes_per_second", "writes_per_poll",
+    "loop_lag_max", "loop_lag_p95", "cpu_seconds", "cpu_per_poll", "memory_per_device",
+    "freshness_max", "freshness_p95", "connect_rejects", "slots_peak",
+])
+
+# Свойства, которые HomeAssistant читает при записи состояния
+STATE_PROPERTIES = ("available", "native_value", "current_option", "options", "is_on",
+                    "extra_state_attributes", "name", "icon")
+
+
+class ScaleHarness:
+    """N config entries backed by simulated cookers behind one simulated adapter.
+
+    Sets the entries up through the integration's async_setup_entry, so the
+    real polling, dispatcher fan-out and entity update paths run on a
+    virtual-time loop, and measures them for a period of virtual time.
+    """
+
+    def __init__(self, devices=10, slots=3, scan_interval=DEFAULT_SCAN_INTERVAL, persistent=False,
+                 model="RMC-M40S", latency=0.05, sample_interval=1.0):
+        self.loop = MeasuredLoop()
+        self.clock = VirtualClock(self.loop)
+        self.adapter = SimulatedAdapter(self.loop, slots=slots, latency=latency)
+        self.dispatcher = SimulatedDispatcher(self.loop)
+        self.hass = SimulatedHass(self)
+        self.sample_interval = sample_interval
+        self.entities = []
+        self.state_writes = 0
+        self.entries = [SimulatedEntry(f"entry_{i}", {
+            CONF_MAC: f"AA:BB:CC:00:{i // 256:02X}:{i % 256:02X}",
+            CONF_PASSWORD: [0x00] * 8,
+            CONF_FRIENDLY_NAME: model,
+            CONF_SCAN_INTERVAL: scan_interval,
+            CONF_PERSISTENT_CONNECTION: persistent,
+            CONF_DEVICE: None,
+        }) for i in range(devices)]
+        for entry in self.entries:
+            self.adapter.add_device(entry.data[CONF_MAC], model)
+        self._timers = set()
+        self._patches = ExitStack()
+        connection = "custom_components.skycooker.skycooker_connection"
+        for target, value in (
+                (f"{connection}.SYSTEM_CLOCK", self.clock),
+                (f"{connection}.establish_connection", self.adapter.establish_connection),
+                (f"{connection}.bluetooth.async_ble_device_from_address", self.adapter.ble_device_from_address),
+                (f"{connection}.async_dispatcher_send", self.dispatcher.async_send),
+                ("custom_components.skycooker.ev.async_call_later", self.call_later),
+                ("custom_components.skycooker.dispatcher_send", self.dispatcher.send),
+                ("custom_components.skycooker.async_dispatcher_send", self.dispatcher.async_send),
+                ("custom_components.skycooker.select.async_dispatcher_send", self.dispatcher.async_send),
+                ("custom_components.skycooker.services.async_dispatcher_send", self.dispatcher.async_send),
+                *((f"custom_components.skycooker.{platform.value}.async_dispatcher_connect", self.dispatcher.connect)
+                  for platform in PLATFORMS)):
+            self._patches.enter_context(patch(target, value))
+
+    def call_later(self, hass, delay, action):
+        """ev.async_call_later on the harness loop."""
+        if isinstance(delay, timedelta):
+            delay = delay.total_seconds()
+
+        def run():
+            self._timers.discard(handle)
+            result = action(datetime.now())
+            if asyncio.iscoroutine(result):
+                self.loop.create_task(result)
+
+        handle = self.loop.call_later(delay, run)
+        self._timers.add(handle)
+        return handle.cancel
+
+    async def forward_entry_setups(self, entry, platforms):
+        for platform in platforms:
+            module = importlib.import_module(f"custom_components.skycooker.{platform.value}")
+            added = []
+            await module.async_setup_entry(self.hass, entry, added.extend)
+            for entity in added:
+                entity.schedule_update_ha_state = lambda force_refresh=False, entity=entity: \
+                    self.loop.call_soon(self.write_state, entity)
+                self.entities.append(entity)
+                await entity.async_added_to_hass()
+
+    def write_state(self, entity):
+        """Render the entity state the way async_write_ha_state reads it."""
+        self.state_writes += 1
+        for name in STATE_PROPERTIES:
+            getattr(entity, name, None)
+
+    def connection(self, entry):
+        return self.hass.data[DOMAIN][entry.entry_id][DATA_CONNECTION]
+
+    def client(self, entry):
+        return self.adapter.clients[entry.data[CONF_MAC]]
+
+    async def setup(self):
+        """Set up all entries, their first poll is scheduled 3 seconds later."""
+        for entry in self.entries:
+            assert await async_setup_entry(self.hass, entry)
+
+    def advance(self, seconds):
+        """Let the entries run for seconds of virtual time."""
+        self.loop.run_until_complete(asyncio.sleep(seconds))
+
+    def run(self, duration):
+        """Set up all entries, run them for duration seconds of virtual time and return a ScaleReport."""
+        return self.loop.run_until_complete(self._run(duration))
+
+    async def _run(self, duration):
+        tracemalloc.start()
+        baseline = tracemalloc.get_traced_memory()[0]
+        await self.setup()
+        memory = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+
+        self.loop.iterations.clear()
+        writes = self.state_writes
+        started = self.loop.time()
+        cpu = process_time()
+        freshness = []
+        while self.loop.time() - started < duration:
+            await asyncio.sleep(self.sample_interval)
+            now = self.clock.monotonic()
+            for entry in self.entries:
+                status_time = self.connection(entry)._status_time
+                freshness.append(now - (status_time or started))
+        cpu = process_time() - cpu
+        await self._stop()
+
+        polls = sum(client.commands().count(COMMAND_GET_STATUS) for client in self.adapter.clients.values())
+        writes = self.state_writes - writes
+        iterations = sorted(self.loop.iterations)
+        freshness.sort()
+        return ScaleReport(
+            devices=len(self.entries),
+            entities=len(self.entities),
+            duration=duration,
+            polls=polls,
+            state_writes=writes,
+            writes_per_second=writes / duration,
+            writes_per_poll=writes / max(polls, 1),
+            loop_lag_max=iterations[-1] if iterations else 0.0,
+            loop_lag_p95=percentile(iterations, 0.95),
+            cpu_seconds=cpu,
+            cpu_per_poll=cpu / max(polls, 1),
+            memory_per_device=memory / len(self.entries),
+            freshness_max=freshness[-1] if freshness else 0.0,
+            freshness_p95=percentile(freshness, 0.95),
+            connect_rejects=self.adapter.rejected,
+            slots_peak=self.adapter.peak,
+        )
+
+    async def _stop(self):
+        self.hass.data[DOMAIN][DATA_WORKING] = False
+        for handle in self._timers:
+            handle.cancel()
+        self._timers.clear()
+        tasks = [task for task in asyncio.all_tasks(self.loop) if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        for entry in self.entries:
+            while entry.on_unload:
+                entry.on_unload.pop()()
+            connection = self.hass.data[DOMAIN].get(entry.entry_id, {}).get(DATA_CONNECTION)
+            if connection is not None:
+                await connection.stop()
+
+    def close(self):
+        if not self.loop.is_closed():
+            self.loop.run_until_complete(self._stop())
+        self._patches.close()
+        self.loop.close()
+
+
+def percentile(values, fraction):
+    """Percentile of sorted values."""
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+@pytest.fixture
+def scale_harness():
+    """Factory of ScaleHarness instances, closed after the test."""
+    harnesses = []
+
+    def create(**kwargs):
+        harness = ScaleHarness(**kwargs)
+        harnesses.append(harness)
+        return harness
+
+    yield create
+    for harness in harnesses:
+        harness.close()
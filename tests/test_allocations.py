@@ -0,0 +1,122 @@
+#!/usr/local/bin/python3
+"""Per-poll allocation tests: polls and entity renders measured with tracemalloc."""
+
+import gc
+import os
+import tracemalloc
+from collections import deque, namedtuple
+from itertools import cycle, islice
+
+from custom_components.skycooker import const
+from custom_components.skycooker.codec import decode_frame
+from custom_components.skycooker.const import *
+
+# Кадры статуса, снятые с RMC-M40S: ожидание, приготовление и подогрев одной программы
+REAL_STATUS_FRAMES = [
+    "55D40605006400230023010100000000000000AA",
+    "55D50605006400230000010500000000000000AA",
+    "55D60605006400000000010600000000000000AA",
+]
+STATUS_PAYLOADS = [decode_frame(bytes.fromhex(frame))[2] for frame in REAL_STATUS_FRAMES]
+
+POLLS = 200
+# Кольцевые буферы диагностики должны заполниться до начала измерений
+WARMUP = 2 * max(LINK_STATS_WINDOW, DIAG_FRAMES_HISTORY, DIAG_POLL_HISTORY)
+
+# Удержанное кодом интеграции не должно расти от опроса к опросу
+RETAINED_BLOCKS_LIMIT = 0.5
+RETAINED_BYTES_LIMIT = 64
+# Пики временных выделений за один шаг, с запасом на разницу версий Python
+POLL_PEAK_LIMIT = 12 * 1024
+RENDER_PEAK_LIMIT = 16 * 1024
+SCHEDULED_POLL_PEAK_LIMIT = 48 * 1024
+
+PACKAGE_FILTER = tracemalloc.Filter(True, os.path.join(os.path.dirname(const.__file__), "*"))
+
+AllocationStats = namedtuple("AllocationStats", ["blocks", "size", "peak"])
+
+
+def measure(step, count=POLLS, warmup=WARMUP):
+    """Run step count times under tracemalloc.
+
+    Returns blocks and bytes retained by the integration per step and the
+    largest transient allocation of a single step in bytes. The warm-up runs
+    traced too: objects allocated before tracing don't show up when they are
+    freed, so ring buffers would look like they grow.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        for _ in range(warmup):
+            step()
+        gc.collect()
+        before = tracemalloc.take_snapshot().filter_traces([PACKAGE_FILTER])
+        peak = 0
+        for _ in range(count):
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            step()
+            peak = max(peak, tracemalloc.get_traced_memory()[1] - current)
+        gc.collect()
+        after = tracemalloc.take_snapshot().filter_traces([PACKAGE_FILTER])
+    finally:
+        tracemalloc.stop()
+    diff = after.compare_to(before, "filename")
+    return AllocationStats(sum(stat.count_diff for stat in diff) / count,
+                           sum(stat.size_diff for stat in diff) / count, peak)
+
+
+def assert_retains_nothing(stats):
+    assert stats.blocks < RETAINED_BLOCKS_LIMIT, stats
+    assert stats.size < RETAINED_BYTES_LIMIT, stats
+
+
+def replay(client):
+    """Answer GET_STATUS with the captured frames, enough of them for warm-up and measurement."""
+    client.script[COMMAND_GET_STATUS] = deque(islice(cycle(STATUS_PAYLOADS), 2 * (WARMUP + POLLS)))
+
+
+class TestAllocations:
+    """Test class for allocations per poll."""
+
+    def test_connection_poll(self, virtual_time):
+        """Test that a status poll retains nothing and allocates a bounded amount."""
+        client = virtual_time.client()
+        replay(client)
+        connection = virtual_time.connection(client)
+        stats = measure(lambda: virtual_time.run(connection.update()))
+        assert_retains_nothing(stats)
+        assert stats.peak < POLL_PEAK_LIMIT, stats
+        assert connection.status.status in (STATUS_WAIT, STATUS_COOKING, STATUS_AUTO_WARM)
+
+    def test_entity_render(self, scale_harness):
+        """Test that updating and rendering every entity of a cooker retains nothing."""
+        harness = scale_harness(devices=1, persistent=True)
+        replay(harness.client(harness.entries[0]))
+        harness.loop.run_until_complete(harness.setup())
+        harness.advance(3)
+
+        def render():
+            for entity in harness.entities:
+                entity.update()
+            harness.advance(0)
+
+        writes = harness.state_writes
+        stats = measure(render)
+        assert_retains_nothing(stats)
+        assert stats.peak < RENDER_PEAK_LIMIT, stats
+        assert harness.state_writes > writes
+
+    def test_scheduled_poll(self, scale_harness):
+        """Test the whole scheduled poll: status read, dispatcher fan-out and entity renders."""
+        harness = scale_harness(devices=1, persistent=True, scan_interval=1)
+        entry = harness.entries[0]
+        replay(harness.client(entry))
+        harness.loop.run_until_complete(harness.setup())
+        harness.advance(3)
+        polls = lambda: harness.client(entry).commands().count(COMMAND_GET_STATUS)
+        started = polls()
+        stats = measure(lambda: harness.advance(1.5), POLLS // 2)
+        assert_retains_nothing(stats)
+        assert stats.peak < SCHEDULED_POLL_PEAK_LIMIT, stats
+        assert polls() - started >= POLLS // 2
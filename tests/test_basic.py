@@ -1,8 +1,9 @@
 """Basic tests for SkyCooker integration."""
 import unittest
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from custom_components.skycooker.const import *
+from custom_components.skycooker.tables import *
 
 
 class TestConstants(unittest.TestCase):
@@ -40,6 +41,32 @@ class TestConstants(unittest.TestCase):
         self.assertEqual(STATUS_CODES[0][STATUS_COOKING], "Cooking")
         self.assertEqual(STATUS_CODES[1][STATUS_COOKING], "Готовка")
 
+    def test_ha_version_tuple(self):
+        """Test the HomeAssistant version check without packaging."""
+        from custom_components.skycooker import ha_version_tuple
+        self.assertEqual(ha_version_tuple("2025.12.5"), (2025, 12, 5))
+        self.assertEqual(ha_version_tuple("2026.1.0b3"), (2026, 1, 0))
+        self.assertEqual(ha_version_tuple("2025.12.0.dev0"), (2025, 12, 0))
+        self.assertLess(ha_version_tuple("2025.12.4"), MIN_HA_VERSION)
+
+
+class TestUnload(unittest.IsolatedAsyncioTestCase):
+    """Test config entry unload."""
+
+    async def test_unload_awaits_connection_stop(self):
+        """Test that unloading an entry awaits the connection stop in the event loop."""
+        from custom_components.skycooker import async_unload_entry
+        connection = MagicMock(stop=AsyncMock())
+        entry = MagicMock(entry_id="test_entry")
+        hass = MagicMock()
+        hass.data = {DOMAIN: {DATA_WORKING: True, DATA_CANCEL: MagicMock(),
+                              entry.entry_id: {DATA_CONNECTION: connection}}}
+
+        self.assertTrue(await async_unload_entry(hass, entry))
+        connection.stop.assert_awaited_once_with()
+        hass.async_add_executor_job.assert_not_called()
+        self.assertIsNone(hass.data[DOMAIN][entry.entry_id][DATA_CONNECTION])
+
 
 class TestMulticookerConnection(unittest.TestCase):
     """Test multicooker connection."""
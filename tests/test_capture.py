@@ -0,0 +1,105 @@
+#!/usr/local/bin/python3
+"""Tests for SkyCooker frame capture and replay."""
+
+import pytest
+from custom_components.skycooker.capture import FrameCapture, replay
+from custom_components.skycooker.codec import encode_frame, decode_frame
+from custom_components.skycooker.const import COMMAND_AUTH, COMMAND_GET_STATUS, COMMAND_TURN_ON, COMMAND_TURN_OFF
+
+
+STATUS_PAYLOAD = bytes([0x05, 0x00, 0x64, 0x00, 0x23, 0x00, 0x23, 0x01, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00])
+
+
+def make_capture():
+    """Build a capture with a normal status poll, a late status reply and a deferred reply."""
+    capture = FrameCapture(size=16)
+    capture.record("tx", encode_frame(1, COMMAND_GET_STATUS))
+    capture.record("rx", encode_frame(1, COMMAND_GET_STATUS, STATUS_PAYLOAD))
+    capture.record("tx", encode_frame(2, COMMAND_TURN_ON))
+    capture.record("rx", encode_frame(1, COMMAND_GET_STATUS, STATUS_PAYLOAD))
+    capture.record("tx", encode_frame(3, COMMAND_GET_STATUS))
+    capture.record("rx", encode_frame(3, COMMAND_TURN_OFF, bytes([0x01])))
+    return capture
+
+
+class TestCapture:
+    """Test class for frame capture and replay."""
+
+    def test_codec_roundtrip(self):
+        """Test that frames are encoded and decoded symmetrically."""
+        frame = encode_frame(7, COMMAND_TURN_ON, [0x01, 0x02])
+        assert frame == bytes([0x55, 0x07, COMMAND_TURN_ON, 0x01, 0x02, 0xAA])
+        assert decode_frame(frame) == (7, COMMAND_TURN_ON, bytes([0x01, 0x02]))
+
+    def test_codec_rejects_malformed_frame(self):
+        """Test that malformed frames raise ValueError."""
+        with pytest.raises(ValueError):
+            decode_frame(bytes([0x55, 0x01, 0xAA]))
+
+    def test_capture_is_bounded(self):
+        """Test that the capture keeps only the most recent frames."""
+        capture = FrameCapture(size=2)
+        for i in range(5):
+            capture.record("tx", encode_frame(i, COMMAND_GET_STATUS))
+        assert len(capture) == 2
+        assert [frame.seq for frame in capture] == [3, 4]
+
+    def test_capture_redacts_auth_key(self, tmp_path):
+        """Test that the pairing key sent with AUTH is not written to capture files."""
+        key = bytes([0x10, 0x21, 0x32, 0x43, 0x54, 0x65, 0x76, 0x87])
+        capture = FrameCapture(size=4)
+        capture.record("tx", encode_frame(1, COMMAND_AUTH, key))
+        capture.record("rx", encode_frame(1, COMMAND_AUTH, bytes([0x01])))
+        capture.dump_jsonl(tmp_path / "capture.jsonl")
+        capture.dump_binary(tmp_path / "capture.bin")
+
+        assert key.hex() not in (tmp_path / "capture.jsonl").read_text()
+        assert key not in (tmp_path / "capture.bin").read_bytes()
+        assert [decode_frame(f.data)[:2] for f in capture] == [(1, COMMAND_AUTH), (1, COMMAND_AUTH)]
+        assert decode_frame(list(capture)[1].data)[2] == bytes([0x01])
+
+    @pytest.mark.parametrize("fmt", ["jsonl", "binary"])
+    def test_capture_dump_and_load(self, tmp_path, fmt):
+        """Test that a capture survives a dump/load roundtrip."""
+        capture = make_capture()
+        path = tmp_path / f"capture.{fmt}"
+        if fmt == "jsonl":
+            capture.dump_jsonl(path)
+        else:
+            capture.dump_binary(path)
+
+        loaded = FrameCapture.load(path)
+
+        assert [(f.seq, f.direction, f.data) for f in loaded] == [(f.seq, f.direction, f.data) for f in capture]
+
+    def test_replay(self):
+        """Test that replay routes frames through the connection like the device session did."""
+        result = replay(make_capture())
+
+        assert result.frames == 6
+        assert result.replies == 3
+        # Поздний статус #1 не новее уже прочитанного и пропущен, TURN_ON остался без ответа
+        assert result.mismatched_seq == 1
+        assert result.timeouts == 1
+        # TURN_OFF в ответ на GET_STATUS - отложенный ответ по правилам, а не ошибка
+        assert result.unexpected_echoes == 0
+        assert result.malformed == 0
+        assert len(result.statuses) == 1
+        assert result.statuses[0].mode == 5
+        assert result.statuses[0].target_temp == 100
+
+    def test_replay_follows_response_rules(self):
+        """Test that a status pushed in reply to TURN_ON is taken and only replies outside the rules count as echoes."""
+        capture = FrameCapture(size=8)
+        capture.record("rx", bytes([0x55, 0x03]))
+        capture.record("tx", encode_frame(1, COMMAND_TURN_ON))
+        capture.record("rx", encode_frame(1, COMMAND_GET_STATUS, STATUS_PAYLOAD))
+        capture.record("tx", encode_frame(2, COMMAND_TURN_OFF))
+        capture.record("rx", encode_frame(2, COMMAND_TURN_ON, bytes([0x01])))
+
+        result = replay(capture)
+
+        assert result.unexpected_echoes == 1
+        assert result.timeouts == 0
+        assert result.malformed == 1
+        assert [status.mode for status in result.statuses] == [5]
@@ -0,0 +1,105 @@
+#!/usr/local/bin/python3
+"""Tests for the standalone SkyCooker client, transports and CLI."""
+
+import asyncio
+
+import pytest
+from custom_components.skycooker.cli import main
+from custom_components.skycooker.client import SkyCookerClient
+from custom_components.skycooker.codec import encode_frame
+from custom_components.skycooker.skycooker import SkyCookerError
+from custom_components.skycooker.transport import FakeCooker
+from custom_components.skycooker.const import *
+from custom_components.skycooker.tables import *
+
+KEY = [0x00] * 8
+
+
+class TestClient:
+    """Test class for the standalone client."""
+
+    @pytest.mark.asyncio
+    async def test_start_and_stop(self):
+        """Test a full program start and stop against the fake cooker."""
+        cooker = FakeCooker(key=KEY)
+        async with SkyCookerClient(cooker, KEY, "RMC-M40S") as client:
+            assert client.sw_version == "1.8"
+            status = await client.start(4, temp=90, boil_minutes=30)
+            assert status.status == STATUS_COOKING
+            assert (status.mode, status.target_temp, status.target_boil_minutes) == (4, 90, 30)
+            assert status.target_boil_hours == MODE_DATA[MODEL_3][4][1]
+            status = await client.stop()
+            assert status.status == STATUS_OFF
+        assert not cooker.is_connected
+
+    @pytest.mark.asyncio
+    async def test_wrong_key_and_timeout(self):
+        """Test that a rejected key and a silent cooker raise errors."""
+        with pytest.raises(SkyCookerError):
+            await SkyCookerClient(FakeCooker(key=[0x01] * 8), KEY, "RMC-M40S").connect()
+        cooker = FakeCooker(latency=0.2)
+        client = SkyCookerClient(cooker, KEY, "RMC-M40S", timeout=0.05)
+        with pytest.raises(IOError):
+            await client.connect()
+        # Запоздавший ответ не остается в цикле событий после отключения
+        await cooker.disconnect()
+        assert not cooker._timers
+
+    @pytest.mark.asyncio
+    async def test_disconnect_cancels_pending_replies(self):
+        """Test that replies still on their way are cancelled by disconnect."""
+        cooker = FakeCooker(latency=0.2)
+        frames = []
+        await cooker.connect(frames.append)
+        await cooker.write(encode_frame(1, COMMAND_GET_STATUS, b""))
+        timer, = cooker._timers
+        await cooker.disconnect()
+        assert timer.cancelled()
+        assert not cooker._timers
+        await cooker.connect(frames.append)
+        await cooker.write(encode_frame(2, COMMAND_GET_STATUS, b""))
+        await asyncio.sleep(0.3)
+        assert [frame[1] for frame in frames] == [2]
+        assert not cooker._timers
+
+    @pytest.mark.asyncio
+    async def test_pushed_status(self):
+        """Test that a status nobody waits for updates the client status."""
+        from custom_components.skycooker.codec import encode_frame
+        cooker = FakeCooker()
+        client = SkyCookerClient(cooker, KEY, "RMC-M40S")
+        await client.connect()
+        cooker.status = STATUS_WARMING
+        client._on_frame(encode_frame(200, COMMAND_GET_STATUS, cooker.status_payload()))
+        assert client.status.status == STATUS_WARMING
+        await client.disconnect()
+
+
+class TestCli:
+    """Test class for the command line tool."""
+
+    def test_status_start_and_benchmark(self, capsys):
+        """Test the CLI commands against the fake cooker."""
+        assert main(["--fake", "status"]) == 0
+        assert capsys.readouterr().out.startswith("Off")
+        assert main(["--fake", "start", "4", "--temp", "95"]) == 0
+        assert "temp=95" in capsys.readouterr().out
+        assert main(["--fake", "monitor", "--interval", "0", "--count", "3"]) == 0
+        assert len(capsys.readouterr().out.splitlines()) == 1
+        assert main(["--fake", "benchmark", "--count", "20"]) == 0
+        assert "20 polls" in capsys.readouterr().out
+
+    def test_script_runs_without_home_assistant(self):
+        """Test that the CLI file runs on its own, without the integration package."""
+        import os, subprocess, sys
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        env = {k: v for k, v in os.environ.items() if k != "PYTHONPATH"}
+        result = subprocess.run([sys.executable, os.path.join(root, "custom_components", "skycooker", "cli.py"),
+                                 "--fake", "stop"], capture_output=True, text=True, env=env, timeout=60)
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.startswith("Off")
+
+    def test_unknown_mode(self, capsys):
+        """Test that an unknown mode name is reported as an error."""
+        assert main(["--fake", "start", "Unknown mode"]) == 1
+        assert "Unknown mode" in capsys.readouterr().err
@@ -3,9 +3,12 @@
 
 import pytest
 from unittest.mock import MagicMock, AsyncMock, patch
+from homeassistant.config_entries import SOURCE_USER
 from homeassistant.const import CONF_MAC, CONF_FRIENDLY_NAME, CONF_PASSWORD, CONF_SCAN_INTERVAL
 from custom_components.skycooker.config_flow import SkyCookerConfigFlow
-from custom_components.skycooker.const import DOMAIN, CONF_PERSISTENT_CONNECTION, DEFAULT_SCAN_INTERVAL, DEFAULT_PERSISTENT_CONNECTION
+from custom_components.skycooker.const import (DOMAIN, CONF_PERSISTENT_CONNECTION, DEFAULT_SCAN_INTERVAL, DEFAULT_PERSISTENT_CONNECTION,
+                                               DATA_PAIRED, PROBE_OK, PROBE_NOT_REACHABLE, PROBE_NOT_PAIRING, PROBE_AUTH_REJECTED,
+                                               PROBE_ADAPTER_CONCURRENCY, SOURCE_BATCH)
 
 
 class TestSkyCookerConfigFlow:
@@ -57,32 +60,142 @@ class TestSkyCookerConfigFlow:
         assert result == False
 
     @pytest.mark.asyncio
-    @patch("custom_components.skycooker.config_flow.SkyCooker")
-    async def test_async_step_scan(self, mock_skycooker):
-        """Test that the async_step_scan method correctly handles the scan step."""
+    async def test_async_step_scan(self):
+        """Test that the scan step probes only known, not yet configured models from the bluetooth cache."""
         mock_hass = MagicMock()
+        mock_hass.data = {}
         flow = SkyCookerConfigFlow()
         flow.hass = mock_hass
+        flow._async_current_ids = MagicMock(return_value=[f"{DOMAIN}-22:22:22:22:22:22"])
 
-        mock_device1 = MagicMock()
-        mock_device1.address = "AA:BB:CC:DD:EE:FF"
-        mock_device1.name = "RMC-TestDevice"
-
-        mock_device2 = MagicMock()
-        mock_device2.address = "11:22:33:44:55:66"
-        mock_device2.name = "RFS-AnotherDevice"
-
-        mock_scanner = MagicMock()
-        mock_scanner.discovered_devices = [mock_device1, mock_device2]
+        devices = []
+        for address, name in (("AA:BB:CC:DD:EE:FF", "RMC-M40S"), ("11:22:33:44:55:66", "RFS-AnotherDevice"),
+                              ("22:22:22:22:22:22", "RMC-M40S"), ("33:33:33:33:33:33", None)):
+            device = MagicMock()
+            device.address = address
+            device.name = name
+            devices.append(device)
 
         mock_bluetooth = MagicMock()
-        mock_bluetooth.async_get_scanner = MagicMock(return_value=mock_scanner)
+        mock_bluetooth.async_discovered_service_info = MagicMock(return_value=devices)
+        mock_connection = MagicMock()
+        mock_connection.probe = AsyncMock(return_value=PROBE_OK)
 
-        with patch("custom_components.skycooker.config_flow.bluetooth", mock_bluetooth):
-            with patch("custom_components.skycooker.config_flow.vol.Schema"):
+        with patch("custom_components.skycooker.config_flow.bluetooth", mock_bluetooth), \
+                patch("custom_components.skycooker.config_flow.SkyCookerConnection", return_value=mock_connection) as mock_cls:
+            with patch("custom_components.skycooker.config_flow.cv.multi_select") as mock_select:
                 result = await flow.async_step_scan()
 
                 assert result["step_id"] == "scan"
+                mock_select.assert_called_once_with({"AA:BB:CC:DD:EE:FF (RMC-M40S)": "AA:BB:CC:DD:EE:FF (RMC-M40S)"})
+        mock_cls.assert_called_once()
+        mock_bluetooth.async_get_scanner.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_async_step_scan_onboards_several_cookers(self):
+        """Test that cookers are probed concurrently per adapter and selected ones are set up in one pass."""
+        import asyncio
+        flow = SkyCookerConfigFlow()
+        flow.context = {"source": SOURCE_USER}
+        flow.hass = MagicMock()
+        flow.hass.data = {}
+        flow.hass.async_create_task = MagicMock(side_effect=lambda coro: coro.close())
+        flow.hass.config_entries.flow.async_init = AsyncMock()
+
+        running = {}
+        peak = {}
+        results = {"AA:00:00:00:00:0%d" % i: PROBE_OK for i in range(5)}
+        results["AA:00:00:00:00:03"] = PROBE_NOT_PAIRING
+        results["AA:00:00:00:00:05"] = None
+        connections = {}
+        devices = []
+        for i, mac in enumerate(results):
+            device = MagicMock(address=mac, source="hci0" if i < 4 else "proxy")
+            device.name = "RMC-M40S"
+            devices.append(device)
+
+        def make(mac, **kwargs):
+            connection = connections[mac] = MagicMock()
+            connection.stop = AsyncMock()
+
+            async def probe():
+                source = "hci0" if mac < "AA:00:00:00:00:04" else "proxy"
+                running[source] = running.get(source, 0) + 1
+                peak[source] = max(peak.get(source, 0), running[source])
+                await asyncio.sleep(0.01)
+                running[source] -= 1
+                if results[mac] is None:
+                    raise IOError("Соединение разорвано")
+                return results[mac]
+
+            connection.probe = probe
+            return connection
+
+        mock_bluetooth = MagicMock()
+        mock_bluetooth.async_discovered_service_info = MagicMock(return_value=devices)
+        with patch("custom_components.skycooker.config_flow.bluetooth", mock_bluetooth), \
+                patch("custom_components.skycooker.config_flow.SkyCookerConnection", side_effect=make):
+            result = await flow.async_step_scan()
+
+        assert peak["hci0"] == PROBE_ADAPTER_CONCURRENCY
+        assert "AA:00:00:00:00:03 (RMC-M40S): not_pairing" in result["description_placeholders"]["not_ready"]
+        assert "AA:00:00:00:00:05 (RMC-M40S): cant_connect" in result["description_placeholders"]["not_ready"]
+        connections["AA:00:00:00:00:05"].stop.assert_called_once()
+        paired = flow.hass.data[DOMAIN][DATA_PAIRED]
+        assert set(paired) == {"AA:00:00:00:00:00", "AA:00:00:00:00:01", "AA:00:00:00:00:02", "AA:00:00:00:00:04"}
+
+        unselected = paired["AA:00:00:00:00:01"]
+        result = await flow.async_step_scan({CONF_MAC: ["AA:00:00:00:00:00 (RMC-M40S)", "AA:00:00:00:00:04 (RMC-M40S)",
+                                                        "AA:00:00:00:00:02 (RMC-M40S)"]})
+        assert result["step_id"] == "init"
+        unselected.stop.assert_called_once()
+        assert "AA:00:00:00:00:01" not in paired
+
+        with patch("custom_components.skycooker.config_flow.vol.Schema"):
+            result = await flow.async_step_init({CONF_SCAN_INTERVAL: 10, CONF_PERSISTENT_CONNECTION: True})
+        assert result["type"] == "create_entry"
+        assert flow.config[CONF_MAC] == "AA:00:00:00:00:00"
+        batch = flow.hass.config_entries.flow.async_init.call_args_list
+        assert [c.kwargs["data"][CONF_MAC] for c in batch] == ["AA:00:00:00:00:04", "AA:00:00:00:00:02"]
+        assert [c.kwargs["context"] for c in batch] == [{"source": SOURCE_BATCH}] * 2
+        assert batch[0].kwargs["data"][CONF_SCAN_INTERVAL] == 10
+        # Сессии выбранных мультиварок остаются для новых записей
+        flow.async_remove()
+        assert len(paired) == 3
+
+        batch_flow = SkyCookerConfigFlow()
+        batch_flow.context = {"source": SOURCE_BATCH}
+        batch_flow.hass = flow.hass
+        result = await batch_flow.async_step_batch(batch[0].kwargs["data"])
+        assert result["type"] == "create_entry"
+        assert result["data"][CONF_FRIENDLY_NAME] == "RMC-M40S"
+        assert result["title"] == "RMC-M40S (AA:00:00:00:00:04)"
+
+    @pytest.mark.asyncio
+    async def test_async_step_bluetooth(self):
+        """Test that a discovered cooker is checked against MODELS before it is offered."""
+        flow = SkyCookerConfigFlow()
+        flow.hass = MagicMock()
+        flow.context = {}
+
+        unknown = MagicMock(address="11:22:33:44:55:66")
+        unknown.name = "RFS-Unknown"
+        with patch("custom_components.skycooker.config_flow.SkyCookerConnection") as mock_connection:
+            result = await flow.async_step_bluetooth(unknown)
+            assert result["reason"] == "unknown_model"
+
+            discovery = MagicMock(address="aa:bb:cc:dd:ee:ff")
+            discovery.name = "RMC-M40S"
+            result = await flow.async_step_bluetooth(discovery)
+            assert result["step_id"] == "bluetooth_confirm"
+            assert flow.unique_id == f"{DOMAIN}-AA:BB:CC:DD:EE:FF"
+            assert flow.config[CONF_FRIENDLY_NAME] == "RMC-M40S"
+            assert flow.context["title_placeholders"]["name"] == "RMC-M40S (AA:BB:CC:DD:EE:FF)"
+            mock_connection.assert_not_called()
+
+        flow._async_current_ids = MagicMock(return_value=[f"{DOMAIN}-AA:BB:CC:DD:EE:FF"])
+        result = await flow.async_step_bluetooth(discovery)
+        assert result["reason"] == "already_configured"
 
     @pytest.mark.asyncio
     async def test_async_step_connect(self):
@@ -96,9 +209,11 @@ class TestSkyCookerConfigFlow:
             CONF_FRIENDLY_NAME: "Test Device"
         }
 
+        mock_hass.data = {}
+        mock_hass.async_create_task = MagicMock(side_effect=lambda coro: coro.close())
+
         mock_connection = MagicMock()
-        mock_connection.last_connect_ok = True
-        mock_connection.last_auth_ok = True
+        mock_connection.probe = AsyncMock(return_value=PROBE_OK)
         mock_connection.update = AsyncMock()
         mock_connection.stop = AsyncMock()
 
@@ -106,6 +221,38 @@ class TestSkyCookerConfigFlow:
             result = await flow.async_step_connect(user_input={})
 
             assert result["step_id"] == "init"
+        # Проверенное подключение остается открытым для новой записи
+        mock_connection.probe.assert_called_once()
+        mock_connection.update.assert_not_called()
+        mock_connection.stop.assert_not_called()
+        assert mock_hass.data[DOMAIN][DATA_PAIRED]["AA:BB:CC:DD:EE:FF"] is mock_connection
+
+        flow.async_remove()
+        mock_connection.stop.assert_called_once()
+        assert not mock_hass.data[DOMAIN][DATA_PAIRED]
+
+    @pytest.mark.asyncio
+    async def test_async_step_connect_errors(self):
+        """Test that each probe failure is reported with its own error."""
+        flow = SkyCookerConfigFlow()
+        flow.hass = MagicMock()
+        flow.hass.data = {}
+        flow.config = {
+            CONF_MAC: "AA:BB:CC:DD:EE:FF",
+            CONF_PASSWORD: list(bytes.fromhex("0000000000000000")),
+            CONF_FRIENDLY_NAME: "RMC-M40S"
+        }
+
+        for error in (PROBE_NOT_REACHABLE, PROBE_NOT_PAIRING, PROBE_AUTH_REJECTED):
+            mock_connection = MagicMock()
+            mock_connection.probe = AsyncMock(return_value=error)
+            mock_connection.stop = AsyncMock()
+            with patch("custom_components.skycooker.config_flow.SkyCookerConnection", return_value=mock_connection):
+                result = await flow.async_step_connect(user_input={})
+            assert result["step_id"] == "connect"
+            assert result["errors"] == {"base": error}
+            mock_connection.stop.assert_called_once()
+        assert DOMAIN not in flow.hass.data
 
     @pytest.mark.asyncio
     async def test_async_step_init(self):
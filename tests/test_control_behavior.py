@@ -9,6 +9,7 @@ from custom_components.skycooker.switch import SkyCookerSwitch
 from custom_components.skycooker.button import SkyCookerButton
 from custom_components.skycooker.skycooker_connection import SkyCookerConnection
 from custom_components.skycooker.const import *
+from custom_components.skycooker.tables import *
 
 
 @pytest.fixture
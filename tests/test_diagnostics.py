@@ -0,0 +1,102 @@
+#!/usr/local/bin/python3
+"""Tests for SkyCooker diagnostics."""
+
+import pytest
+from unittest.mock import MagicMock, patch
+from collections import Counter
+from custom_components.skycooker.skycooker_connection import SkyCookerConnection
+from custom_components.skycooker.diagnostics import async_get_config_entry_diagnostics
+from custom_components.skycooker.const import DOMAIN, DATA_CONNECTION, DATA_ENTITY_UPDATES, COMMAND_GET_STATUS, COMMAND_AUTH
+
+
+class TestDiagnostics:
+    """Test class for diagnostics."""
+
+    def test_connection_diagnostics_empty(self):
+        """Test the snapshot of a fresh connection."""
+        mac = "AA:BB:CC:DD:EE:FF"
+        key = [0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x0E, 0x0F]
+        connection = SkyCookerConnection(mac, key, persistent=True, model="RMC-M40S")
+
+        diag = connection.diagnostics()
+
+        assert diag["connected"] == False
+        assert diag["success_rate"] == 0
+        assert diag["latency"] == {}
+        assert diag["frames"] == []
+        assert diag["polls"] == []
+        assert diag["status"] is None
+
+    def test_connection_diagnostics_latency_and_frames(self):
+        """Test that latency, frames and polls are reported."""
+        mac = "AA:BB:CC:DD:EE:FF"
+        key = [0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x0E, 0x0F]
+        connection = SkyCookerConnection(mac, key, persistent=True, model="RMC-M40S")
+
+        connection._add_latency(COMMAND_GET_STATUS, 0.05)
+        connection._add_latency(COMMAND_GET_STATUS, 0.3)
+        connection._add_latency(COMMAND_GET_STATUS, 5.0)
+        connection._rx_callback(None, bytes([0x55, 0x01, 0x06, 0x01, 0xAA]))
+        connection.add_poll(0, 0.5, True, 30)
+
+        diag = connection.diagnostics()
+
+        latency = diag["latency"]["06"]
+        assert latency["count"] == 3
+        assert latency["max"] == 5.0
+        assert latency["buckets"]["<=0.1"] == 1
+        assert latency["buckets"]["<=0.5"] == 1
+        assert latency["buckets"]["inf"] == 1
+        assert diag["frames"][0]["dir"] == "rx"
+        assert diag["frames"][0]["data"] == "55010601AA"
+        assert diag["polls"][0]["result"] == True
+        assert diag["polls"][0]["next_interval"] == 30
+
+    @pytest.mark.asyncio
+    async def test_config_entry_diagnostics(self):
+        """Test that config entry diagnostics redact secrets and include entity updates."""
+        mac = "AA:BB:CC:DD:EE:FF"
+        key = [0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x0E, 0x0F]
+        connection = SkyCookerConnection(mac, key, persistent=True, model="RMC-M40S")
+
+        mock_entry = MagicMock()
+        mock_entry.entry_id = "test_entry"
+        mock_entry.data = {"mac": mac, "password": key, "friendly_name": "RMC-M40S"}
+        mock_hass = MagicMock()
+        mock_hass.data = {DOMAIN: {"test_entry": {
+            DATA_CONNECTION: connection,
+            DATA_ENTITY_UPDATES: Counter({"skycooker_status": 3}),
+        }}}
+
+        with patch("custom_components.skycooker.diagnostics.bluetooth.async_last_service_info", return_value=None):
+            diag = await async_get_config_entry_diagnostics(mock_hass, mock_entry)
+
+        assert diag["entry"]["mac"] != mac
+        assert diag["entry"]["password"] != key
+        assert diag["entry"]["friendly_name"] == "RMC-M40S"
+        assert diag["path"] is None
+        assert diag["connection"]["model"] == "RMC-M40S"
+        assert diag["entity_updates"] == {"skycooker_status": 3}
+
+    @pytest.mark.asyncio
+    async def test_config_entry_diagnostics_hide_key(self):
+        """Test that the pairing key sent with AUTH never shows up in diagnostics."""
+        from unittest.mock import AsyncMock
+        mac = "AA:BB:CC:DD:EE:FF"
+        key = [0x10, 0x21, 0x32, 0x43, 0x54, 0x65, 0x76, 0x87]
+        connection = SkyCookerConnection(mac, key, persistent=True, model="RMC-M40S")
+        connection._client = MagicMock(is_connected=True, write_gatt_char=AsyncMock())
+        with pytest.raises(IOError):
+            await connection.command(COMMAND_AUTH, key, timeout=0)
+
+        mock_entry = MagicMock()
+        mock_entry.entry_id = "test_entry"
+        mock_entry.data = {"mac": mac, "password": key, "friendly_name": "RMC-M40S"}
+        mock_hass = MagicMock()
+        mock_hass.data = {DOMAIN: {"test_entry": {DATA_CONNECTION: connection}}}
+
+        with patch("custom_components.skycooker.diagnostics.bluetooth.async_last_service_info", return_value=None):
+            diag = await async_get_config_entry_diagnostics(mock_hass, mock_entry)
+
+        assert diag["connection"]["frames"][0]["dir"] == "tx"
+        assert bytes(key).hex() not in str(diag).lower()
@@ -0,0 +1,68 @@
+#!/usr/local/bin/python3
+"""Import cost of the integration, checked by what gets imported rather than by wall-clock time."""
+
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PACKAGE = "custom_components.skycooker"
+
+# Тяжелые модули, которые ядру и импорту интеграции не нужны
+HEAVY_MODULES = ("calendar", "packaging", f"{PACKAGE}.tables")
+
+# Ядро протокола загружается без __init__.py интеграции, HomeAssistant и bleak запрещены
+CORE_IMPORT = f"""
+import sys, types
+package = types.ModuleType({PACKAGE!r})
+package.__path__ = [{os.path.join(ROOT, "custom_components", "skycooker")!r}]
+sys.modules[{PACKAGE!r}] = package
+for name in ("homeassistant", "bleak", "bleak_retry_connector"):
+    sys.modules[name] = None
+import {PACKAGE}.codec
+import {PACKAGE}.skycooker
+import {PACKAGE}.cli
+"""
+
+INTEGRATION_IMPORT = (f"import {PACKAGE}, {PACKAGE}.sensor, {PACKAGE}.select, "
+                      f"{PACKAGE}.switch, {PACKAGE}.button\n")
+
+
+def imported(code):
+    """Run code in a fresh interpreter and return the names of the modules it imported."""
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [ROOT, env.get("PYTHONPATH")]))
+    code += "import json, sys\nprint(json.dumps([name for name, module in sys.modules.items() if module]))\n"
+    result = subprocess.run([sys.executable, "-c", code],
+                            capture_output=True, text=True, env=env, cwd=ROOT, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return set(json.loads(result.stdout.splitlines()[-1]))
+
+
+class TestImportTime:
+    """Test class for the import cost."""
+
+    def test_core_imports_without_home_assistant(self):
+        """Test that the protocol core and the CLI need neither HomeAssistant nor bleak nor the model tables."""
+        modules = imported(CORE_IMPORT)
+        assert f"{PACKAGE}.skycooker" in modules
+        assert not [name for name in modules if name.startswith(("homeassistant", "bleak"))]
+        assert not modules.intersection(HEAVY_MODULES)
+
+    def test_integration_import_defers_tables(self):
+        """Test that loading the integration's platforms does not load the model tables."""
+        modules = imported(INTEGRATION_IMPORT)
+        assert f"{PACKAGE}.select" in modules
+        assert f"{PACKAGE}.tables" not in modules
+
+    def test_tables_load_on_first_use(self):
+        """Test that the tables are loaded by the first capability lookup and stay reachable through const."""
+        modules = imported(INTEGRATION_IMPORT + f"""
+from {PACKAGE}.models import get_capabilities
+from {PACKAGE}.const import MODEL_3, MODE_DATA
+from {PACKAGE} import tables
+assert get_capabilities(MODEL_3).modes[0] == tuple(MODE_DATA[MODEL_3][0])
+assert MODE_DATA is tables.MODE_DATA
+""")
+        assert f"{PACKAGE}.tables" in modules
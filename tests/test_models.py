@@ -0,0 +1,68 @@
+#!/usr/local/bin/python3
+"""Tests for the model capability registry."""
+
+import pytest
+from struct import pack
+from custom_components.skycooker.models import MODEL_CAPABILITIES, get_capabilities, nearest_mode, supports_subprograms
+from custom_components.skycooker.const import *
+from custom_components.skycooker.tables import *
+
+
+class TestModels:
+    """Test class for the model capability registry."""
+
+    def test_registry_covers_all_models(self):
+        """Test that every known model code has compiled capabilities and the registry is read-only."""
+        assert set(MODELS.values()) <= set(MODEL_CAPABILITIES)
+        assert get_capabilities(None) is None
+        with pytest.raises(TypeError):
+            MODEL_CAPABILITIES[MODEL_3] = None
+        assert "RMC-M40S" in get_capabilities(MODEL_3).models
+
+    def test_valid_modes_and_temperature_index(self):
+        """Test the valid mode set and the temperature to mode index against the raw tables."""
+        for code, capabilities in MODEL_CAPABILITIES.items():
+            names = MODE_NAMES[code]
+            for mode in range(len(MODE_DATA[code])):
+                expected = mode < len(names) and names[mode] not in (MODE_NONE, MODE_STANDBY)
+                assert (mode in capabilities.valid_modes) == expected
+            for temp, mode in capabilities.mode_by_temp.items():
+                assert mode == next(i for i, row in enumerate(MODE_DATA[code]) if row[0] == temp)
+
+    def test_frame_layouts(self):
+        """Test that frames match the legacy per-model packing."""
+        model_3 = get_capabilities(MODEL_3)
+        assert not supports_subprograms(MODEL_3)
+        assert model_3.select_mode_frame.pack(mode=4, subprog=2) == pack("B", 4)
+        assert model_3.main_mode_frame.pack(
+            mode=4, subprog=0, target_temp=100, target_boil_hours=1, target_boil_minutes=20,
+            target_delayed_start_hours=0, target_delayed_start_minutes=0, auto_warm=1, bit_flags=7,
+        ) == pack("BBBBBBBB", 4, 0, 100, 1, 20, 0, 0, 1)
+        assert model_3.bit_flags is None
+
+        model_1 = get_capabilities(MODEL_1)
+        assert supports_subprograms(MODEL_1)
+        assert model_1.select_mode_frame.pack(mode=4, subprog=2) == pack("BB", 4, 2)
+        assert model_1.bit_flags[3] == MODE_DATA[MODEL_1][3][3]
+        assert model_1.main_mode_frame.struct.size == 9
+
+    def test_nearest_mode_matches_linear_scan(self):
+        """Test that the bisect lookup picks the same mode as a scan over MODE_DATA, lower index on ties."""
+        for code, capabilities in MODEL_CAPABILITIES.items():
+            for temp in range(20, 260):
+                expected, closest = None, None
+                for mode, row in enumerate(MODE_DATA[code]):
+                    if closest is None or abs(row[0] - temp) < closest:
+                        expected, closest = mode, abs(row[0] - temp)
+                assert nearest_mode(capabilities, temp) == expected, (code, temp)
+
+    def test_capabilities_compiled_on_first_use(self):
+        """Test that a model's tables are compiled once, on first access."""
+        from custom_components.skycooker.models import _CapabilityRegistry
+        registry = _CapabilityRegistry([MODEL_1, MODEL_3])
+        assert not registry._compiled
+        model_3 = registry[MODEL_3]
+        assert list(registry._compiled) == [MODEL_3]
+        assert registry[MODEL_3] is model_3
+        assert registry.get("unknown") is None and "unknown" not in registry
+        assert len(registry) == 2
@@ -54,5 +54,39 @@ class TestNewStatus:
         print(f"\nStatus parsing test passed!")
 
 
+class TestStatusObject:
+    """Test class for the status object."""
+
+    def test_status_is_immutable_and_hashable(self):
+        """Test that statuses are immutable, keep the raw payload and compare by value."""
+        from custom_components.skycooker.skycooker import SkyCooker
+        payload = bytes([0x05, 0x00, 0x64, 0x00, 0x23, 0x01, 0x0A, 0x01, 0x02, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00])
+        status = SkyCooker.parse_status(payload)
+
+        assert status.raw == payload
+        assert status == SkyCooker.parse_status(payload)
+        assert hash(status) == hash(SkyCooker.parse_status(payload))
+        assert status != status._replace(target_temp=90)
+        with pytest.raises(AttributeError):
+            status.mode = 1
+
+    def test_status_derived_fields_and_labels(self):
+        """Test that derived times and localized labels are computed from the payload."""
+        from custom_components.skycooker.skycooker import SkyCooker
+        from custom_components.skycooker.const import MODEL_3
+        payload = bytes([0x05, 0x00, 0x64, 0x00, 0x23, 0x01, 0x0A, 0x01, 0x02, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00])
+        status = SkyCooker.parse_status(payload)
+
+        assert status.boil_time == 35
+        assert status.delayed_start_time == 70
+        assert status.remaining_time == 105
+        assert status.status_code == 5
+        assert status.current_mode == 5
+        assert status.mode_label(MODEL_3, 0) == "Steam"
+        assert status.mode_label(MODEL_3, 1) == "На пару"
+        assert status.status_label(0) == "Delayed Launch"
+        assert status._asdict()["target_temp"] == 100
+
+
 if __name__ == "__main__":
-    pytest.main([__file__, "-v", "-s"])
\ No newline at end of file
+    pytest.main([__file__, "-v", "-s"])
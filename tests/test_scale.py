@@ -0,0 +1,88 @@
+#!/usr/local/bin/python3
+"""Many-device scale tests: N simulated cookers behind one adapter on one event loop.
+
+Run as a script for a report on larger setups:
+
+    PYTHONPATH=. python tests/test_scale.py --devices 200 --duration 600
+"""
+
+import argparse
+import logging
+from unittest.mock import patch
+
+from custom_components.skycooker.const import *
+
+# Пределы с запасом: проверяется характер масштабирования, а не скорость машины
+LOOP_LAG_LIMIT = 0.1
+MEMORY_PER_DEVICE_LIMIT = 256 * 1024
+
+
+class TestScale:
+    """Test class for many devices sharing one adapter."""
+
+    def test_devices_share_adapter_slots(self, scale_harness):
+        """Test that more cookers than adapter slots are all polled within the scan interval."""
+        harness = scale_harness(devices=20, slots=3)
+        report = harness.run(4 * DEFAULT_SCAN_INTERVAL)
+        assert report.slots_peak <= 3
+        # Первый опрос через 3 с после настройки, затем каждые DEFAULT_SCAN_INTERVAL
+        assert report.polls >= report.devices * 4
+        assert report.freshness_max < 2 * DEFAULT_SCAN_INTERVAL
+        assert all(harness.connection(entry).available for entry in harness.entries)
+        assert not harness.adapter.connected
+
+    def test_fan_out_and_cost(self, scale_harness):
+        """Test loop lag, memory per device and that one poll writes every entity at most once."""
+        report = scale_harness(devices=10, slots=3).run(2 * DEFAULT_SCAN_INTERVAL)
+        assert report.loop_lag_max < LOOP_LAG_LIMIT
+        assert report.memory_per_device < MEMORY_PER_DEVICE_LIMIT
+        assert 0 < report.writes_per_poll <= report.entities
+
+    def test_tick_timers_rearmed_per_entry(self, scale_harness):
+        """Test that a poll re-arms only its own entry's tick timer, so timer churn grows linearly."""
+        harness = scale_harness(devices=10, slots=3)
+        for client in harness.adapter.clients.values():
+            client.cooker.status = STATUS_COOKING
+        armed = []
+        call_later = harness.call_later
+        harness.call_later = lambda hass, delay, action: armed.append(action) or call_later(hass, delay, action)
+        with patch("custom_components.skycooker.ev.async_call_later", harness.call_later):
+            report = harness.run(2 * DEFAULT_SCAN_INTERVAL)
+        ticks = [action for action in armed if action.__name__ == "tick"]
+        # Не больше одного перезапуска на опрос и одного на каждую прошедшую минуту
+        assert 0 < len(ticks) <= report.polls + report.devices * 2
+
+    def test_persistent_connections_exhaust_slots(self, scale_harness):
+        """Test that persistent connections beyond the adapter slots leave cookers unpolled."""
+        harness = scale_harness(devices=5, slots=2, persistent=True)
+        report = harness.run(2 * DEFAULT_SCAN_INTERVAL)
+        assert report.slots_peak == 2
+        assert report.connect_rejects > 0
+        assert sum(harness.connection(entry).available for entry in harness.entries) == 2
+
+
+def main(argv=None):
+    from conftest import ScaleHarness
+    parser = argparse.ArgumentParser(description="Run N simulated SkyCooker entries and print a scale report")
+    parser.add_argument("--devices", type=int, default=50)
+    parser.add_argument("--slots", type=int, default=3)
+    parser.add_argument("--duration", type=float, default=300, help="virtual seconds")
+    parser.add_argument("--scan-interval", type=int, default=DEFAULT_SCAN_INTERVAL)
+    parser.add_argument("--persistent", action="store_true")
+    parser.add_argument("--log", action="store_true", help="show integration log messages")
+    args = parser.parse_args(argv)
+    if not args.log:
+        # Сотни мультиварок без свободных слотов заваливают вывод ошибками подключения
+        logging.getLogger("custom_components.skycooker").setLevel(logging.CRITICAL)
+    harness = ScaleHarness(devices=args.devices, slots=args.slots, scan_interval=args.scan_interval,
+                           persistent=args.persistent)
+    try:
+        report = harness.run(args.duration)
+    finally:
+        harness.close()
+    for name, value in report._asdict().items():
+        print(f"{name:>18}: {value:.6g}" if isinstance(value, float) else f"{name:>18}: {value}")
+
+
+if __name__ == "__main__":
+    main()
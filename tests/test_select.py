@@ -377,3 +377,58 @@ async def test_commands_sent_only_on_mode_change(hass, entry, skycooker_connecti
     # Note: The current implementation doesn't call set_target_mode
     # This test should be updated to reflect the actual behavior
     assert skycooker_connection.set_target_mode.called or True  # Placeholder assertion
+
+
+@pytest.mark.asyncio
+async def test_mode_options_compiled_once(hass, entry, skycooker_connection):
+    """Test that mode options and name maps are compiled per model and language and shared."""
+    from custom_components.skycooker.select import mode_options
+    hass.data[DOMAIN][entry.entry_id] = {
+        DATA_CONNECTION: skycooker_connection,
+        DATA_DEVICE_INFO: lambda: {"name": "Test Device"}
+    }
+    first = SkyCookerSelect(hass, entry, SELECT_TYPE_MODE)
+    second = SkyCookerSelect(hass, entry, SELECT_TYPE_MODE)
+    assert first.options is second.options
+    assert first.options is mode_options(MODEL_3, 0).options
+    assert SkyCookerSelect(hass, entry, SELECT_TYPE_COOKING_TIME_MINUTES).options is \
+        SkyCookerSelect(hass, entry, SELECT_TYPE_DELAYED_START_MINUTES).options
+
+    compiled = mode_options(MODEL_3, 1)
+    assert compiled.labels[compiled.index["Суп"]] == "Суп"
+
+    hass.config.language = "ru"
+    first.async_schedule_update_ha_state = MagicMock()
+    first.skycooker.schedule_apply = MagicMock()
+    with patch("custom_components.skycooker.select.async_dispatcher_send"):
+        await first.async_select_option("Суп")
+    assert skycooker_connection._target_mode == compiled.index["Суп"]
+
+
+@pytest.mark.asyncio
+async def test_mode_select_uses_model_capabilities(hass, entry, skycooker_connection):
+    """Test that a selected mode takes its defaults from the model capabilities and unknown models are ignored."""
+    from custom_components.skycooker.models import get_capabilities
+    from custom_components.skycooker.select import mode_options
+    hass.data[DOMAIN][entry.entry_id] = {
+        DATA_CONNECTION: skycooker_connection,
+        DATA_DEVICE_INFO: lambda: {"name": "Test Device"}
+    }
+    skycooker_connection._target_boil_hours = None
+    skycooker_connection._target_boil_minutes = None
+    select = SkyCookerSelect(hass, entry, SELECT_TYPE_MODE)
+    select.async_schedule_update_ha_state = MagicMock()
+    mode_id = mode_options(MODEL_3, 0).index["Soup"]
+
+    with patch("custom_components.skycooker.select.async_dispatcher_send"):
+        await select.async_select_option("Soup")
+    modes = get_capabilities(MODEL_3).modes
+    assert skycooker_connection._target_mode == mode_id
+    assert skycooker_connection._target_temperature == modes[mode_id][0]
+    assert (skycooker_connection._target_boil_hours, skycooker_connection._target_boil_minutes) == modes[mode_id][1:3]
+
+    skycooker_connection.model_code = None
+    skycooker_connection._target_mode = None
+    with patch("custom_components.skycooker.select.async_dispatcher_send"):
+        await select.async_select_option("Soup")
+    assert skycooker_connection._target_mode is None
@@ -1,4 +1,6 @@
 """Tests for SkyCooker sensors."""
+import asyncio
+
 import pytest
 from unittest.mock import MagicMock, patch
 from homeassistant.core import HomeAssistant
@@ -147,6 +149,22 @@ def test_sensor_native_value_auto_warm_time(hass, entry, skycooker_connection):
     assert sensor.native_value == 0
 
 
+def test_sensor_auto_warm_time_counts_up(hass, entry, virtual_time):
+    """Test that the auto warm time grows between polls as minutes pass."""
+    connection = virtual_time.connection(virtual_time.client())
+    virtual_time.run(asyncio.sleep(1))
+    # Подогрев идет 0:05
+    connection._set_status(connection.parse_status(bytes([0x05, 0x00, 0x64, 0x00, 0x00, 0x00, 0x05, 0x01, 0x06, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00])))
+    hass.data[DOMAIN][entry.entry_id] = {DATA_CONNECTION: connection}
+    sensor = SkyCookerSensor(hass, entry, SENSOR_TYPE_AUTO_WARM_TIME)
+    assert sensor.native_value == 5
+
+    virtual_time.run(asyncio.sleep(connection.next_tick_delay() + 1))
+    assert sensor.native_value == 6
+    virtual_time.run(asyncio.sleep(120))
+    assert sensor.native_value == 8
+
+
 def test_sensor_native_value_success_rate(hass, entry, skycooker_connection):
     """Test sensor native value for success rate."""
     hass.data[DOMAIN][entry.entry_id] = {
@@ -273,3 +291,47 @@ def test_sensor_unavailable(hass, entry, skycooker_connection):
     
     sensor = SkyCookerSensor(hass, entry, SENSOR_TYPE_STATUS)
     assert sensor.available is False
+
+
+def test_link_sensor_written_only_on_change(hass, entry, skycooker_connection):
+    """Test that link diagnostic sensors skip state writes when nothing changed."""
+    skycooker_connection.consecutive_failures = 0
+    hass.data[DOMAIN][entry.entry_id] = {
+        DATA_CONNECTION: skycooker_connection,
+        DATA_DEVICE_INFO: lambda: {"name": "Test Device"}
+    }
+
+    sensor = SkyCookerSensor(hass, entry, SENSOR_TYPE_CONSECUTIVE_FAILURES)
+    sensor.schedule_update_ha_state = MagicMock()
+    assert sensor.entity_category == "diagnostic"
+
+    sensor.update()
+    sensor.update()
+    assert sensor.schedule_update_ha_state.call_count == 1
+
+    skycooker_connection.available = False
+    skycooker_connection.consecutive_failures = 1
+    sensor.update()
+    assert sensor.schedule_update_ha_state.call_count == 2
+    assert sensor.available is True
+    assert sensor.native_value == 1
+
+
+def test_sensor_metadata_resolved_once(hass, entry, skycooker_connection):
+    """Test that every sensor type has a description and metadata is not recomputed on access."""
+    from custom_components.skycooker.sensor import SENSOR_DESCRIPTIONS
+    hass.data[DOMAIN][entry.entry_id] = {
+        DATA_CONNECTION: skycooker_connection,
+        DATA_DEVICE_INFO: lambda: {"name": "Test Device"}
+    }
+    sensor_types = {value for name, value in globals().items() if name.startswith("SENSOR_TYPE_")}
+    assert sensor_types == set(SENSOR_DESCRIPTIONS)
+
+    sensor = SkyCookerSensor(hass, entry, SENSOR_TYPE_REMAINING_TIME)
+    with patch("custom_components.skycooker.const.sanitize_model_name", side_effect=AssertionError), \
+            patch("custom_components.skycooker.const.sanitize_entry_id", side_effect=AssertionError):
+        assert sensor.unique_id == "skycooker_remaining_time_test_device_test_entry"
+        assert sensor.entity_id == sensor.unique_id
+        assert sensor.name == "SkyCooker Test Device remaining time"
+        assert sensor.device_class == "duration"
+        assert sensor.native_unit_of_measurement == "min"
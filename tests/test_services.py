@@ -0,0 +1,180 @@
+#!/usr/local/bin/python3
+"""Tests for SkyCooker services."""
+
+import pytest
+from datetime import timedelta
+from unittest.mock import MagicMock, AsyncMock
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.core import ServiceCall
+from custom_components.skycooker.services import async_setup_services
+from custom_components.skycooker.skycooker_connection import SkyCookerConnection
+from custom_components.skycooker.const import DOMAIN, DATA_CONNECTION, SERVICE_RUN_PROGRAM, MODEL_3
+
+
+def setup_services(connection):
+    """Register services on a mock hass and return the registered handlers."""
+    mock_hass = MagicMock()
+    mock_hass.data = {DOMAIN: {"test_entry": {DATA_CONNECTION: connection}}}
+    async_setup_services(mock_hass)
+    return {c.args[1]: c.args[2] for c in mock_hass.services.async_register.call_args_list}
+
+
+class TestServices:
+    """Test class for services."""
+
+    @pytest.mark.asyncio
+    async def test_run_program(self):
+        """Test that run_program resolves the mode name and splits durations."""
+        connection = MagicMock()
+        connection.model_code = MODEL_3
+        connection.run_program = AsyncMock()
+        handlers = setup_services(connection)
+
+        await handlers[SERVICE_RUN_PROGRAM](ServiceCall(DOMAIN, SERVICE_RUN_PROGRAM, {
+            "entry_id": "test_entry",
+            "mode": "суп",
+            "temperature": 100,
+            "duration": timedelta(hours=1, minutes=20),
+            "delay": timedelta(minutes=90),
+            "auto_warm": True,
+        }))
+
+        connection.run_program.assert_called_once_with(
+            4, subprog=0, temp=100, boil_hours=1, boil_minutes=20,
+            delayed_start_hours=1, delayed_start_minutes=30, auto_warm=True)
+
+    @pytest.mark.asyncio
+    async def test_run_program_unknown_mode(self):
+        """Test that an unknown mode name is rejected before anything is sent."""
+        connection = MagicMock()
+        connection.model_code = MODEL_3
+        connection.run_program = AsyncMock()
+        handlers = setup_services(connection)
+
+        with pytest.raises(ServiceValidationError):
+            await handlers[SERVICE_RUN_PROGRAM](ServiceCall(DOMAIN, SERVICE_RUN_PROGRAM, {
+                "entry_id": "test_entry", "mode": "Unknown mode"}))
+        connection.run_program.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_run_program_validation(self):
+        """Test that an invalid program fails validation without connecting."""
+        mac = "AA:BB:CC:DD:EE:FF"
+        key = [0x00] * 16
+        connection = SkyCookerConnection(mac, key, persistent=True, model="RMC-M40S")
+        connection._connect_if_need = AsyncMock()
+        handlers = setup_services(connection)
+
+        for data in ({"mode": 15}, {"mode": 17}, {"mode": 4, "subprogram": 2}, {"mode": 4, "temperature": 250}):
+            with pytest.raises(ServiceValidationError):
+                await handlers[SERVICE_RUN_PROGRAM](ServiceCall(DOMAIN, SERVICE_RUN_PROGRAM, {
+                    "entry_id": "test_entry", **data}))
+        connection._connect_if_need.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_connection_run_program_single_session(self):
+        """Test that run_program sends the sequence in one session with one final status read."""
+        mac = "AA:BB:CC:DD:EE:FF"
+        key = [0x00] * 16
+        connection = SkyCookerConnection(mac, key, persistent=False, model="RMC-M40S")
+        connection._status = connection.parse_status(bytes([0x10, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00]))
+        connection._connect_if_need = AsyncMock()
+        connection._disconnect_if_need = AsyncMock()
+        connection.select_mode = AsyncMock()
+        connection.set_main_mode = AsyncMock()
+        connection.turn_on = AsyncMock()
+        connection.get_status = AsyncMock(return_value=connection._status)
+
+        await connection.run_program(4, temp=100, boil_hours=0, boil_minutes=40, auto_warm=False)
+
+        connection._connect_if_need.assert_called_once()
+        connection._disconnect_if_need.assert_called_once()
+        connection.select_mode.assert_called_once_with(4, 0)
+        connection.set_main_mode.assert_called_once_with(4, 0, 100, 0, 40, 0, 0, 0)
+        connection.turn_on.assert_called_once()
+        connection.get_status.assert_called_once()
+        assert connection._target_mode == 4
+        assert connection._target_boil_minutes == 40
+
+    @pytest.mark.asyncio
+    async def test_bulk_command_bounded_per_adapter(self):
+        """Test that bulk commands respect the per-adapter limit, start ready cookers first and report results."""
+        import asyncio
+        from custom_components.skycooker.services import bulk_command
+        from custom_components.skycooker.const import BULK_COMMAND_START, BULK_ADAPTER_CONCURRENCY
+
+        running = {}
+        peak = {}
+        order = []
+
+        def make(name, adapter, connected, fail=False):
+            connection = MagicMock()
+            connection.adapter = adapter
+            connection.connected = connected
+            connection.available = connected
+
+            async def start():
+                order.append(name)
+                running[adapter] = running.get(adapter, 0) + 1
+                peak[adapter] = max(peak.get(adapter, 0), running[adapter])
+                await asyncio.sleep(0.01)
+                running[adapter] -= 1
+                if fail:
+                    raise IOError("Таймаут приема")
+
+            connection.start = start
+            return connection
+
+        connections = {f"hci0_{i}": make(f"hci0_{i}", "hci0", i == 5) for i in range(6)}
+        connections["hci1_0"] = make("hci1_0", "hci1", False, fail=True)
+        connections["missing"] = None
+
+        response = await bulk_command(connections, BULK_COMMAND_START, {})
+
+        assert peak["hci0"] == BULK_ADAPTER_CONCURRENCY
+        assert order[0] == "hci0_5"
+        assert response["results"]["hci0_0"]["success"]
+        assert response["results"]["hci1_0"]["success"] == False
+        assert response["results"]["missing"]["success"] == False
+        assert response["results"]["hci0_4"]["queued"] > 0
+        assert len(response["results"]) == 8
+
+    @pytest.mark.asyncio
+    async def test_refresh(self):
+        """Test that refresh passes max_age and reports statuses per entry."""
+        from custom_components.skycooker.const import SERVICE_REFRESH
+        mac = "AA:BB:CC:DD:EE:FF"
+        connection = SkyCookerConnection(mac, [0x00] * 16, persistent=True, model="RMC-M40S")
+        status = connection.parse_status(bytes([0x05, 0x00, 0x64, 0x00, 0x23, 0x00, 0x00, 0x01, 0x05, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00]))
+        connection.get_status_cached = AsyncMock(return_value=status)
+        handlers = setup_services(connection)
+
+        response = await handlers[SERVICE_REFRESH](ServiceCall(DOMAIN, SERVICE_REFRESH, {"max_age": 30}))
+
+        connection.get_status_cached.assert_called_once_with(30)
+        assert response["results"]["test_entry"]["status"]["mode"] == 5
+
+    @pytest.mark.asyncio
+    async def test_capture(self, tmp_path):
+        """Test that capture records frames between start and stop and saves them to the config directory."""
+        from custom_components.skycooker.const import SERVICE_CAPTURE
+        from custom_components.skycooker.capture import FrameCapture
+        connection = SkyCookerConnection("AA:BB:CC:DD:EE:FF", [0x00] * 16, persistent=True, model="RMC-M40S")
+        mock_hass = MagicMock()
+        mock_hass.data = {DOMAIN: {"test_entry": {DATA_CONNECTION: connection}}}
+        mock_hass.config.path = lambda name: str(tmp_path / name)
+        mock_hass.async_add_executor_job = AsyncMock(side_effect=lambda func, *args: func(*args))
+        async_setup_services(mock_hass)
+        capture = {c.args[1]: c.args[2] for c in mock_hass.services.async_register.call_args_list}[SERVICE_CAPTURE]
+
+        with pytest.raises(ServiceValidationError):
+            await capture(ServiceCall(DOMAIN, SERVICE_CAPTURE, {"entry_id": "test_entry", "action": "stop"}))
+
+        await capture(ServiceCall(DOMAIN, SERVICE_CAPTURE, {"entry_id": "test_entry", "action": "start", "size": 10}))
+        connection.capture.record("rx", bytes([0x55, 0x01, 0x06, 0x00, 0xAA]))
+        response = await capture(ServiceCall(DOMAIN, SERVICE_CAPTURE, {"entry_id": "test_entry", "action": "stop"}))
+
+        assert connection.capture is None
+        assert response["frames"] == 1
+        assert response["path"].startswith(str(tmp_path))
+        assert len(FrameCapture.load(response["path"])) == 1
@@ -3,9 +3,10 @@
 
 import pytest
 import asyncio
+import logging
 from unittest.mock import MagicMock, AsyncMock, patch
 from custom_components.skycooker.skycooker_connection import SkyCookerConnection, AuthError, DisposedError
-from custom_components.skycooker.const import STATUS_OFF, STATUS_AUTO_WARM
+from custom_components.skycooker.const import STATUS_OFF, STATUS_AUTO_WARM, STATUS_WARMING, STATUS_COOKING
 
 
 class TestSkyCookerConnection:
@@ -135,12 +136,10 @@ class TestSkyCookerConnection:
         
         # Mock the _status attribute to simulate delayed start scenario
         from custom_components.skycooker.const import STATUS_DELAYED_LAUNCH
-        connection._status = MagicMock()
-        connection._status.status = STATUS_DELAYED_LAUNCH
-        connection._status.target_delayed_start_hours = 0
-        connection._status.target_delayed_start_minutes = 27
-        connection._status.target_boil_hours = 0
-        connection._status.target_boil_minutes = 7
+        connection._status = connection.Status(
+            mode=1, subprog=0, target_temp=100, auto_warm=0, is_on=True, sound_enabled=True,
+            parental_control=False, error_code=0, target_boil_hours=0, target_boil_minutes=7,
+            target_delayed_start_hours=0, target_delayed_start_minutes=27, status=STATUS_DELAYED_LAUNCH)
         
         # Test delayed_start_time
         assert connection.delayed_start_time == 27
@@ -158,12 +157,10 @@ class TestSkyCookerConnection:
         connection = SkyCookerConnection(mac, key, persistent=True, model="RMC-M40S")
         
         # Mock the _status attribute to simulate normal cooking scenario
-        connection._status = MagicMock()
-        connection._status.status = 1  # Some cooking status
-        connection._status.target_delayed_start_hours = 0
-        connection._status.target_delayed_start_minutes = 0
-        connection._status.target_boil_hours = 0
-        connection._status.target_boil_minutes = 7
+        connection._status = connection.Status(
+            mode=1, subprog=0, target_temp=100, auto_warm=0, is_on=True, sound_enabled=True,
+            parental_control=False, error_code=0, target_boil_hours=0, target_boil_minutes=7,
+            target_delayed_start_hours=0, target_delayed_start_minutes=0, status=1)  # Some cooking status
         
         # Test delayed_start_time (should return 0 since no delayed start)
         assert connection.delayed_start_time == 0
@@ -840,4 +837,517 @@ class TestSkyCookerConnection:
            
        except Exception as e:
            response_task.cancel()
-           pytest.fail(f"command method failed to handle async TURN_OFF response during GET_STATUS: {e}")
\ No newline at end of file
+           pytest.fail(f"command method failed to handle async TURN_OFF response during GET_STATUS: {e}")
+    @pytest.mark.asyncio
+    async def test_connection_command_records_trace(self):
+        """Test that command records TX and RX frames in the trace ring buffer."""
+        mac = "AA:BB:CC:DD:EE:FF"
+        key = [0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x0E, 0x0F]
+        connection = SkyCookerConnection(mac, key, persistent=True, model="RMC-M40S")
+
+        connection._client = MagicMock()
+        connection._client.is_connected = True
+        connection._client.write_gatt_char = AsyncMock()
+        connection._iter = 0
+
+        from custom_components.skycooker.const import COMMAND_TURN_ON
+
+        async def set_response_after_delay():
+            await asyncio.sleep(0.1)
+            connection._rx_callback(None, bytes([0x55, 0x01, COMMAND_TURN_ON, 0x01, 0xAA]))
+
+        response_task = asyncio.create_task(set_response_after_delay())
+        result = await connection.command(COMMAND_TURN_ON)
+        response_task.cancel()
+
+        assert result == bytes([0x01])
+        assert [direction for _, direction, _ in connection._trace] == ["tx", "rx"]
+        assert connection._trace[0][2] == bytes([0x55, 0x01, COMMAND_TURN_ON, 0xAA])
+
+    @pytest.mark.asyncio
+    async def test_connection_update_does_not_log_info(self, caplog):
+        """Test that a routine poll does not log at INFO level."""
+        mac = "AA:BB:CC:DD:EE:FF"
+        key = [0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x0E, 0x0F]
+        connection = SkyCookerConnection(mac, key, persistent=True, model="RMC-M40S")
+        connection._connect_if_need = AsyncMock()
+        connection.get_status = AsyncMock(return_value=MagicMock())
+
+        with caplog.at_level(logging.INFO, logger="custom_components.skycooker"):
+            assert await connection.update() == True
+
+        assert not [record for record in caplog.records if record.levelno >= logging.INFO]
+
+    @pytest.mark.asyncio
+    async def test_connection_late_status_reply_answers_current_status_request(self):
+        """Test that a late reply to an earlier GET_STATUS completes the current GET_STATUS."""
+        mac = "AA:BB:CC:DD:EE:FF"
+        key = [0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x0E, 0x0F]
+        connection = SkyCookerConnection(mac, key, persistent=True, model="RMC-M40S")
+
+        connection._client = MagicMock()
+        connection._client.is_connected = True
+        connection._client.write_gatt_char = AsyncMock()
+
+        from custom_components.skycooker.const import COMMAND_GET_STATUS
+        status_payload = [0x05, 0x00, 0x64, 0x00, 0x23, 0x00, 0x23, 0x01, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00]
+
+        # Previous GET_STATUS #1 is still outstanding, the current one is #2
+        connection._iter = 1
+        connection._pending[1] = COMMAND_GET_STATUS
+        connection._status_time = 1.0
+        connection._sent_at[1] = 2.0
+
+        async def send_late_reply():
+            await asyncio.sleep(0.1)
+            connection._rx_callback(None, bytes([0x55, 0x01, COMMAND_GET_STATUS] + status_payload + [0xAA]))
+
+        response_task = asyncio.create_task(send_late_reply())
+        result = await connection.command(COMMAND_GET_STATUS)
+        response_task.cancel()
+
+        assert result == bytes(status_payload)
+        assert connection._late_replies == 1
+        assert connection._status.mode == 5
+        assert connection._pending == {}
+        # Поздний кадр не освежает время статуса для кэша refresh, но таймеры считаются от его запроса
+        assert connection._status_time == 1.0
+        assert connection._countdown_time == 2.0
+
+    def test_connection_late_status_older_than_stored_is_dropped(self):
+        """Test that a late status does not replace a status read after its request was sent."""
+        from custom_components.skycooker.const import COMMAND_GET_STATUS
+        clock = MagicMock()
+        clock.monotonic.return_value = 100.0
+        connection = SkyCookerConnection("AA:BB:CC:DD:EE:FF", [0x00] * 16, persistent=True, model="RMC-M40S", clock=clock)
+        connection._set_status(connection.parse_status(bytes([0x05, 0x00, 0x64, 0x00, 0x00, 0x00, 0x1E, 0x01, 0x05] + [0x00] * 7)))
+        connection._iter = 2
+        connection._pending[1] = COMMAND_GET_STATUS
+        connection._sent_at[1] = 40.0
+
+        connection._rx_callback(None, bytes([0x55, 0x01, COMMAND_GET_STATUS, 0x05, 0x00, 0x64, 0x00, 0x00, 0x00,
+                                             0x28, 0x01, 0x05] + [0x00] * 7 + [0xAA]))
+
+        assert connection._late_replies == 1
+        assert connection._real_status.delayed_start_time == 30
+        assert connection._countdown_time == 100.0
+
+    @pytest.mark.asyncio
+    async def test_connection_late_reply_does_not_answer_other_command(self):
+        """Test that a late reply to another command is routed aside and the current command keeps waiting."""
+        mac = "AA:BB:CC:DD:EE:FF"
+        key = [0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x0E, 0x0F]
+        connection = SkyCookerConnection(mac, key, persistent=True, model="RMC-M40S")
+
+        connection._client = MagicMock()
+        connection._client.is_connected = True
+        connection._client.write_gatt_char = AsyncMock()
+
+        from custom_components.skycooker.const import COMMAND_TURN_OFF, COMMAND_TURN_ON
+
+        connection._iter = 1
+        connection._pending[1] = COMMAND_TURN_OFF
+
+        async def send_replies():
+            await asyncio.sleep(0.1)
+            connection._rx_callback(None, bytes([0x55, 0x01, COMMAND_TURN_OFF, 0x01, 0xAA]))
+            await asyncio.sleep(0.1)
+            connection._rx_callback(None, bytes([0x55, 0x02, COMMAND_TURN_ON, 0x01, 0xAA]))
+
+        response_task = asyncio.create_task(send_replies())
+        result = await connection.command(COMMAND_TURN_ON)
+        response_task.cancel()
+
+        assert result == bytes([0x01])
+        assert connection._late_replies == 1
+
+    def test_connection_response_rules_for_model(self):
+        """Test that the response rule table is resolved for the model."""
+        mac = "AA:BB:CC:DD:EE:FF"
+        key = [0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x0E, 0x0F]
+        connection = SkyCookerConnection(mac, key, persistent=True, model="RMC-M40S")
+
+        from custom_components.skycooker.const import (COMMAND_TURN_ON, COMMAND_GET_STATUS, COMMAND_TURN_OFF,
+                                                       RESPONSE_ACK, RESPONSE_PAYLOAD, DEFAULT_RESPONSE_RULES)
+        assert connection._response_rules[(COMMAND_TURN_ON, COMMAND_GET_STATUS)] == RESPONSE_ACK
+        assert connection._response_rules[(COMMAND_GET_STATUS, COMMAND_TURN_OFF)] == RESPONSE_PAYLOAD
+        assert (COMMAND_TURN_OFF, COMMAND_TURN_ON) not in connection._response_rules
+        assert connection._response_rules == DEFAULT_RESPONSE_RULES
+
+    @pytest.mark.asyncio
+    async def test_connection_start_same_program_sends_nothing(self):
+        """Test that starting the program that is already running sends no commands."""
+        mac = "AA:BB:CC:DD:EE:FF"
+        key = [0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x0E, 0x0F]
+        connection = SkyCookerConnection(mac, key, persistent=True, model="RMC-M40S")
+
+        # Запущен режим 5, 100°C, 0:35 с автоподогревом, устройство уже отсчитало время до 0:20
+        connection._program = (5, 0, (100, 0, 35, 0, 0, 1))
+        connection._set_status(connection.parse_status(bytes([0x05, 0x00, 0x64, 0x00, 0x14, 0x00, 0x00, 0x01, 0x05, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00])))
+        connection._target_mode = 5
+        connection._target_temperature = 100
+        connection._target_boil_hours = 0
+        connection._target_boil_minutes = 35
+        connection._auto_warm_enabled = True
+
+        connection._client = MagicMock()
+        connection._client.is_connected = True
+        connection.command = AsyncMock()
+        connection._connect_if_need = AsyncMock()
+        connection._disconnect_if_need = AsyncMock()
+
+        await connection.start()
+
+        connection.command.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_connection_start_changed_time_skips_select_and_status(self):
+        """Test that changing only the cooking time sends SET_MAIN_MODE and TURN_ON and reuses the pushed status."""
+        mac = "AA:BB:CC:DD:EE:FF"
+        key = [0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x0E, 0x0F]
+        connection = SkyCookerConnection(mac, key, persistent=True, model="RMC-M40S")
+
+        from custom_components.skycooker.const import COMMAND_GET_STATUS, COMMAND_SET_MAIN_MODE, COMMAND_TURN_ON
+        running = [0x05, 0x00, 0x64, 0x00, 0x23, 0x00, 0x00, 0x01, 0x05, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00]
+        updated = [0x05, 0x00, 0x64, 0x00, 0x2D, 0x00, 0x00, 0x01, 0x05, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00]
+        connection._set_status(connection.parse_status(bytes(running)))
+        connection._program = (5, 0, (100, 0, 35, 0, 0, 1))
+        connection._target_mode = 5
+        connection._target_temperature = 100
+        connection._target_boil_hours = 0
+        connection._target_boil_minutes = 45
+        connection._auto_warm_enabled = True
+
+        sent = []
+
+        async def write_gatt_char(uuid, data):
+            sent.append(data[2])
+            reply = [0x55, data[1], COMMAND_SET_MAIN_MODE, 0x01, 0xAA]
+            if data[2] == COMMAND_TURN_ON:
+                # Устройство отвечает на TURN_ON асинхронным статусом
+                reply = [0x55, data[1], COMMAND_GET_STATUS] + updated + [0xAA]
+            asyncio.get_running_loop().call_soon(connection._rx_callback, None, bytes(reply))
+
+        connection._client = MagicMock()
+        connection._client.is_connected = True
+        connection._client.write_gatt_char = write_gatt_char
+        connection._connect_if_need = AsyncMock()
+        connection._disconnect_if_need = AsyncMock()
+
+        await connection.start()
+
+        assert sent == [COMMAND_SET_MAIN_MODE, COMMAND_TURN_ON]
+        assert connection._status.target_boil_minutes == 45
+
+    @pytest.mark.asyncio
+    async def test_connection_start_plans_against_real_status(self):
+        """Test that Start is planned against the device status, not the optimistic one or the countdown."""
+        mac = "AA:BB:CC:DD:EE:FF"
+        key = [0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x0E, 0x0F]
+        connection = SkyCookerConnection(mac, key, persistent=True, model="RMC-M40S")
+        params = (100, 0, 35, 0, 0, 1)
+        off = [0x05, 0x00, 0x64, 0x00, 0x23, 0x00, 0x00, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00]
+        counted_down = [0x05, 0x00, 0x64, 0x00, 0x14, 0x00, 0x00, 0x01, 0x05, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00]
+
+        # Первый старт еще не подтвержден: оптимистичный статус уже показывает программу
+        connection._set_status(connection.parse_status(bytes(off)))
+        connection._program = (5, 0, params)
+        connection.expect(mode=5, is_on=True, status=STATUS_COOKING, target_temp=100)
+        assert connection._plan_start(5, 0, params, (STATUS_WARMING, STATUS_COOKING)) == (True, True)
+
+        # Программа, запущенная с панели: исходная длительность неизвестна
+        connection._expected = None
+        connection._set_status(connection.parse_status(bytes(counted_down)))
+        connection._program = None
+        assert connection._plan_start(5, 0, params, (STATUS_WARMING, STATUS_COOKING)) == (False, True)
+
+        connection._program = (5, 0, params)
+        assert connection._plan_start(5, 0, params, (STATUS_WARMING, STATUS_COOKING)) == (False, False)
+        assert connection._plan_start(5, 0, (110, 0, 35, 0, 0, 1), (STATUS_WARMING, STATUS_COOKING)) == (False, True)
+
+    @pytest.mark.asyncio
+    async def test_connection_live_apply_coalesces_changes(self):
+        """Test that several settings changes during cooking reach the device as one SET_MAIN_MODE."""
+        mac = "AA:BB:CC:DD:EE:FF"
+        key = [0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x0E, 0x0F]
+        connection = SkyCookerConnection(mac, key, persistent=True, model="RMC-M40S", live_apply=True)
+
+        connection._status = connection.parse_status(bytes([0x05, 0x00, 0x64, 0x00, 0x23, 0x00, 0x00, 0x01, 0x05, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00]))
+        connection.set_main_mode = AsyncMock()
+        connection._connect_if_need = AsyncMock()
+        connection._disconnect_if_need = AsyncMock()
+
+        connection._auto_warm_enabled = True
+
+        with patch("custom_components.skycooker.skycooker_connection.LIVE_APPLY_DELAY", 0.05):
+            connection._target_temperature = 110
+            assert connection.schedule_apply()
+            connection._target_boil_hours = 1
+            assert connection.schedule_apply()
+            connection._target_boil_minutes = 15
+            assert connection.schedule_apply()
+            await asyncio.sleep(0.2)
+
+        connection.set_main_mode.assert_called_once_with(5, 0, 110, 1, 15, 0, 0, 1)
+
+    @pytest.mark.asyncio
+    async def test_connection_live_apply_keeps_device_settings(self):
+        """Test that an unchanged boil time continues from the remaining time and auto warm follows the device."""
+        mac = "AA:BB:CC:DD:EE:FF"
+        key = [0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x0E, 0x0F]
+        connection = SkyCookerConnection(mac, key, persistent=True, model="RMC-M40S", live_apply=True)
+        connection.set_main_mode = AsyncMock()
+        connection._connect_if_need = AsyncMock()
+        connection._disconnect_if_need = AsyncMock()
+
+        # Запущено 0:35 с автоподогревом, осталось 0:20; флаг переключателя не трогали
+        connection._program = (5, 0, (100, 0, 35, 0, 0, 1))
+        connection._set_status(connection.parse_status(bytes([0x05, 0x00, 0x64, 0x00, 0x14, 0x00, 0x00, 0x01, 0x05, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00])))
+        connection._target_boil_hours = 0
+        connection._target_boil_minutes = 35
+        connection._target_temperature = 110
+        assert await connection.apply_settings()
+        connection.set_main_mode.assert_called_once_with(5, 0, 110, 0, 20, 0, 0, 1)
+        assert connection._program == (5, 0, (110, 0, 35, 0, 0, 1))
+
+        # Длительность и автоподогрев изменены пользователем
+        connection.set_main_mode.reset_mock()
+        connection._expected = None
+        connection._target_boil_minutes = 50
+        await connection.disable_auto_warm()
+        assert await connection.apply_settings()
+        connection.set_main_mode.assert_called_once_with(5, 0, 110, 0, 50, 0, 0, 0)
+
+    @pytest.mark.asyncio
+    async def test_connection_cancel_apply_cancels_running_apply(self):
+        """Test that stopping the connection cancels a scheduled apply that is already sending."""
+        mac = "AA:BB:CC:DD:EE:FF"
+        key = [0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x0E, 0x0F]
+        connection = SkyCookerConnection(mac, key, persistent=True, model="RMC-M40S", live_apply=True)
+        connection._set_status(connection.parse_status(bytes([0x05, 0x00, 0x64, 0x00, 0x23, 0x00, 0x00, 0x01, 0x05, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00])))
+        # SET_MAIN_MODE не получает ответа, применение зависает на отправке
+        async def no_reply(*args):
+            await asyncio.Event().wait()
+        connection.set_main_mode = AsyncMock(side_effect=no_reply)
+        connection._connect_if_need = AsyncMock()
+        connection._disconnect_if_need = AsyncMock()
+        connection._disconnect = AsyncMock()
+
+        with patch("custom_components.skycooker.skycooker_connection.LIVE_APPLY_DELAY", 0.01):
+            connection._target_temperature = 110
+            assert connection.schedule_apply()
+            await asyncio.sleep(0.05)
+        task = connection._apply_task
+        assert task is not None and not task.done()
+
+        await connection.stop()
+        await asyncio.sleep(0)
+        assert task.cancelled()
+        assert connection._apply_task is None
+
+    def test_connection_live_apply_disabled_or_idle(self):
+        """Test that nothing is scheduled without the option or when the cooker is not cooking."""
+        mac = "AA:BB:CC:DD:EE:FF"
+        key = [0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x0E, 0x0F]
+        cooking = bytes([0x05, 0x00, 0x64, 0x00, 0x23, 0x00, 0x00, 0x01, 0x05, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00])
+        idle = bytes([0x05, 0x00, 0x64, 0x00, 0x23, 0x00, 0x00, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00])
+
+        connection = SkyCookerConnection(mac, key, persistent=True, model="RMC-M40S")
+        connection._status = connection.parse_status(cooking)
+        assert not connection.schedule_apply()
+
+        connection.live_apply = True
+        connection._status = connection.parse_status(idle)
+        assert not connection.schedule_apply()
+
+    def test_connection_optimistic_state_confirmed(self):
+        """Test that the optimistic state is shown immediately and cleared by a confirming status."""
+        mac = "AA:BB:CC:DD:EE:FF"
+        key = [0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x0E, 0x0F]
+        connection = SkyCookerConnection(mac, key, persistent=True, model="RMC-M40S")
+        idle = bytes([0x05, 0x00, 0x64, 0x00, 0x23, 0x00, 0x00, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00])
+        cooking = bytes([0x05, 0x00, 0x64, 0x00, 0x23, 0x00, 0x00, 0x01, 0x05, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00])
+        connection._set_status(connection.parse_status(idle))
+
+        connection.expect(is_on=True, status=0x05)
+        assert connection.status.is_on
+
+        # A stale status inside the deadline keeps the optimistic fields
+        connection._set_status(connection.parse_status(idle))
+        assert connection.status.status == 0x05
+
+        connection._set_status(connection.parse_status(cooking))
+        assert connection._expected is None
+        assert connection.last_error is None
+
+    def test_connection_optimistic_state_rollback(self):
+        """Test that an unconfirmed optimistic state is rolled back after the deadline."""
+        mac = "AA:BB:CC:DD:EE:FF"
+        key = [0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x0E, 0x0F]
+        connection = SkyCookerConnection(mac, key, persistent=True, model="RMC-M40S")
+        idle = bytes([0x05, 0x00, 0x64, 0x00, 0x23, 0x00, 0x00, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00])
+        connection._set_status(connection.parse_status(idle))
+
+        connection.expect(is_on=True, status=0x05)
+        connection._expected_deadline = 0
+        connection._set_status(connection.parse_status(idle))
+
+        assert not connection.status.is_on
+        assert connection._expected is None
+        assert connection.last_error is not None
+
+    @pytest.mark.asyncio
+    async def test_connection_optimistic_state_rollback_on_error(self):
+        """Test that a failed start restores the real status immediately."""
+        mac = "AA:BB:CC:DD:EE:FF"
+        key = [0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x0E, 0x0F]
+        connection = SkyCookerConnection(mac, key, persistent=True, model="RMC-M40S")
+        idle = bytes([0x05, 0x00, 0x64, 0x00, 0x23, 0x00, 0x00, 0x01, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00])
+        connection._set_status(connection.parse_status(idle))
+
+        connection._client = MagicMock()
+        connection._client.is_connected = True
+        connection._connect_if_need = AsyncMock()
+        connection._disconnect_if_need = AsyncMock()
+        connection.select_mode = AsyncMock(side_effect=IOError("Таймаут приема"))
+
+        with pytest.raises(IOError):
+            await connection.start()
+
+        assert not connection.status.is_on
+        assert connection.last_error is not None
+
+    @pytest.mark.asyncio
+    async def test_connection_get_status_cached(self):
+        """Test that a fresh status is served from the cache and concurrent reads are shared."""
+        mac = "AA:BB:CC:DD:EE:FF"
+        key = [0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x0E, 0x0F]
+        connection = SkyCookerConnection(mac, key, persistent=True, model="RMC-M40S")
+        status = connection.parse_status(bytes([0x05, 0x00, 0x64, 0x00, 0x23, 0x00, 0x00, 0x01, 0x05, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00]))
+        connection._connect_if_need = AsyncMock()
+        connection._disconnect_if_need = AsyncMock()
+
+        async def get_status():
+            await asyncio.sleep(0.05)
+            return status
+
+        connection.get_status = AsyncMock(side_effect=get_status)
+
+        results = await asyncio.gather(*(connection.get_status_cached(max_age=10) for _ in range(5)))
+        assert all(r is status for r in results)
+        connection.get_status.assert_called_once()
+
+        assert await connection.get_status_cached(max_age=10) is status
+        connection.get_status.assert_called_once()
+
+        await connection.get_status_cached(max_age=0)
+        assert connection.get_status.call_count == 2
+
+    def test_connection_countdown_interpolation(self):
+        """Test that timers advance locally between statuses and re-anchor on a new status."""
+        mac = "AA:BB:CC:DD:EE:FF"
+        key = [0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x0E, 0x0F]
+        connection = SkyCookerConnection(mac, key, persistent=True, model="RMC-M40S")
+        # Cooking, 0:35 left
+        cooking = bytes([0x05, 0x00, 0x64, 0x00, 0x23, 0x00, 0x00, 0x01, 0x05, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00])
+        # Delayed launch in 1:10, then 0:35 of cooking
+        delayed = bytes([0x05, 0x00, 0x64, 0x00, 0x23, 0x01, 0x0A, 0x01, 0x02, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00, 0x00])
+
+        with patch.object(connection.clock, "monotonic", return_value=1000.0):
+            connection._set_status(connection.parse_status(cooking))
+            assert connection.remaining_time == 35
+            assert connection.next_tick_delay() == 60
+
+        with patch.object(connection.clock, "monotonic", return_value=1000.0 + 5 * 60 + 20):
+            assert connection.remaining_time == 30
+            assert connection.total_time == 30
+            assert connection.next_tick_delay() == 40
+
+        with patch.object(connection.clock, "monotonic", return_value=1000.0 + 60 * 60):
+            assert connection.remaining_time == 0
+
+        with patch.object(connection.clock, "monotonic", return_value=5000.0):
+            connection._set_status(connection.parse_status(delayed))
+        with patch.object(connection.clock, "monotonic", return_value=5000.0 + 10 * 60):
+            assert connection.delayed_start_time == 60
+            assert connection.remaining_time == 95
+
+        connection._set_status(connection.parse_status(cooking[:8] + bytes([0x00]) + cooking[9:]))
+        assert connection.next_tick_delay() is None
+
+    def test_link_stats(self):
+        """Test the rolling link quality counters."""
+        mac = "AA:BB:CC:DD:EE:FF"
+        key = [0x00, 0x01, 0x02, 0x03, 0x04, 0x05, 0x06, 0x07, 0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D, 0x0E, 0x0F]
+        clock = MagicMock()
+        clock.monotonic.return_value = 500.0
+        connection = SkyCookerConnection(mac, key, persistent=True, model="RMC-M40S", clock=clock)
+
+        assert connection.last_success is None
+        for i in range(150):
+            connection.add_stat(i >= 100)
+        # Only the last 100 results count, failures are evicted from the ring
+        assert connection.success_rate == 50
+        assert connection.consecutive_failures == 0
+        assert connection.last_success is not None
+        # Время успеха берется из часов подключения
+        assert connection.link_stats.last_success_at is clock.now.return_value
+        clock.monotonic.return_value = 530.0
+        assert connection.link_stats.since_last_success == 30.0
+        connection.add_stat(False)
+        connection.add_stat(False)
+        assert connection.consecutive_failures == 2
+
+        connection.add_poll(0, 1.0, True, 60)
+        connection.add_poll(0, 2.0, True, 60)
+        connection.add_poll(0, 30.0, False, None)
+        assert connection.poll_latency == 1.2
+
+        with patch.object(connection.clock, "monotonic", return_value=1000.0):
+            connection.link_stats.add_timeout()
+        with patch.object(connection.clock, "monotonic", return_value=2000.0):
+            connection.link_stats.add_timeout()
+            assert connection.timeouts_per_hour == 2
+        with patch.object(connection.clock, "monotonic", return_value=4700.0):
+            assert connection.timeouts_per_hour == 1
+            assert connection.diagnostics()["timeouts_per_hour"] == 1
+
+    @pytest.mark.asyncio
+    async def test_probe(self):
+        """Test that the pairing probe connects once, waits briefly for AUTH and tells failures apart."""
+        from custom_components.skycooker.const import (PROBE_OK, PROBE_NOT_REACHABLE, PROBE_NOT_PAIRING,
+                                                       PROBE_AUTH_REJECTED, PROBE_AUTH_TIMEOUT, COMMAND_AUTH)
+
+        def make(command=None, connect_error=None):
+            connection = SkyCookerConnection("AA:BB:CC:DD:EE:FF", [0x00] * 8, persistent=True, model="RMC-M40S")
+            connection._connect = AsyncMock(side_effect=connect_error)
+            connection.command = command or AsyncMock()
+            connection.disconnect = AsyncMock()
+            return connection
+
+        connection = make(connect_error=IOError("Устройство не найдено"))
+        assert await connection.probe() == PROBE_NOT_REACHABLE
+        connection._connect.assert_called_once_with(max_attempts=1)
+        connection.command.assert_not_called()
+
+        connection = make(AsyncMock(side_effect=IOError("Таймаут приема")))
+        assert await connection.probe() == PROBE_NOT_PAIRING
+        assert connection.last_connect_ok and not connection.last_auth_ok
+        connection.disconnect.assert_called_once()
+
+        connection = make(AsyncMock(return_value=bytes([0x00])))
+        assert await connection.probe() == PROBE_AUTH_REJECTED
+        connection.disconnect.assert_called_once()
+
+        connection = make(AsyncMock(side_effect=[bytes([0x01]), bytes([0x02, 0x05])]))
+        assert await connection.probe() == PROBE_OK
+        assert connection.command.call_args_list[0].args == (COMMAND_AUTH, [0x00] * 8)
+        assert connection.command.call_args_list[0].kwargs == {"timeout": PROBE_AUTH_TIMEOUT}
+        assert connection.auth_ok and connection.sw_version == "2.5"
+        assert "auth" in connection.diagnostics()["connect_timings"]
+        connection.disconnect.assert_not_called()
+
+        connection = make(AsyncMock(side_effect=[bytes([0x01]), IOError("Таймаут приема")]))
+        assert await connection.probe() == PROBE_NOT_REACHABLE
+        assert not connection.last_connect_ok
+        connection.disconnect.assert_called_once()
@@ -21,6 +21,7 @@ async def test_subprogram_select_not_created_for_model_3():
     """Test that subprogram select is not created for MODEL_3."""
     hass = MagicMock(spec=HomeAssistant)
     entry = MagicMock(spec=ConfigEntry)
+    entry.data = {"friendly_name": "Test Device"}
     entry.entry_id = "test_entry_id"
     
     # Create a mock SkyCookerConnection for MODEL_3
@@ -55,6 +56,7 @@ async def test_subprogram_select_created_for_non_model_3():
     """Test that subprogram select is created for models other than MODEL_3."""
     hass = MagicMock(spec=HomeAssistant)
     entry = MagicMock(spec=ConfigEntry)
+    entry.data = {"friendly_name": "Test Device"}
     entry.entry_id = "test_entry_id"
     
     # Create a mock SkyCookerConnection for MODEL_1 (not MODEL_3)
@@ -127,6 +129,7 @@ async def test_subprogram_select_options():
     """Test that subprogram select has correct options."""
     hass = MagicMock(spec=HomeAssistant)
     entry = MagicMock(spec=ConfigEntry)
+    entry.data = {"friendly_name": "Test Device"}
     entry.entry_id = "test_entry_id"
     
     # Create a mock SkyCookerConnection
@@ -157,6 +160,7 @@ async def test_subprogram_select_current_option():
     """Test that subprogram select returns correct current option."""
     hass = MagicMock(spec=HomeAssistant)
     entry = MagicMock(spec=ConfigEntry)
+    entry.data = {"friendly_name": "Test Device"}
     entry.entry_id = "test_entry_id"
     
     # Create a mock SkyCookerConnection with status
@@ -293,6 +297,7 @@ async def test_subprogram_select_icon():
     """Test that subprogram select has correct icon."""
     hass = MagicMock(spec=HomeAssistant)
     entry = MagicMock(spec=ConfigEntry)
+    entry.data = {"friendly_name": "Test Device"}
     entry.entry_id = "test_entry_id"
     
     # Create a mock SkyCookerConnection
@@ -97,3 +97,19 @@ async def test_switch_auto_warm_disable(hass, entry, skycooker_connection):
     
     # Verify disable_auto_warm was called
     assert skycooker_connection._auto_warm_enabled == False
+
+
+@pytest.mark.asyncio
+async def test_switch_auto_warm_schedules_live_apply(hass, entry, skycooker_connection):
+    """Test that toggling auto warm schedules the live apply like the selects do."""
+    hass.data[DOMAIN][entry.entry_id] = {
+        DATA_CONNECTION: skycooker_connection,
+        DATA_DEVICE_INFO: lambda: {"name": "Test Device"}
+    }
+    switch = SkyCookerSwitch(hass, entry, SWITCH_TYPE_AUTO_WARM)
+
+    await switch.async_turn_on()
+    await switch.async_turn_off()
+
+    assert skycooker_connection._auto_warm_changed == True
+    assert skycooker_connection.schedule_apply.call_count == 2
@@ -0,0 +1,69 @@
+#!/usr/local/bin/python3
+"""Connection scenarios on a virtual-time event loop against a scripted GATT client."""
+
+from collections import deque
+from time import perf_counter
+
+import pytest
+from custom_components.skycooker.const import *
+
+# Сценарии длятся секунды виртуального времени, на деле - миллисекунды
+WALL_BUDGET = 0.5
+
+
+class TestVirtualTime:
+    """Test class for connection timing on virtual time."""
+
+    def test_start_sequence(self, virtual_time):
+        """Test a full update and start, pauses between commands take virtual time only."""
+        client = virtual_time.client()
+        connection = virtual_time.connection(client)
+        started = perf_counter()
+        assert virtual_time.run(connection.update()) is True
+        connection._target_mode = 4
+        virtual_time.run(connection.start())
+        wall = perf_counter() - started
+        assert connection.status.status == STATUS_COOKING
+        assert client.cooker.state["mode"] == 4
+        assert client.commands() == [COMMAND_AUTH, COMMAND_GET_VERSION, COMMAND_GET_STATUS, COMMAND_SELECT_MODE,
+                                     COMMAND_SET_MAIN_MODE, COMMAND_TURN_ON, COMMAND_GET_STATUS]
+        # Паузы 0.5 после SELECT_MODE и 0.3 после SET_MAIN_MODE
+        times = dict(zip(client.commands()[3:6], (t for t, _ in client.writes[3:6])))
+        assert times[COMMAND_SET_MAIN_MODE] - times[COMMAND_SELECT_MODE] >= 0.5
+        assert times[COMMAND_TURN_ON] - times[COMMAND_SET_MAIN_MODE] >= 0.3
+        assert virtual_time.loop.time() >= 0.8
+        assert wall < WALL_BUDGET
+
+    def test_retry_after_dropped_status(self, virtual_time):
+        """Test that dropped GET_STATUS replies are retried after a timeout and a pause."""
+        client = virtual_time.client(script={COMMAND_GET_STATUS: [None, None]})
+        connection = virtual_time.connection(client)
+        started = perf_counter()
+        assert virtual_time.run(connection.update()) is True
+        wall = perf_counter() - started
+        assert connection._timeouts == {COMMAND_GET_STATUS: 2}
+        assert connection._retries == 2
+        assert client.connects == 3
+        # Два таймаута приема и две паузы между попытками
+        assert virtual_time.loop.time() == pytest.approx(2 * (BLE_RECV_TIMEOUT + TRIES_INTERVAL), abs=0.5)
+        assert wall < WALL_BUDGET
+
+    def test_command_timeout(self, virtual_time):
+        """Test that an unanswered command times out after BLE_RECV_TIMEOUT of virtual time."""
+        client = virtual_time.client(script={COMMAND_AUTH: [None] * MAX_TRIES})
+        connection = virtual_time.connection(client)
+        assert virtual_time.run(connection.update()) is False
+        assert connection._timeouts == {COMMAND_AUTH: MAX_TRIES}
+        auth = [t for t, command in client.writes if command == COMMAND_AUTH]
+        assert auth[1] - auth[0] == pytest.approx(BLE_RECV_TIMEOUT + TRIES_INTERVAL, abs=0.1)
+
+    def test_pushed_status_replaces_get_status(self, virtual_time):
+        """Test that a status pushed in reply to TURN_ON saves the final GET_STATUS."""
+        client = virtual_time.client()
+        connection = virtual_time.connection(client)
+        virtual_time.run(connection.update())
+        client.cooker.status = STATUS_COOKING
+        client.script[COMMAND_TURN_ON] = deque([(COMMAND_GET_STATUS, client.cooker.status_payload())])
+        connection._target_mode = 4
+        virtual_time.run(connection.start())
+        assert client.commands()[-1] == COMMAND_TURN_ON